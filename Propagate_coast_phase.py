@@ -47,3 +47,74 @@ def propagate_coast(t,y,celestialBody,*args):
     dydt = [r_dot,v_dot,m_dot,la_dot,ph_dot]
     
     return dydt
+
+
+def keplerCoast(t, r_0, v_0, la_0, ph_0, mu, omega, r_ref):
+    
+    "this function evaluates the coast phase in closed form at the times t (s) since the burnout. The coast is the two-body orbit of the burnout state"
+    " The burnout state (r_0, v_0, la_0, ph_0) and the outputs are in the rotating frame of the code: the inertial speed is v + omega*r_ref"
+    " The arrays of the burnout state and t are broadcast together. It returns a dictionary with r, v, la, ph and t_apogee, the time from burnout to the next apogee"
+    " Only elliptic arcs are propagated. The outputs of an arc with e >= 1 are nan"
+    
+    r_0  = np.asarray(r_0, dtype=float)
+    v_0  = np.asarray(v_0, dtype=float)
+    ph_0 = np.asarray(ph_0, dtype=float)
+    t    = np.asarray(t, dtype=float)
+    
+    # speed relative to the rotating planet and its radial and transverse components in the inertial frame
+    v_rel = v_0 - (r_0 - r_ref) * omega
+    v_r   = v_rel * np.sin(ph_0)
+    v_t   = v_rel * np.cos(ph_0) + omega * r_0
+    
+    # orbital elements
+    h = r_0 * v_t
+    p = h**2 / mu
+    e_sin_nu = v_r * h / mu
+    e_cos_nu = p / r_0 - 1
+    e = np.hypot(e_sin_nu, e_cos_nu)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        e = np.where(e < 1, e, np.nan)
+        
+        sqrt_1_e2 = np.sqrt(1 - e**2)
+        a = p / (1 - e**2)
+        n = np.sqrt(mu / a**3)
+        
+        # eccentric and mean anomalies at burnout. e sin(E) and e cos(E) are proportional to
+        # sqrt(1 - e**2) e sin(nu) and e**2 + e cos(nu)
+        E_0 = np.arctan2(sqrt_1_e2 * e_sin_nu, e**2 + e_cos_nu)
+        M_0 = E_0 - e * np.sin(E_0)
+        
+        # solve Kepler equation M = E - e sin(E)
+        M = M_0 + n * t
+        E = M + e * np.sin(M)
+        for i in range(50):
+            dE = (E - e * np.sin(E) - M) / (1 - e * np.cos(E))
+            E  = E - dE
+            if np.all(np.isnan(dE) | (np.abs(dE) < 1e-14)):
+                break
+        
+        # true anomaly. This expression is continuous when E increases over several revolutions
+        beta = e / (1 + sqrt_1_e2)
+        nu   = E   + 2 * np.arctan(beta * np.sin(E)   / (1 - beta * np.cos(E)))
+        nu_0 = E_0 + 2 * np.arctan(beta * np.sin(E_0) / (1 - beta * np.cos(E_0)))
+        
+        r = a * (1 - e * np.cos(E))
+        
+        # speed in the inertial frame and back in the rotating frame of the code
+        v_r = np.sqrt(mu / p) * e * np.sin(nu)
+        v_t = h / r - omega * r
+        
+        v_rel = np.hypot(v_r, v_t)
+        
+        # the longitude is measured in the rotating frame
+        la = la_0 + nu - nu_0 - omega * t
+        
+        # the apogee is at M = pi
+        t_apogee = np.mod(np.pi - M_0, 2 * np.pi) / n
+    
+    return {'r'       : r,
+            'v'       : v_rel + (r - r_ref) * omega,
+            'la'      : la,
+            'ph'      : np.arctan2(v_r, v_t),
+            't_apogee': t_apogee}
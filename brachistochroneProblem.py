@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 16:05:48 2026
+
+Brachistochrone problem of dymos shared by the tests of the tools that work on any dymos problem
+(evaluation cache, coloring cache, grid sequencing, solution library). It is small enough to be
+solved in a few seconds and has the same structure as the launch problem: a trajectory with
+states, a control and a design parameter.
+
+@author: jorge
+"""
+
+import openmdao.api as om
+import dymos as dm
+from dymos.examples.brachistochrone.brachistochrone_ode import BrachistochroneODE
+
+
+def brachistochroneProblem(num_segments=5, driver=None, compressed=True, fix_final_y=True, trajectory_g=False,
+                           t_duration=2.0, y_final=5.0, force_alloc_complex=False):
+    "This function returns the setup brachistochrone problem of phase traj.phase0 with the initial guess set"
+    " driver is the class of the driver (SLSQP with coloring), None for a problem without optimizer"
+    " If fix_final_y == False the final y is a boundary constraint. If trajectory_g == True the gravity is a design"
+    " parameter of the trajectory (traj.design_parameters:g) instead of the phase"
+
+    p = om.Problem(model=om.Group())
+
+    if driver is not None:
+        p.driver = driver()
+        p.driver.options['optimizer'] = 'SLSQP'
+        p.driver.options['tol']       = 1e-8
+        p.driver.options['disp']      = False
+        p.driver.declare_coloring()
+
+    traj  = p.model.add_subsystem('traj', dm.Trajectory())
+    phase = traj.add_phase('phase0', dm.Phase(ode_class=BrachistochroneODE,
+                                              transcription=dm.GaussLobatto(num_segments=num_segments, order=3,
+                                                                            compressed=compressed)))
+
+    phase.set_time_options(fix_initial=True, duration_bounds=(.5, 10), units='s')
+    phase.add_state('x', rate_source='xdot', units='m', fix_initial=True, fix_final=True)
+    phase.add_state('y', rate_source='ydot', units='m', fix_initial=True, fix_final=fix_final_y)
+    phase.add_state('v', rate_source='vdot', targets=['v'], units='m/s', fix_initial=True)
+    phase.add_control('theta', targets=['theta'], units='deg', lower=0.01, upper=179.9,
+                      continuity=True, rate_continuity=True)
+
+    if trajectory_g:
+        traj.add_design_parameter('g', units='m/s**2', opt=False, val=9.80665, targets={'phase0': ['g']})
+    else:
+        phase.add_design_parameter('g', units='m/s**2', opt=False, val=9.80665)
+
+    if not fix_final_y:
+        phase.add_boundary_constraint('y', loc='final', equals=y_final)
+
+    phase.add_objective('time', loc='final', scaler=10)
+
+    p.setup(force_alloc_complex=force_alloc_complex)
+
+    p['traj.phase0.t_initial']      = 0.0
+    p['traj.phase0.t_duration']     = t_duration
+    p['traj.phase0.states:x']       = phase.interpolate(ys=[0, 10], nodes='state_input')
+    p['traj.phase0.states:y']       = phase.interpolate(ys=[10, y_final], nodes='state_input')
+    p['traj.phase0.states:v']       = phase.interpolate(ys=[0, 9.9], nodes='state_input')
+    p['traj.phase0.controls:theta'] = phase.interpolate(ys=[5, 100.5], nodes='control_input')
+
+    return p
@@ -30,7 +30,7 @@ def checkMass(p, vehicle):
     # print the mass necessarry for orbit ciruclarization
     # mass at the instant after first SECO
     m1SECO = p.get_val('traj.exoatmos_b.timeseries.states:m')[-1]
-    m2SECO = p.get_val('traj.exoatmos_b.timeseries.m_final')[-1]
+    m2SECO = p.get_val('orbitalParameters.m_final')[-1]
     print(m1SECO - m2SECO)
     
     # verify that mass after orbit circularization adds up to the strucutralm ass of the second 
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:05:41 2026
+
+Persistent cache of the total derivative coloring of the problem.
+
+The driver declares a dynamic total coloring, so every run computes the sparsity of the total
+jacobian and its coloring before the optimization starts. The models of a batch of runs are
+identical, so the coloring is stored in a cache directory under a hash of the structure of the
+model: the systems, the grids of the phases, the design variables, the constraints, the objective
+and the connections.
+
+The structure includes the src_indices of the connections, the shapes of the variables and the
+sparsity pattern (rows and cols) of the partials declared by every component, which change the
+sparsity of the total jacobian without changing the names of the connections.
+
+If the coloring of the hash exists it is used as a fixed coloring of the driver. Otherwise the
+coloring directory of the problem is set to a staging directory of the process, where openmdao
+writes the dynamic coloring the first time the driver is run. When the run of the driver finishes
+the coloring is moved into the directory of the hash with os.replace, so the parallel workers of a
+batch run that miss the cache never read a partially written coloring. Any change of the structure
+of the model changes the hash, so the cached coloring is never used with a model it was not
+computed for.
+
+The partials are declared by openmdao in the final setup of the problem, so modelStructure runs the
+final setup. useColoringCache must be called after the problem is setup and its linear solvers are
+set (planLinearSolvers), before it is run, and again every time the problem is setup.
+
+@author: jorge
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from openmdao.core.component import Component
+
+from dymos.load_case import find_phases
+
+
+# directory of the cached colorings, relative to the working directory
+default_cache_dir = 'coloring_cache'
+
+# name of the total coloring file written by openmdao in the coloring directory of the problem
+coloring_file = 'total_coloring.pkl'
+
+def arrayHash(x):
+    "This function returns the sha256 hash of the shape and the content of an array of indices, or None"
+
+    if x is None:
+        return None
+
+    x = np.asarray(x)
+
+    return hashlib.sha256(str(x.shape).encode() + np.ascontiguousarray(x).tobytes()).hexdigest()
+
+def variablesMeta(model):
+    "This function returns the metadata of the variables of the model {absolute name: metadata}"
+
+    meta = {}
+    for abs2meta in [model._var_abs2meta, model._var_allprocs_abs2meta]:
+        # openmdao stores the metadata of inputs and outputs in one dictionary or in one for each of them
+        if 'input' in abs2meta and 'output' in abs2meta:
+            abs2meta = dict(abs2meta['input'], **abs2meta['output'])
+        for name, data in abs2meta.items():
+            meta.setdefault(name, {}).update(data)
+
+    return meta
+
+def partialsPattern(model):
+    "This function returns the sparsity pattern (hash of rows and cols) of the partials declared by every component"
+
+    pattern = {}
+    for system in model.system_iter(recurse=True):
+        if isinstance(system, Component):
+            for (of, wrt), meta in system._subjacs_info.items():
+                pattern[of + ',' + wrt] = [arrayHash(meta.get('rows')), arrayHash(meta.get('cols')),
+                                           meta.get('shape')]
+
+    return pattern
+
+def modelStructure(p):
+    "This function returns a dictionary with the structure of the model that determines the sparsity of the total jacobian"
+    " The partials of the components are declared in the final setup of the problem, which is run here"
+
+    p.final_setup()
+
+    model = p.model
+    var_meta = variablesMeta(model)
+
+    phases = {}
+    for path, phase in find_phases(model).items():
+        tx = phase.options['transcription']
+        phases[path] = {'transcription': type(tx).__name__,
+                        'num_segments':  tx.options['num_segments'],
+                        'order':         tx.options['order'],
+                        'segment_ends':  tx.options['segment_ends'],
+                        'compressed':    tx.options['compressed']}
+
+    design_vars = {name: [meta.get('indices'), meta.get('size')] for name, meta in
+                   model.get_design_vars(recurse=True).items()}
+
+    constraints = {name: [meta.get('indices'), meta.get('size'), meta.get('linear'), meta.get('equals') is not None]
+                   for name, meta in model.get_constraints(recurse=True).items()}
+
+    objectives = {name: [meta.get('index'), meta.get('size')] for name, meta in
+                  model.get_objectives(recurse=True).items()}
+
+    return {'driver':      type(p.driver).__name__,
+            'systems':     [system.pathname for system in model.system_iter(recurse=True)],
+            'phases':      phases,
+            'design_vars': design_vars,
+            'constraints': constraints,
+            'objectives':  objectives,
+            'connections': sorted(model._conn_global_abs_in2out.items()),
+            'src_indices': {tgt: [arrayHash(var_meta.get(tgt, {}).get('src_indices')),
+                                  var_meta.get(tgt, {}).get('flat_src_indices')]
+                            for tgt in model._conn_global_abs_in2out},
+            'shapes':      {name: data.get('shape') for name, data in var_meta.items()},
+            'partials':    partialsPattern(model)}
+
+def modelHash(p):
+    "This function returns the hash of the structure of the model"
+
+    # numpy arrays and scalars are stored as lists and python numbers
+    structure = json.dumps(modelStructure(p), sort_keys=True, default=lambda x: np.asarray(x).tolist())
+
+    return hashlib.sha256(structure.encode('utf-8')).hexdigest()
+
+def publishColoring(staging_dir, coloring_dir):
+    "This function moves the coloring written by openmdao in the staging directory of the process to the cache"
+
+    staged = os.path.join(staging_dir, coloring_file)
+    if os.path.isfile(staged):
+        os.replace(staged, os.path.join(coloring_dir, coloring_file))
+
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+def useColoringCache(p, cache_dir=default_cache_dir):
+    "This function sets the driver to use the cached coloring of the model. It returns True if the coloring was found in the cache"
+    " If it was not found the dynamic coloring of the driver is written in the cache when the run of the driver finishes"
+
+    coloring_dir = os.path.abspath(os.path.join(cache_dir, modelHash(p)))
+    fname = os.path.join(coloring_dir, coloring_file)
+
+    # the run of the driver of a previous setup may have been wrapped by publishColoring
+    p.driver.__dict__.pop('run', None)
+
+    if os.path.isfile(fname):
+        p.driver.use_fixed_coloring(fname)
+        return True
+
+    # the fixed coloring of a previous setup does not correspond to this model
+    p.driver._coloring_info['static'] = None
+    p.driver.declare_coloring()
+
+    # openmdao writes the coloring in a staging directory of this process. It is moved to the cache
+    # when the run of the driver finishes, so other processes never read a partially written file
+    os.makedirs(coloring_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(dir=coloring_dir, prefix='tmp_')
+    p.options['coloring_dir'] = staging_dir
+
+    run = type(p.driver).run.__get__(p.driver)
+
+    def runAndPublish():
+        try:
+            return run()
+        finally:
+            publishColoring(staging_dir, coloring_dir)
+
+    p.driver.run = runAndPublish
+
+    return False
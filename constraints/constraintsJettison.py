@@ -77,6 +77,16 @@ class ConstraintsJettison(om.ExplicitComponent):
                         units = 'kg',
                         desc  = 'final mass at circularized orbit. Equivalent to ms_2 + md')
         
+        self.add_input(name  = 'mplf',
+                        val   = self.options['mplf'],
+                        units = 'kg',
+                        desc  = 'mass of payload fairing')
+        
+        self.add_input(name  = 'md',
+                        val   = self.options['md'],
+                        units = 'kg',
+                        desc  = 'mass of payload')
+        
         # -------------------------------------------------------------------------------------
         self.add_output(name   = 'residual_ms_1',
                         val    = 0.0,
@@ -101,9 +111,11 @@ class ConstraintsJettison(om.ExplicitComponent):
         # self.declare_partials(of = 'residual_mplf', wrt = 'mi_b', val =  1.0)
         # self.declare_partials(of = 'residual_mplf', wrt = 'mi_c', val = -1.0)
         self.declare_partials(of = 'residual_mplf', wrt = 'massjettison_plf', val = 1.0 )
+        self.declare_partials(of = 'residual_mplf', wrt = 'mplf', val = -1.0 )
         
         self.declare_partials(of = 'residual_m_final', wrt = 'm_final', val = 1.0)
         self.declare_partials(of = 'residual_m_final', wrt = 'ms_2', val = -1.0)
+        self.declare_partials(of = 'residual_m_final', wrt = 'md', val = -1.0)
         
     def compute(self, inputs, outputs):
         
@@ -111,6 +123,6 @@ class ConstraintsJettison(om.ExplicitComponent):
         outputs['residual_ms_1']    = inputs['massjettison_first_stage'] - inputs['ms_1']
         
         # outputs['residual_mplf']    = inputs['mi_b'] - inputs['mi_c'] - self.options['mplf']
-        outputs['residual_mplf']    = inputs['massjettison_plf'] - self.options['mplf']
+        outputs['residual_mplf']    = inputs['massjettison_plf'] - inputs['mplf']
         
-        outputs['residual_m_final'] = inputs['m_final'] - inputs['ms_2'] - self.options['md']
\ No newline at end of file
+        outputs['residual_m_final'] = inputs['m_final'] - inputs['ms_2'] - inputs['md']
\ No newline at end of file
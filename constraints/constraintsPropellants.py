@@ -45,6 +45,11 @@ class ConstraintsPropellants(om.ExplicitComponent):
                        units = 'kg',
                        desc  = 'me_a read from state. full mass for first stage flight with fairing')
         
+        self.add_input(name  = 'mplf',
+                       val   = self.options['mplf'],
+                       units = 'kg',
+                       desc  = 'mass of payload fairing')
+        
         self.add_output(name  = 'residual_mp_1',
                         val   = 0.0,
                         units = 'kg',
@@ -64,6 +69,7 @@ class ConstraintsPropellants(om.ExplicitComponent):
         self.declare_partials(of = 'residual_mp_2', wrt = 'mp_2_propulsion', val =1.0)
         self.declare_partials(of = 'residual_mp_2', wrt = 'mf_b', val = -1.0)
         self.declare_partials(of = 'residual_mp_2', wrt = 'm_final', val = 1.0)
+        self.declare_partials(of = 'residual_mp_2', wrt = 'mplf', val = 1.0)
         
     def compute(self, inputs, outputs):
         
@@ -75,7 +81,7 @@ class ConstraintsPropellants(om.ExplicitComponent):
         mf_b            = inputs['mf_b']
         m_final         = inputs['m_final']
         
-        mplf            = self.options['mplf']
+        mplf            = inputs['mplf']
         
         
         outputs['residual_mp_1'] = mp_1_propulsion - mf_a + me_a
@@ -5,6 +5,8 @@ Created on Fri Feb 19 00:05:49 2021
 @author: jorge
 """
 
+import openmdao.api as om
+
 from constraints.constraintsJettison import ConstraintsJettison
 from constraints.constraintsPropellants import ConstraintsPropellants
 from constraints.constraintsLoadFactor import ConstraintsLoadFactor
@@ -12,13 +14,27 @@ from constraints.constraintsDynamicPressure import ConstraintsDynamicPressure
 from constraints.constraintsExitArea import ConstraintsExitArea
 
 from constraints.massJetisson import MassJettison
+from constraints.ksAggregation import KSAggregation
+
+
+# phases of the flight of the first stage. The maximum dynamic pressure and load factor used to size it are
+# aggregated over them
+first_stage_phases = ['lift_off', 'pitch_over_linear', 'pitch_over_exponential', 'gravity_turn', 'gravity_turn_b']
 
 
-def defineCouplingConstraints(p, vehicle):
+def defineCouplingConstraints(p, vehicle, phases=None):
+    " If the phases are given, the maximum dynamic pressure and load factor of the first stage are the KS aggregation"
+    " of their timeseries. Otherwise they are the values at the end of gravity_turn and gravity_turn_b"
     
     # add components related to constraint couplings
     # ==========================================================================================================
     
+    # mission parameters. They are inputs of the model so that the sensitivity of the optimum to them can be
+    # computed without optimizing again (see postOptimality.py)
+    mission_params = p.model.add_subsystem('mission_params', om.IndepVarComp())
+    mission_params.add_output('md',   val = vehicle.md,   units = 'kg', desc = 'mass of payload')
+    mission_params.add_output('mplf', val = vehicle.mplf, units = 'kg', desc = 'mass of payload fairing')
+    
     # component to calculate the mass being jettisoned at first jettison and fairing jettison
     p.model.add_subsystem('massJettison', subsys = MassJettison(mplf = vehicle.mplf, md = vehicle.md))
     
@@ -30,6 +46,12 @@ def defineCouplingConstraints(p, vehicle):
     constraintsExitArea = p.model.add_subsystem('constraintsExitArea', 
                                                 ConstraintsExitArea(areaFactor_1 = 0.64, areaFactor_2 = 0.64))
     
+    # smooth maximum of the dynamic pressure and of the load factor of the flight of the first stage
+    if phases is not None:
+        input_nodes = {phase: phases[phase] for phase in first_stage_phases}
+        p.model.add_subsystem('ksDynamicPressure', KSAggregation(input_nodes = input_nodes, units = 'Pa', ref = 1e3))
+        p.model.add_subsystem('ksLoadFactor',      KSAggregation(input_nodes = input_nodes, units = None, ref = 0.1))
+    
     # component to enforce the coupling for the maximum dynamic pressure of the trajectory and the massSizing module
     constraintsDynamicPressure = p.model.add_subsystem('constraintsDynamicPressure', ConstraintsDynamicPressure())
     
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 09:14:27 2026
+
+Kreisselmeier-Steinhauser (KS) aggregation of the timeseries of several phases. It is a smooth and
+conservative estimate of the maximum of all the nodes:
+
+    KS = m + ref / rho * ln( sum( exp( rho * (x - m) / ref ) ) ),     m = max(x)
+
+The maximum m is subtracted so that the exponentials do not overflow. KS is never lower than m and it
+overestimates it by at most ref * ln(N) / rho, where N is the number of nodes.
+
+The derivative of KS w.r.t. every node is exp( rho * (x - m) / ref ) / sum( exp( rho * (x - m) / ref ) ).
+Every input has a single row of partials.
+
+@author: jorge
+"""
+
+import openmdao.api as om
+import numpy as np
+
+
+def numNodes(nodes):
+    "This function returns the number of nodes of an input. nodes is an int or the phase of the timeseries"
+
+    if isinstance(nodes, int):
+        return nodes
+
+    return nodes.options['transcription'].grid_data.num_nodes
+
+class KSAggregation(om.ExplicitComponent):
+
+    def initialize(self):
+
+        self.options.declare('input_nodes', types = dict,
+                             desc = 'number of nodes of every input {name: nodes}. nodes is an int or the phase of the timeseries')
+        self.options.declare('units', default = None, allow_none = True, desc = 'units of the inputs and of the output')
+        self.options.declare('ref', types = float, default = 1.0, desc = 'scale of the inputs')
+        self.options.declare('rho', types = float, default = 100.0, desc = 'aggregation parameter')
+
+    def setup(self):
+
+        units = self.options['units']
+
+        # the number of nodes is read in setup, so that it follows the grid of the phases
+        self._sizes = {name: numNodes(nodes) for name, nodes in self.options['input_nodes'].items()}
+
+        for name, size in self._sizes.items():
+            self.add_input(name,
+                           shape = (size, 1),
+                           units = units,
+                           desc  = 'timeseries to aggregate')
+
+        self.add_output('ks',
+                        val   = 0.0,
+                        units = units,
+                        desc  = 'KS aggregation (smooth maximum) of the inputs')
+
+        for name, size in self._sizes.items():
+            self.declare_partials(of = 'ks', wrt = name, rows = np.zeros(size, dtype=int), cols = np.arange(size))
+
+    def _weights(self, inputs):
+        "This function returns the maximum of the inputs, the exponentials of every node and their sum"
+
+        ref = self.options['ref']
+        rho = self.options['rho']
+
+        x = np.concatenate([inputs[name].ravel() for name in self._sizes])
+        m = np.max(x.real)
+        z = np.exp(rho * (x - m) / ref)
+
+        return m, z, np.sum(z)
+
+    def compute(self, inputs, outputs):
+
+        m, z, s = self._weights(inputs)
+
+        outputs['ks'] = m + self.options['ref'] / self.options['rho'] * np.log(s)
+
+    def compute_partials(self, inputs, partials):
+
+        m, z, s = self._weights(inputs)
+        dks_dx = z / s
+
+        start = 0
+        for name, size in self._sizes.items():
+            partials['ks', name] = dks_dx[start:start + size]
+            start += size
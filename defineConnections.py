@@ -5,7 +5,10 @@ Created on Fri Feb 19 00:45:11 2021
 @author: jorge
 """
 
-def defineConnections(p):
+from constraints.defineCouplingConstraints import first_stage_phases
+
+def defineConnections(p, ks_aggregation=False):
+    "If ks_aggregation == True the maximum load factor and dynamic pressure of the first stage are read from the KS aggregation components"
 
     
     # connections for propulsion module
@@ -17,7 +20,7 @@ def defineConnections(p):
     
     p.model.connect('propulsion.propulsion_stage_2.Ae_t',    'traj.input_parameters:Ae_t_stage_2')
     p.model.connect('propulsion.propulsion_stage_2.mfr_max', 'traj.input_parameters:mfr_max_stage_2')
-    p.model.connect('propulsion.propulsion_stage_2.Isp',     'traj.input_parameters:Isp_stage_2')
+    p.model.connect('propulsion.propulsion_stage_2.Isp',     'orbitalParameters.Isp')
     p.model.connect('external_params.thrust_vac_stage_2',    'traj.input_parameters:thrust_vac_stage_2')
     
     p.model.connect('external_params.P_c_stage_1',        'propulsion.propulsion_stage_1.P_c')
@@ -65,16 +68,30 @@ def defineConnections(p):
     p.model.connect('traj.lift_off.timeseries.states:m', 'constraintsPropellants.mf_a', src_indices=[0])
     p.model.connect('traj.gravity_turn_b.timeseries.states:m', 'constraintsPropellants.me_a', src_indices=[-1])
     p.model.connect('traj.gravity_turn_c.timeseries.states:m', 'constraintsPropellants.mf_b', src_indices=[0])
-    p.model.connect('traj.exoatmos_b.timeseries.m_final', 'constraintsPropellants.m_final', src_indices=[-1])
+    p.model.connect('orbitalParameters.m_final', 'constraintsPropellants.m_final')
     
     p.model.connect('traj.gravity_turn_b.timeseries.states:m', 'massJettison.me_a', src_indices=[-1])
     p.model.connect('traj.gravity_turn_c.timeseries.states:m', 'massJettison.mf_b', src_indices=[0])
     p.model.connect('traj.exoatmos_a.timeseries.states:m', 'massJettison.mi_b', src_indices=[-1])
     p.model.connect('traj.exoatmos_b.timeseries.states:m', 'massJettison.mi_c', src_indices=[0])
-    p.model.connect('traj.exoatmos_b.timeseries.m_final' , 'constraintsJettison.m_final', src_indices=[-1])
-    
-    # careful with this. Im not actually choosing the max
-    p.model.connect('traj.gravity_turn_b.timeseries.n_f' , 'constraintsLoadFactor.max_n_f_1_t', src_indices=[-1])
+    p.model.connect('orbitalParameters.m_final' , 'constraintsJettison.m_final')
+    
+    # mission parameters. See postOptimality.py
+    p.model.connect('mission_params.md',   'constraintsJettison.md')
+    p.model.connect('mission_params.mplf', 'constraintsJettison.mplf')
+    p.model.connect('mission_params.mplf', 'constraintsPropellants.mplf')
+    
+    # the maximum load factor and dynamic pressure of the first stage are the KS aggregation of its phases.
+    # Otherwise the load factor at the end of gravity_turn_b is used, which may not be the maximum
+    if ks_aggregation:
+        for phase in first_stage_phases:
+            p.model.connect('traj.' + phase + '.timeseries.n_f',   'ksLoadFactor.' + phase)
+            p.model.connect('traj.' + phase + '.timeseries.q_dyn', 'ksDynamicPressure.' + phase)
+        
+        p.model.connect('ksLoadFactor.ks',      'constraintsLoadFactor.max_n_f_1_t')
+        p.model.connect('ksDynamicPressure.ks', 'constraintsDynamicPressure.max_q_dyn_1_t')
+    else:
+        p.model.connect('traj.gravity_turn_b.timeseries.n_f' , 'constraintsLoadFactor.max_n_f_1_t', src_indices=[-1])
     # p.model.connect('traj.exoatmos_a.timeseries.n_f' , 'constraintsLoadFactor.max_n_f_2_t', src_indices=[-1])
     
     p.model.connect('external_params.max_n_f_1', 'constraintsLoadFactor.max_n_f_1_p')
@@ -91,7 +108,8 @@ def defineConnections(p):
     
     
     # p.model.connect('traj.gravity_turn.timeseries.q_dyn', 'constraintsDynamicPressure.max_q_dyn_1_t')
-    p.model.connect('traj.gravity_turn.timeseries.q_dyn', 'constraintsDynamicPressure.max_q_dyn_1_t', src_indices=[-1])
+    if not ks_aggregation:
+        p.model.connect('traj.gravity_turn.timeseries.q_dyn', 'constraintsDynamicPressure.max_q_dyn_1_t', src_indices=[-1])
     
     
     
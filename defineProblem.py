@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:02:17 2026
+
+This file defines the function that builds the openmdao problem of the MDO of the
+TSTO launch vehicle. It is used by main_opt_traj.py and by the multi-start runner,
+which builds the problem once per worker process.
+
+@author: jorge
+"""
+
+import openmdao.api as om
+import numpy as np
+from openmdao.api import ScipyOptimizeDriver
+
+from constraints.defineCouplingConstraints import defineCouplingConstraints
+
+from groups.propulsion.propulsion import Propulsion
+from groups.massSizing.massSizing import MassSizing
+
+from groups.trajectory.defineTrajectoryPhases import defineTrajectoryPhases
+from groups.trajectory.launch_vehicle_ode import odePath
+from groups.trajectory.boundaryODE import addBoundaryODE
+from groups.trajectory.subgroups.orbitalParameters.orbitalParameters import OrbitalParameters
+from defineConnections import defineConnections
+
+from external_parameters import defineExternalParams
+from coloringCache import useColoringCache
+from evaluationCache import CachedScipyOptimizeDriver
+from solverPlanning import planLinearSolvers
+
+
+def defineProblem(earth, rocket, ha, hp_min, check=True, fused_ode=False, coloring_cache=None,
+                  eval_cache=False, ks_aggregation=False, plan_solvers=True):
+    "This function builds and setups the openmdao problem. It returns the problem, the trajectory, the phases and the dictionaries and lists used to import the initial guess and write the reports"
+    " If fused_ode == True the phases use the single component ODE LaunchVehicleRHS"
+    " If coloring_cache is given the total coloring is stored in and read from that directory. Otherwise it is computed in every run"
+    " If eval_cache == True the repeated evaluations of the optimizer are served from a cache (see evaluationCache.py)"
+    " If ks_aggregation == True the maximum dynamic pressure and load factor of the first stage are the KS aggregation of their timeseries."
+    " The split of the gravity turn phases and the qDot boundary constraint are kept, so the KS components are added to the NLP"
+    " If plan_solvers == True the feed-forward groups use LinearRunOnce and only the coupled blocks a sparse DirectSolver (see solverPlanning.py)."
+    " Otherwise a DirectSolver factorizes the jacobian of the whole model"
+
+    # intialize openmmdao problem
+    # =========================================================================================================
+    p = om.Problem(model=om.Group())
+
+    # Define NLP solver
+    # =========================================================================================================
+    p.driver = CachedScipyOptimizeDriver() if eval_cache else ScipyOptimizeDriver()
+    p.driver.options['optimizer'] = 'SLSQP'
+    # set tol 1e-4 for a precission of  10 kg. account for objective function scaling.
+    # adder = -ref0
+    # scaler = 1 / (ref - ref0)
+    # x_sc = scaler (x - ref0)
+    p.driver.options['tol'] = 1e-3
+    p.driver.options['maxiter'] = 100
+    p.driver.declare_coloring()
+
+    # add_main modules to the model
+    # =========================================================================================================
+    # external parameters. Contains and defines the units, bounds and scaling parameters of
+    # the variables to be optimized related to the massSizing and propulsion modules.
+    external_params = p.model.add_subsystem('external_params', defineExternalParams())
+
+    # add propulsion module. contains models for first and second stage
+    propulsion = p.model.add_subsystem('propulsion', Propulsion( g0 = earth.g0,
+                                                                nb_e_first_stage = rocket.stage_1.nb_e,
+                                                                nb_e_second_stage = rocket.stage_2.nb_e))
+
+    # add massSizing module. contains models for first and second stage
+    p.model.add_subsystem('massSizing', MassSizing( nb_e_first_stage = rocket.stage_1.nb_e,
+                                                   mass_aux_1 = rocket.stage_1.mass_aux ) )
+
+    # add trajectory module. Contains and defines the units, bounds and scaling parameters of
+    # the variables to be optimized related to the trajectory
+    traj, phases = defineTrajectoryPhases(earth, rocket, ha, hp_min, fused_ode)
+    p.model.add_subsystem('traj', traj)
+
+    # orbital parameters at the final node of exoatmos_b (first SECO). They are the only values used of
+    # the orbital parameters, so they are not evaluated at the other nodes of the phase
+    orbitalParameters = addBoundaryODE(p, 'orbitalParameters', OrbitalParameters(num_nodes=1, central_body=earth),
+                                       'traj.exoatmos_b', loc='final',
+                                       inputs={'states:r'  : ['r'],
+                                               'states:v'  : ['v'],
+                                               'states:phi': ['phi'],
+                                               'states:m'  : ['m_0']})
+
+    # define constraints for the trajectory
+    # ===========================================================================================================
+    phases['lift_off'].add_boundary_constraint('r', units = 'm',
+                                               loc='final' , shape=(1,),
+                                               lower=earth.r0 + 150 , upper = earth.r0 + 2000,
+                                               ref= earth.r0 + 2000, ref0= earth.r0 + 150)
+
+    phases['gravity_turn'].add_boundary_constraint(name='qDot.qDot', units='kg/m/s**3',
+                                                   loc='final', shape=(1,),
+                                                   equals = 0.0)
+
+    phases['gravity_turn_c'].add_boundary_constraint(name=odePath('aero.q_dyn', fused_ode), units='Pa',
+                                                     loc='final', shape=(1,),
+                                                     upper=1e3,
+                                                     ref=2e3, ref0 = 1e3)
+
+    phases['exoatmos_a'].add_boundary_constraint(odePath('aero.q_heat', fused_ode), units = 'W/m**2',
+                                                 loc= 'final', shape=(1,),
+                                                 upper = 1135,
+                                                 ref= 2e4, ref0=1135)
+
+    orbitalParameters.add_constraint('ra',
+                                     lower = earth.r0 + ha , upper = earth.r0 + ha + 2e4,
+                                     ref=earth.r0 + ha + 2e4, ref0= earth.r0 + ha)
+
+    orbitalParameters.add_constraint('rp',
+                                     lower = earth.r0 + hp_min,
+                                     ref=earth.r0 + 2*hp_min,
+                                     ref0=earth.r0 + hp_min )
+
+    # define events detected in the simulation of the trajectory (traj.simulate). The time and
+    # the states at the events are stored in traj.<phase>.events.<event>
+    # ===========================================================================================================
+    phases['gravity_turn'].add_simulation_event('max_q', 'qDot.qDot', equals=0.0, units='kg/m/s**3',
+                                                direction=-1)
+
+    phases['gravity_turn_c'].add_simulation_event('q_limit', odePath('aero.q_dyn', fused_ode), equals=1e3,
+                                                  units='Pa', direction=-1)
+
+    phases['exoatmos_a'].add_simulation_event('fairing_heat_flux', odePath('aero.q_heat', fused_ode),
+                                              equals=1135, units='W/m**2', direction=-1)
+
+    # the burnout of the first stage depends on the design, it is set from the converged solution by
+    # setBurnoutEvents before the trajectory is simulated.
+    # The apogee is reached during the coast after exoatmos_b, see keplerCoast in Propagate_coast_phase.py
+
+    # define optimization objective
+    # ======================================================================================================
+    phases['lift_off'].add_objective('m',loc='initial', ref=4.5E5, ref0 = 3.5E5)
+
+    # define connections between modules
+    # ======================================================================================================
+    p = defineConnections(p, ks_aggregation)
+
+    # define constraints for constraint coupling components. append constraints components in dictionary
+    # ======================================================================================================
+    p, constraintComponents = defineCouplingConstraints(p, rocket, phases if ks_aggregation else None)
+
+    # setup linear solver and problem
+    # ======================================================================================================
+    if not plan_solvers:
+        p.model.linear_solver = om.DirectSolver()
+    p.setup(check=check,force_alloc_complex=True)
+
+    # the linear solvers are planned from the connections, which are known after setup
+    if plan_solvers:
+        planLinearSolvers(p)
+
+    # reuse the total coloring of a previous run of the same model
+    # =======================================================================================================
+    if coloring_cache is not None:
+        useColoringCache(p, coloring_cache)
+
+    # store constraints and design parameters in lists and dictionaries
+    # =======================================================================================================
+    constraints_str = []
+
+    for constraintComponent in constraintComponents.values():
+        for constraint in constraintComponent.get_constraints().keys():
+            constraints_str.append(constraint)
+
+    for i in traj.get_constraints().keys():
+        if 'final_boundary' in i:
+            constraints_str.append(i)
+
+    for i in orbitalParameters.get_constraints().keys():
+        constraints_str.append(i)
+
+    for i in propulsion.get_constraints().keys():
+        constraints_str.append(i)
+
+
+    # store all the design parameters and phase_durations from trajectory in dictionaries
+    design_params = {}
+    traj_phase_duration = {}
+
+    for key, value in traj.get_design_vars().items():
+        if '.t_duration' in key:
+            traj_phase_duration[key] = value
+        elif 'design_params' in key :
+            design_params[key] = value
+
+    # this extra loop is to store phases in the right order
+    for key, value in traj.get_design_vars().items():
+        if '_t_duration' in key:
+            traj_phase_duration[key] = value
+
+    # store external design parameters in list
+    for key, value in external_params.get_design_vars().items():
+        if '_t_duration' not in key:
+            design_params[key] = value
+
+    # group states into dictionary and define lower and upper bounds for random initialization
+    states = {'r':[earth.r0, earth.r0 + 200e3],
+              'v':[1e-3, 8e3],
+              'lambda':[1e-3, np.radians(15)],
+              'm':[rocket.md, 600e3],
+              'phi':[1e-3, np.pi/2]}
+
+    return p, traj, phases, design_params, traj_phase_duration, constraints_str, states
+
+def setBurnoutEvents(p, phases, margin=1e-3):
+    "This function sets the burnout event of the first stage in the simulation from the solution of the problem p"
+    " gravity_turn_b ends when the propellant of the first stage is exhausted. The simulation of the phase stops if the"
+    " mass drops below the lift off mass minus the propellant of the first stage by more than margin times that propellant"
+    " The second stage ends exoatmos_b with the propellant of the circularization burn on board, so it has no burnout event"
+
+    m_lift_off = p.get_val('traj.lift_off.timeseries.states:m', units='kg')[0][0]
+    mp_1       = p.get_val('external_params.mp_1', units='kg')[0]
+
+    phases['gravity_turn_b'].add_simulation_event('burnout', 'm', equals=m_lift_off - (1 + margin) * mp_1, units='kg',
+                                                  direction=-1, terminal=True)
+
+    return phases
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 09:20:14 2026
+
+Disk cache of arrays that are expensive to build and shared by every process of a batch run
+(atmospheric tables, propellant surrogates).
+
+Every entry is identified by the sha256 hash of the data it is built from (cacheKey). It is stored
+in a .npz file (or a .npy file, memory mapped when loaded, for a single array) with a json sidecar
+holding the key, the sha256 hash of the arrays and the size and modification time of the data file.
+
+The hash of the arrays is computed only when the entry is written. When it is loaded, the key and
+the size and modification time of the data file are checked instead: hashing the content would read
+every page of a memory mapped table in every process. An entry built from other data, or whose data
+file was replaced after the sidecar was written, is never used.
+
+The files are written to a temporary file first and moved in place (atomicWrite), so processes
+never read a partially written file. coloringCache moves the total coloring into its cache in the
+same way.
+
+The default cache directories are in the cache directory of the user ($XDG_CACHE_HOME or ~/.cache),
+not in the source tree of the package (see userCacheDir).
+
+@author: jorge
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+
+import numpy as np
+
+
+# name of the directory of the package in the cache directory of the user
+package_cache_name = 'tsto_mdo'
+
+def userCacheDir(name):
+    "This function returns the directory name of the package in the cache directory of the user"
+
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+
+    return os.path.join(base, package_cache_name, name)
+
+def fileStamp(file_name):
+    "This function returns the size (bytes) and the modification time (ns) of a file"
+
+    stat = os.stat(file_name)
+
+    return [stat.st_size, stat.st_mtime_ns]
+
+def cacheKey(data):
+    "This function returns the sha256 hash of data, a json serializable object. numpy arrays are stored as lists"
+
+    return hashlib.sha256(json.dumps(data, sort_keys=True,
+                                     default=lambda x: np.asarray(x).tolist()).encode()).hexdigest()
+
+def arraysHash(arrays):
+    "This function returns the sha256 hash of the content of a dictionary of arrays"
+
+    sha256 = hashlib.sha256()
+    for name in sorted(arrays):
+        sha256.update(name.encode())
+        sha256.update(np.ascontiguousarray(arrays[name]).tobytes())
+
+    return sha256.hexdigest()
+
+def atomicWrite(file_name, write, binary=True):
+    "This function writes file_name with the function write(file) to a temporary file first and moves it in place"
+
+    directory = os.path.dirname(os.path.abspath(file_name))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_file = tempfile.mkstemp(dir=directory, suffix=os.path.splitext(file_name)[1])
+    try:
+        with os.fdopen(fd, 'wb' if binary else 'w') as file:
+            write(file)
+        os.replace(tmp_file, file_name)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+
+def cachedArrays(cache_dir, prefix, key, build, description, mmap=False):
+    " This function returns the dictionary of arrays of the entry key of cache_dir. It is built with build() and"
+    " written to the cache if it is missing or not valid. If mmap == True the entry is a single array stored in"
+    " a .npy file, memory mapped when it is loaded, so processes using the same file share its pages"
+
+    data_file = os.path.join(cache_dir, prefix + key[:16] + ('.npy' if mmap else '.npz'))
+    hash_file = os.path.splitext(data_file)[0] + '.json'
+
+    try:
+        with open(hash_file, 'r') as file:
+            stored = json.load(file)
+
+        # the content is not hashed on load, see the description of the module
+        if stored['key'] == key and stored['stamp'] == fileStamp(data_file):
+            if mmap:
+                return {stored['name']: np.load(data_file, mmap_mode='r')}
+
+            with np.load(data_file) as data:
+                return {name: data[name] for name in data.files}
+    except (OSError, ValueError, KeyError):
+        pass
+
+    arrays = build()
+
+    try:
+        if mmap:
+            (name, array), = arrays.items()
+            atomicWrite(data_file, lambda file: np.save(file, array))
+        else:
+            name = None
+            atomicWrite(data_file, lambda file: np.savez(file, **arrays))
+
+        stored = {'key': key, 'name': name, 'sha256': arraysHash(arrays), 'stamp': fileStamp(data_file)}
+        atomicWrite(hash_file, lambda file: json.dump(stored, file), binary=False)
+    except OSError:
+        print(description + ' could not be cached in ' + cache_dir + '. Using it from memory.')
+
+    return arrays
@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:20:41 2026
+
+Monte Carlo dispersion analysis of the optimized TSTO launch vehicle.
+
+The converged design is extracted from the openmdao problem into a dictionary (the mission):
+initial states, phase durations, throttle history, guidance parameters and the propulsion and
+mass data of both stages. The guidance is flown open-loop: the pitch program of every phase is the
+optimized one (delta_theta_pitch_over, xi, delta_theta_exoatmos, theta_f and theta_gt are not
+updated) and the phases keep their optimized durations.
+
+The uncertain inputs are multiplicative factors applied to the specific impulse, thrust and dry mass
+of each stage, the drag coefficient and the air density. All the samples are propagated at once with
+a fixed-step RK4 scheme over arrays of samples, using the right-hand side of the fused ODE
+(launchVehicleRHS). The samples are split in chunks that are propagated by a pool of worker processes.
+The chunks are independent, so the runtime scales linearly with the number of cores.
+
+Stage-1 separation drops all the remaining mass of the first stage. If a stage runs out of propellant
+before the end of its phases its thrust is cut off.
+
+@author: jorge
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from groups.trajectory.components.launch_vehicle_rhs import launchVehicleRHS
+from Propagate_coast_phase import keplerCoast
+
+
+# phases of the trajectory in flight order and the stage that propels them
+phase_stage = {'lift_off':               1,
+               'pitch_over_linear':      1,
+               'pitch_over_exponential': 1,
+               'gravity_turn':           1,
+               'gravity_turn_b':         1,
+               'gravity_turn_c':         2,
+               'exoatmos_a':             2,
+               'exoatmos_b':             2}
+
+state_names = ['r', 'lambda', 'v', 'phi', 'm']
+
+# one sigma of the multiplicative factors of the uncertain inputs. The factors follow a normal distribution with mean 1
+default_dispersions = {'Isp_stage_1':    0.005,
+                       'Isp_stage_2':    0.005,
+                       'thrust_stage_1': 0.01,
+                       'thrust_stage_2': 0.01,
+                       'ms_stage_1':     0.02,
+                       'ms_stage_2':     0.02,
+                       'Cd_scale':       0.05,
+                       'rho_scale':      0.05}
+
+# ========================================================================================================
+# mission of the converged design
+# ========================================================================================================
+
+def getMission(p, earth):
+    "This function extracts from the converged openmdao problem the data needed to propagate the dispersed trajectories"
+
+    def last(path, units=None):
+        return float(p.get_val(path, units=units)[-1])
+
+    def first(path, units=None):
+        return float(p.get_val(path, units=units)[0])
+
+    mission = {'constants': {'r0': earth.r0, 'mu': earth.mu, 'omega': earth.angularSpeed, 'g0': earth.g0}}
+
+    # initial states of the lift_off phase
+    mission['initial_states'] = {state: first('traj.lift_off.timeseries.states:' + state) for state in state_names}
+
+    # phase durations and throttle history as a function of the phase time
+    mission['phases'] = {}
+    for name in phase_stage:
+        time_phase = p.get_val('traj.' + name + '.timeseries.time_phase', units='s').ravel()
+        throttle   = p.get_val('traj.' + name + '.timeseries.controls:throttle').ravel()
+
+        mission['phases'][name] = {'duration': time_phase[-1],
+                                   'throttle': (time_phase.copy(), throttle.copy())}
+
+    # parameters of the pitch program
+    mission['guidance'] = {'theta_lift_off':         first('traj.lift_off.input_parameters:theta', units='rad'),
+                           'delta_theta_pitch_over': first('traj.design_parameters:delta_theta_pitch_over', units='rad'),
+                           'delta_theta_exoatmos':   first('traj.design_parameters:delta_theta_exoatmos', units='rad'),
+                           'theta_f':                first('traj.design_parameters:theta_f', units='rad'),
+                           'xi':                     first('traj.design_parameters:xi'),
+                           'theta_gt':               first('traj.exoatmos_a.input_parameters:theta_gt', units='rad'),
+                           'exoatmos_a_t_duration':  first('traj.design_parameters:exoatmos_a_t_duration', units='s'),
+                           'exoatmos_b_t_duration':  first('traj.design_parameters:exoatmos_b_t_duration', units='s')}
+
+    # propulsion and masses of the stages. Same definition of propellant mass as in updateVehicle
+    m_lift_off   = mission['initial_states']['m']
+    m_separation = first('traj.gravity_turn_c.timeseries.states:m', units='kg')
+    m_final      = last('orbitalParameters.m_final', units='kg')
+    m_fairing    = last('traj.exoatmos_a.timeseries.states:m', units='kg') - first('traj.exoatmos_b.timeseries.states:m', units='kg')
+
+    mission['stages'] = {}
+    for stage in [1, 2]:
+        mission['stages'][stage] = {'thrust_vac': first('external_params.thrust_vac_stage_' + str(stage), units='N'),
+                                    'mfr_max':    first('propulsion.propulsion_stage_' + str(stage) + '.mfr_max', units='kg/s'),
+                                    'Ae_t':       first('propulsion.propulsion_stage_' + str(stage) + '.Ae_t', units='m**2'),
+                                    'Isp':        first('propulsion.propulsion_stage_' + str(stage) + '.Isp', units='s'),
+                                    'ms':         first('massSizing.ms_' + str(stage), units='kg')}
+
+    mission['stages'][1]['mp'] = m_lift_off - m_separation - mission['stages'][1]['ms']
+    mission['stages'][2]['mp'] = m_separation - m_final - m_fairing
+
+    mission['diameter']     = first('external_params.D_stage_1', units='m')
+    mission['m_separation'] = m_separation
+    mission['m_fairing']    = m_fairing
+
+    return mission
+
+# ========================================================================================================
+# sampling
+# ========================================================================================================
+
+def sampleDispersions(n_samples, dispersions=None, seed=0):
+    "This function returns a dictionary with the multiplicative factors of the uncertain inputs for n_samples trajectories"
+
+    if dispersions is None:
+        dispersions = default_dispersions
+
+    rng = np.random.default_rng(seed)
+
+    factors = {}
+    for name in default_dispersions:
+        factors[name] = 1.0 + dispersions.get(name, 0.0) * rng.standard_normal(n_samples)
+
+    return factors
+
+# ========================================================================================================
+# propagation
+# ========================================================================================================
+
+def pitchAngle(guidance, name, phase_time, phase_duration, phi):
+    "This function evaluates the pitch program of the phase. Same laws as in guidance.py"
+
+    if name == 'lift_off':
+        return np.full_like(phi, guidance['theta_lift_off'])
+
+    if name == 'pitch_over_linear':
+        return phi - phase_time / phase_duration * guidance['delta_theta_pitch_over']
+
+    if name == 'pitch_over_exponential':
+        return phi - guidance['delta_theta_pitch_over'] * np.exp(-3 * phase_time / phase_duration)
+
+    if name in ['exoatmos_a', 'exoatmos_b']:
+        # bilinear tangent law over the whole exoatmospheric flight
+        duration_total = guidance['exoatmos_a_t_duration'] + guidance['exoatmos_b_t_duration']
+
+        if name == 'exoatmos_b':
+            phase_time = phase_time + guidance['exoatmos_a_t_duration']
+
+        a   = 100.0
+        xi  = guidance['xi']
+        tan_0 = np.tan(guidance['theta_gt'] + guidance['delta_theta_exoatmos'])
+
+        num = a**xi * tan_0 + (np.tan(guidance['theta_f']) - a**xi * tan_0) * (phase_time / duration_total)
+        den = a**xi + ( 1 - a**xi) * (phase_time / duration_total)
+
+        return np.full_like(phi, np.arctan(num/den))
+
+    # gravity turn
+    return phi
+
+def _evaluateRHS(mission, name, phase_time, y, stage_inputs, m_burnout, factors):
+    "This function returns the state rates and the outputs of launchVehicleRHS for all the samples"
+
+    phase    = mission['phases'][name]
+    throttle = np.interp(phase_time, *phase['throttle'])
+
+    inputs = dict(zip(state_names, y))
+    inputs.update(stage_inputs)
+
+    inputs['theta']    = pitchAngle(mission['guidance'], name, phase_time, phase['duration'], inputs['phi'])
+    # the thrust is cut off once the propellant of the stage is exhausted
+    inputs['throttle'] = np.where(inputs['m'] > m_burnout, throttle, 0.0)
+
+    out = launchVehicleRHS(inputs, **mission['constants'],
+                           rho_scale=factors['rho_scale'], Cd_scale=factors['Cd_scale'])
+
+    ydot = np.array([out['rdot'], out['lambdadot'], out['vdot'], out['phidot'], out['mdot']])
+
+    return ydot, out
+
+def propagatePhase(mission, name, y, stage_inputs, m_burnout, factors, dt=0.5):
+    "This function propagates the states y (shape (5, n_samples)) through the phase with a fixed-step RK4 scheme."
+    " It returns the final states and the maximum dynamic pressure and load factor of each sample"
+
+    duration = mission['phases'][name]['duration']
+    n_steps  = max(int(np.ceil(duration / dt)), 1)
+    h        = duration / n_steps
+
+    max_q_dyn = np.zeros(y.shape[1])
+    max_n_f   = np.zeros(y.shape[1])
+
+    for i in range(n_steps):
+        t = i * h
+
+        k1, out = _evaluateRHS(mission, name, t, y, stage_inputs, m_burnout, factors)
+        k2, _   = _evaluateRHS(mission, name, t + h/2, y + h/2 * k1, stage_inputs, m_burnout, factors)
+        k3, _   = _evaluateRHS(mission, name, t + h/2, y + h/2 * k2, stage_inputs, m_burnout, factors)
+        k4, _   = _evaluateRHS(mission, name, t + h, y + h * k3, stage_inputs, m_burnout, factors)
+
+        max_q_dyn = np.fmax(max_q_dyn, out['q_dyn'])
+        max_n_f   = np.fmax(max_n_f, out['n_f'])
+
+        y = y + h/6 * (k1 + 2*k2 + 2*k3 + k4)
+
+        # the step in which the propellant is exhausted does not burn below the burnout mass
+        y[4] = np.fmax(y[4], m_burnout)
+
+    _, out = _evaluateRHS(mission, name, duration, y, stage_inputs, m_burnout, factors)
+
+    return y, np.fmax(max_q_dyn, out['q_dyn']), np.fmax(max_n_f, out['n_f'])
+
+def orbitalParameters(y, mu, omega, r0):
+    "This function returns the radius at apogee and perigee of the orbit. Same equations as in the group OrbitalParameters"
+
+    r, v, phi = y[0], y[2], y[3]
+
+    v_i = v + omega * r0
+    E   = v_i**2/2 - mu/r
+    H   = r * v_i * np.cos(phi)
+
+    a = -mu / (2*E)
+    e = np.sqrt( 1 + 2 * (H**2*E) / (mu**2) )
+
+    return a * (1 + e), a * (1 - e)
+
+def propagateDispersions(mission, factors, dt=0.5):
+    "This function propagates the dispersed trajectories defined by factors from lift-off to the end of exoatmos_b."
+    " It returns a dictionary of arrays with one value per sample"
+
+    n_samples = len(factors['rho_scale'])
+    cts       = mission['constants']
+
+    # dispersed stage data
+    stages = {}
+    for stage, data in mission['stages'].items():
+        Isp        = data['Isp'] * factors['Isp_stage_' + str(stage)]
+        thrust_vac = data['thrust_vac'] * factors['thrust_stage_' + str(stage)]
+
+        stages[stage] = {'inputs': {'thrust_vac': thrust_vac,
+                                    'mfr_max':    thrust_vac / (cts['g0'] * Isp),
+                                    'Ae_t':       np.full(n_samples, data['Ae_t']),
+                                    'diameter':   np.full(n_samples, mission['diameter'])},
+                         'Isp':     Isp,
+                         'delta_ms': data['ms'] * (factors['ms_stage_' + str(stage)] - 1.0)}
+
+    y = np.array([np.full(n_samples, mission['initial_states'][state]) for state in state_names])
+    y[4] = y[4] + stages[1]['delta_ms'] + stages[2]['delta_ms']
+
+    m_burnout = y[4] - mission['stages'][1]['mp']
+
+    max_q_dyn = np.zeros(n_samples)
+    max_n_f   = np.zeros(n_samples)
+
+    for name, stage in phase_stage.items():
+
+        if name == 'gravity_turn_c':
+            # stage separation. The upper composite starts with its full propellant load
+            y[4]      = mission['m_separation'] + stages[2]['delta_ms']
+            m_burnout = y[4] - mission['stages'][2]['mp'] - mission['m_fairing']
+
+        elif name == 'exoatmos_b':
+            # payload fairing jettison
+            y[4]      = y[4] - mission['m_fairing']
+            m_burnout = m_burnout - mission['m_fairing']
+
+        y, q_dyn, n_f = propagatePhase(mission, name, y, stages[stage]['inputs'], m_burnout, factors, dt)
+
+        max_q_dyn = np.fmax(max_q_dyn, q_dyn)
+        max_n_f   = np.fmax(max_n_f, n_f)
+
+    ra, rp = orbitalParameters(y, cts['mu'], cts['omega'], cts['r0'])
+
+    # mass after the circularization burn at apogee. Same equations as in the group OrbitalParameters
+    delta_v2 = - np.sqrt( (2 * cts['mu'] * rp) / (ra * (ra+rp)) ) + np.sqrt(cts['mu']/ra)
+    m_final  = y[4] / np.exp( delta_v2 / (stages[2]['Isp'] * cts['g0']) )
+
+    # coast time from the end of exoatmos_b to the apogee, where the circularization burn is done
+    t_coast = keplerCoast(0.0, y[0], y[2], y[1], y[3], cts['mu'], cts['omega'], cts['r0'])['t_apogee']
+
+    return {'ra': ra, 'rp': rp, 'm_final': m_final,
+            'propellant_margin': m_final - m_burnout, 't_coast': t_coast,
+            'max_q_dyn': max_q_dyn, 'max_n_f': max_n_f,
+            'final_states': y.T.copy()}
+
+def _propagateChunk(args):
+    "This function is run by the worker processes"
+
+    mission, factors, dt = args
+
+    return propagateDispersions(mission, factors, dt)
+
+def runDispersionAnalysis(mission, n_samples, dispersions=None, n_workers=None, n_chunks=None, seed=0, dt=0.5):
+    "This function samples and propagates n_samples dispersed trajectories in a pool of n_workers processes."
+    " It returns the factors of the samples and the results of propagateDispersions for all the samples"
+
+    # the samples are drawn in the main process. The results do not depend on the number of workers
+    factors = sampleDispersions(n_samples, dispersions, seed)
+
+    if n_workers == 1:
+        return factors, propagateDispersions(mission, factors, dt)
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+
+        # a few chunks per worker balance the load between the workers
+        if n_chunks is None:
+            n_chunks = 4 * (n_workers or os.cpu_count())
+
+        chunks = np.array_split(np.arange(n_samples), min(n_chunks, n_samples))
+        args   = [(mission, {name: value[chunk] for name, value in factors.items()}, dt) for chunk in chunks]
+
+        results = list(executor.map(_propagateChunk, args))
+
+    return factors, {name: np.concatenate([result[name] for result in results]) for name in results[0]}
+
+# ========================================================================================================
+# statistics
+# ========================================================================================================
+
+def dispersionStatistics(results, r0, ha, hp_min, ha_tol=20e3, percentiles=(50, 90, 99)):
+    "This function returns the statistics of the dispersed trajectories. The orbit insertion is successful if the"
+    " perigee is above hp_min, the apogee is within ha_tol of ha and there is enough propellant for the circularization burn"
+
+    ha_disp = results['ra'] - r0
+    hp_disp = results['rp'] - r0
+
+    success = (hp_disp >= hp_min) & (np.abs(ha_disp - ha) <= ha_tol) & (results['propellant_margin'] >= 0)
+
+    stats = {'n_samples': len(ha_disp), 'success_rate': np.mean(success)}
+
+    for name, value in [('ha', ha_disp), ('hp', hp_disp), ('propellant_margin', results['propellant_margin'])]:
+        stats[name] = {'mean': np.mean(value), 'std': np.std(value), 'min': np.min(value), 'max': np.max(value)}
+
+    for name in ['max_q_dyn', 'max_n_f']:
+        stats[name] = {'p' + str(q): value for q, value in zip(percentiles, np.percentile(results[name], percentiles))}
+
+    return stats
+
+def writeDispersionReport(stats, file_name='results/dispersionReport.txt', printToConsole=True):
+    "This function writes the statistics of the dispersion analysis"
+
+    name_len = 25
+
+    lines = ['==============================================================================',
+             '========================= Dispersion Analysis Report =========================',
+             '==============================================================================',
+             '',
+             'Number of samples: '.ljust(name_len) + str(stats['n_samples']),
+             'Success rate: '.ljust(name_len) + str(round(100 * stats['success_rate'], 2)) + ' %',
+             '',
+             'Name'.ljust(name_len) + 'mean'.ljust(15) + 'std'.ljust(15) + 'min'.ljust(15) + 'max'.ljust(15),
+             '-------------------------------------------------------------------------------']
+
+    for name, units in [('ha', 'km'), ('hp', 'km'), ('propellant_margin', 'kg')]:
+        scale = 1e-3 if units == 'km' else 1.0
+        lines.append((name + ' (' + units + ')').ljust(name_len) +
+                     ''.join(str(round(stats[name][key] * scale, 3)).ljust(15) for key in ['mean', 'std', 'min', 'max']))
+
+    lines.append('')
+    lines.append('Percentiles')
+    lines.append('-------------------------------------------------------------------------------')
+
+    for name in ['max_q_dyn', 'max_n_f']:
+        lines.append(name.ljust(name_len) +
+                     ''.join((key + ': ' + str(round(value, 3))).ljust(20) for key, value in stats[name].items()))
+
+    file1 = open(file_name, 'w')
+    file1.write('\n'.join(lines) + '\n')
+    file1.close()
+
+    if printToConsole:
+        print('\n'.join(lines))
+
+
+if __name__ == '__main__':
+
+    from celestialBodies import Earth
+    from vehicles import TSTO
+    from importInitialGuess import importInitialGuess, readGuessFile
+    from defineProblem import defineProblem
+
+    # Initialize earth
+    earth = Earth()
+
+    # initialize TSTO(md, mplf, mass_aux_1, nb_e_first_stage, nb_e_second_stage, centralBody)
+    rocket = TSTO(11e3 , 1.9e3, 3e3, 9 , 1, 0.64, 0.64,  earth)
+
+    # orbit objectives
+    ha     = 400e3  # height at apogee(m)
+    hp_min = 145e3  # min height at perigee(m)
+
+    # converged solution
+    guess_file = 'initial_guess/F9_11Ton_400km.db'
+
+    p, traj, phases, design_params, traj_phase_duration, constraints_str, states = defineProblem(earth, rocket, ha, hp_min, check=False)
+
+    p = importInitialGuess(p, phases, design_params.keys(), readGuessFile(guess_file), states.keys())
+    p.run_model()
+
+    mission = getMission(p, earth)
+
+    start_time = time.time()
+
+    factors, results = runDispersionAnalysis(mission, n_samples=5000, seed=0)
+
+    print('Dispersion analysis finished in ' + str(round(time.time() - start_time, 2)) + ' s')
+
+    writeDispersionReport(dispersionStatistics(results, earth.r0, ha, hp_min))
@@ -1,10 +1,15 @@
+from collections import OrderedDict
 from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+import os
+
 from ...transcriptions.grid_data import GridData
 from ...transcriptions.common import TimeComp
 from ...phase.phase import Phase
 from ...utils.lagrange import lagrange_matrices
+from ...utils.indexing import get_src_indices_by_row
 
-from scipy.linalg import block_diag
+import scipy.sparse as sp
 
 import numpy as np
 
@@ -13,6 +18,10 @@ from openmdao.core.system import System
 import dymos as dm
 
 
+# The ODE evaluation problems of the worker processes of PHAdaptive, keyed by phase path and grid.
+_worker_eval_problems = OrderedDict()
+
+
 def interpolation_lagrange_matrix(old_grid, new_grid):
     """
     Evaluate lagrange matrix to interpolate state and control values from the solved grid onto the new grid
@@ -26,8 +35,8 @@ def interpolation_lagrange_matrix(old_grid, new_grid):
 
     Returns
     -------
-    L: np.ndarray
-        The lagrange interpolation matrix
+    L: sp.csr_matrix
+        The block-diagonal lagrange interpolation matrix
 
     """
     L_blocks = []
@@ -45,7 +54,7 @@ def interpolation_lagrange_matrix(old_grid, new_grid):
 
         L_blocks.append(L_block)
 
-    L = block_diag(*L_blocks)
+    L = sp.block_diag(L_blocks, format='csr')
 
     return L
 
@@ -61,8 +70,8 @@ def integration_matrix(grid):
 
     Returns
     -------
-    I: np.ndarray
-        The integration matrix used to propagate initial states over segments
+    I: sp.csr_matrix
+        The block-diagonal integration matrix used to propagate initial states over segments
 
     """
     I_blocks = []
@@ -80,7 +89,7 @@ def integration_matrix(grid):
         I_block = np.linalg.inv(D_block[:, 1:])
         I_blocks.append(I_block)
 
-    I = block_diag(*I_blocks)
+    I = sp.block_diag(I_blocks, format='csr')
 
     return I
 
@@ -112,6 +121,238 @@ def split_segments(old_seg_ends, B):
     return new_segment_ends
 
 
+def _apply(A, x):
+    """
+    Multiply the nodal values x by the sparse matrix A along the node axis.
+
+    Parameters
+    ----------
+    A : sp.csr_matrix
+        The interpolation or integration matrix.
+    x : np.ndarray
+        The values at the nodes, with the nodes along the first axis.
+
+    Returns
+    -------
+    np.ndarray
+        The product of A and x, with the shape of each node value preserved.
+    """
+    return A.dot(x.reshape((x.shape[0], -1))).reshape((A.shape[0],) + x.shape[1:])
+
+
+def _grid_signature(grid):
+    """
+    Return a hashable description of the given grid.
+
+    Parameters
+    ----------
+    grid : GridData
+        The grid to be described.
+
+    Returns
+    -------
+    tuple
+        The transcription, segment orders, segment ends and compression of the grid.
+    """
+    return (grid.transcription, tuple(np.asarray(grid.transcription_order).tolist()),
+            tuple(np.asarray(grid.segment_ends).tolist()), grid.compressed)
+
+
+def _cached(cache, key, cache_size, build):
+    """
+    Return the cached value for the given key, building it if it is not in the cache.
+
+    The least recently used entries are discarded once the cache holds more than cache_size entries.
+
+    Parameters
+    ----------
+    cache : OrderedDict
+        The cache, ordered from least to most recently used.
+    key : hashable
+        The key of the value.
+    cache_size : int
+        The maximum number of entries in the cache.
+    build : callable
+        A function of no arguments which returns the value if it is not cached.
+
+    Returns
+    -------
+    object
+        The value associated with key.
+    """
+    if key in cache:
+        cache.move_to_end(key)
+    else:
+        cache[key] = build()
+        while len(cache) > cache_size:
+            cache.popitem(last=False)
+    return cache[key]
+
+
+def _eval_problem_spec(phase):
+    """
+    Return the phase options needed to build and run the ODE evaluation problem of a phase.
+
+    Parameters
+    ----------
+    phase : Phase
+        The phase whose ODE is evaluated.
+
+    Returns
+    -------
+    dict
+        The ODE class and its keyword arguments and the time, state, control and parameter options
+        of the phase.
+    """
+    return {'ode_class': phase.options['ode_class'],
+            'ode_init_kwargs': phase.options['ode_init_kwargs'],
+            'time_options': phase.time_options,
+            'state_options': phase.state_options,
+            'control_options': phase.control_options,
+            'design_parameter_options': phase.design_parameter_options,
+            'input_parameter_options': phase.input_parameter_options}
+
+
+def _build_eval_problem(spec, grid):
+    """
+    Build and set up a problem which evaluates the ODE of a phase at all nodes of the given grid.
+
+    Parameters
+    ----------
+    spec : dict
+        The phase options returned by _eval_problem_spec.
+    grid : GridData
+        The grid at which the ODE is to be evaluated.
+
+    Returns
+    -------
+    om.Problem
+        The evaluation problem, whose states, controls, parameters, t_initial and t_duration are set
+        before each run.
+    """
+    time_options = spec['time_options']
+    num_nodes = grid.num_nodes
+
+    p = om.Problem(model=om.Group())
+    ivc = om.IndepVarComp()
+    ivc.add_output('t_initial', units=time_options['units'])
+    ivc.add_output('t_duration', units=time_options['units'])
+    p.model.add_subsystem('ivc', ivc, promotes_outputs=['*'])
+
+    time_comp = TimeComp(num_nodes=num_nodes, node_ptau=grid.node_ptau,
+                         node_dptau_dstau=grid.node_dptau_dstau, units=time_options['units'])
+
+    p.model.add_subsystem('time', time_comp, promotes_outputs=['*'], promotes_inputs=['*'])
+
+    p.model.add_subsystem('ode', subsys=spec['ode_class'](num_nodes=num_nodes, **spec['ode_init_kwargs']))
+
+    if time_options['targets']:
+        p.model.connect('time', [f'ode.{t}' for t in time_options['targets']])
+
+    if time_options['time_phase_targets']:
+        p.model.connect('time_phase', [f'ode.{t}' for t in time_options['time_phase_targets']])
+
+    if time_options['t_initial_targets']:
+        p.model.connect('t_initial', [f'ode.{t}' for t in time_options['t_initial_targets']])
+
+    if time_options['t_duration_targets']:
+        p.model.connect('t_duration', [f'ode.{t}' for t in time_options['t_duration_targets']])
+
+    for var_class in ('states', 'controls'):
+        for name, options in spec[f'{var_class[:-1]}_options'].items():
+            ivc.add_output(f'{var_class}:{name}', shape=(num_nodes,) + options['shape'], units=options['units'])
+            if options['targets'] is not None:
+                p.model.connect(f'{var_class}:{name}', [f'ode.{tgt}' for tgt in options['targets']])
+
+    for var_class in ('design_parameters', 'input_parameters'):
+        for name, options in spec[f'{var_class[:-1]}_options'].items():
+            ivc.add_output(f'{var_class}:{name}', shape=options['shape'], units=options['units'])
+            if options['targets'] is not None:
+                if options['dynamic']:
+                    src_idxs = get_src_indices_by_row(np.zeros(num_nodes, dtype=int), options['shape'])
+                    if options['shape'] == (1,):
+                        src_idxs = src_idxs.ravel()
+                else:
+                    src_idxs = get_src_indices_by_row(np.zeros(1, dtype=int), options['shape'])
+                    src_idxs = np.squeeze(src_idxs, axis=0)
+                p.model.connect(f'{var_class}:{name}', [f'ode.{tgt}' for tgt in options['targets']],
+                                src_indices=src_idxs)
+
+    p.setup()
+
+    return p
+
+
+def _eval_rates(spec, grid, values, key, cache, cache_size):
+    """
+    Evaluate the state rates of a phase at all nodes of the given grid.
+
+    Parameters
+    ----------
+    spec : dict
+        The phase options returned by _eval_problem_spec.
+    grid : GridData
+        The grid at which the ODE is to be evaluated.
+    values : dict
+        The values of the states, controls, parameters, t_initial and t_duration of the evaluation
+        problem.
+    key : tuple
+        The key of the evaluation problem in the cache.
+    cache : OrderedDict
+        The cache of evaluation problems.
+    cache_size : int
+        The maximum number of evaluation problems in the cache.
+
+    Returns
+    -------
+    f_hat : dict
+        The rate of each state at all nodes of the given grid.
+    dt_dstau : np.ndarray
+        The ratio of time to segment tau at all nodes of the given grid.
+    """
+    p = _cached(cache, key, cache_size, lambda: _build_eval_problem(spec, grid))
+
+    for name, val in values.items():
+        p.set_val(name, val)
+
+    p.run_model()
+
+    f_hat = {}
+    for state_name, options in spec['state_options'].items():
+        rate = p.get_val(f"ode.{options['rate_source']}")
+        f_hat[state_name] = np.reshape(rate, (grid.num_nodes,) + options['shape']).copy()
+
+    return f_hat, p.get_val('dt_dstau').copy()
+
+
+def _eval_rates_in_worker(spec, grid, values, key, cache_size):
+    """
+    Evaluate the state rates of a phase in a worker process, reusing the evaluation problems of the worker.
+
+    Parameters
+    ----------
+    spec : dict
+        The phase options returned by _eval_problem_spec.
+    grid : GridData
+        The grid at which the ODE is to be evaluated.
+    values : dict
+        The values of the states, controls, parameters, t_initial and t_duration of the evaluation
+        problem.
+    key : tuple
+        The key of the evaluation problem in the cache.
+    cache_size : int
+        The maximum number of evaluation problems in the cache of the worker.
+
+    Returns
+    -------
+    f_hat : dict
+        The rate of each state at all nodes of the given grid.
+    dt_dstau : np.ndarray
+        The ratio of time to segment tau at all nodes of the given grid.
+    """
+    return _eval_rates(spec, grid, values, key, _worker_eval_problems, cache_size)
+
+
 class PHAdaptive:
     """
     Grid refinement object for the p-then-h grid refinement algorithm
@@ -121,20 +362,43 @@ class PHAdaptive:
     Patterson, M. A., Hager, W. W., and Rao. A. V., “A ph Mesh Refinement Method for Optimal Control”,
     Optimal Control Applications and Methods, Vol. 36, No. 4, July - August 2015, pp. 398 - 421. DOI: 10.1002/oca2114
 
+    The problems which evaluate the ODE of each phase on the higher-order grid and the interpolation
+    and integration matrices are kept for reuse in later iterations, as long as the grid of the
+    phase does not change.
+
     """
 
-    def __init__(self, phases):
+    def __init__(self, phases, n_workers=1, cache_size=16):
         """
         Initialize and compute attributes
 
         Parameters
         ----------
-        phases: Phase
-            The Phase object representing the solved phase
+        phases: dict of {phase_path: Phase}
+            The solved phases
+        n_workers: int or None
+            The number of processes which evaluate the ODE of the phases when estimating the error.
+            If 1, the ODEs are evaluated in this process.  If None, the number of CPUs is used.
+        cache_size: int
+            The maximum number of ODE evaluation problems, and of interpolation and integration
+            matrices, kept for reuse.
 
         """
         self.phases = phases
         self.error = {}
+        self.n_workers = n_workers
+        self.cache_size = cache_size
+        self._eval_problems = OrderedDict()
+        self._operators = OrderedDict()
+        self._executor = None
+
+    def close(self):
+        """
+        Shut down the worker processes, if any.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
 
     def check_error(self):
         """
@@ -147,13 +411,13 @@ class PHAdaptive:
 
         """
         refine_results = {}
+        evaluations = {}
         for phase_path, phase in self.phases.items():
             refine_results[phase_path] = {}
 
             # Save the original grid to the refine results
             tx = phase.options['transcription']
             gd = tx.grid_data
-            num_nodes = gd.subset_num_nodes['all']
             numseg = gd.num_segments
 
             refine_results[phase_path]['num_segments'] = numseg
@@ -165,32 +429,6 @@ class PHAdaptive:
             if isinstance(tx, dm.RungeKutta):
                 continue
 
-            outputs = phase.list_outputs(units=False, out_stream=None)
-
-            out_values_dict = {k: v['value'] for k, v in outputs}
-
-            prom_to_abs_map = phase._var_allprocs_prom2abs_list['output']
-
-            num_scalar_states = 0
-            for state_name, options in phase.state_options.items():
-                shape = options['shape']
-                size = np.prod(shape)
-                num_scalar_states += size
-
-            x = np.zeros([num_nodes, num_scalar_states])
-            f = np.zeros([num_nodes, num_scalar_states])
-            c = 0
-
-            # Obtain the solution on the current grid
-            for state_name, options in phase.state_options.items():
-                prom_name = f'timeseries.states:{state_name}'
-                abs_name = prom_to_abs_map[prom_name][0]
-                rate_source_prom_name = f"timeseries.state_rates:{state_name}"
-                rate_abs_name = prom_to_abs_map[rate_source_prom_name][0]
-                x[:, c] = out_values_dict[abs_name].ravel()
-                f[:, c] = out_values_dict[rate_abs_name].ravel()
-                c += 1
-
             # Obtain the solution on the new grid
             # interpolate x at t_hat
             new_order = gd.transcription_order + 1
@@ -198,14 +436,22 @@ class PHAdaptive:
             if gd.transcription == 'gauss-lobatto':
                 new_order += 1
             new_grid = GridData(numseg, gd.transcription, new_order, gd.segment_ends, gd.compressed)
+
+            L, I = self._get_operators(gd, new_grid)
+
+            x_hat, values = self._interpolate(phase, new_grid, L)
+            evaluations[phase_path] = new_grid, I, x_hat, values
+
+        # Call the ODE at all nodes of the new grids
+        rates = self._eval_rates(evaluations)
+
+        for phase_path, (new_grid, I, x_hat, values) in evaluations.items():
+            phase = self.phases[phase_path]
+            numseg = new_grid.num_segments
             left_end_idxs = new_grid.subset_node_indices['segment_ends'][0::2]
             left_end_idxs = np.append(left_end_idxs, new_grid.subset_num_nodes['all'] - 1)
 
-            L = interpolation_lagrange_matrix(gd, new_grid)
-            I = integration_matrix(new_grid)
-
-            # Call the ODE at all nodes of the new grid
-            x_hat, x_prime = self.eval_ode(phase, new_grid, L, I)
+            x_prime = self._propagate(phase, new_grid, I, x_hat, *rates[phase_path])
             E = {}
             e = {}
             err_over_states = {}
@@ -305,153 +551,181 @@ class PHAdaptive:
             tx.options['segment_ends'] = new_segment_ends
             tx.init_grid()
 
-    def eval_ode(self, phase, grid, L, I):
+    def _get_operators(self, old_grid, new_grid):
         """
-        Evaluate the phase ODE on the given grid.
+        Return the interpolation matrix from old_grid to new_grid and the integration matrix of new_grid.
+
+        Parameters
+        ----------
+        old_grid : GridData
+            The GridData object representing the grid on which the problem has been solved.
+        new_grid : GridData
+            The GridData object representing the new, higher-order grid.
+
+        Returns
+        -------
+        L : sp.csr_matrix
+            The lagrange interpolation matrix.
+        I : sp.csr_matrix
+            The integration matrix of new_grid.
+        """
+        key = (_grid_signature(old_grid), _grid_signature(new_grid))
+        return _cached(self._operators, key, self.cache_size,
+                       lambda: (interpolation_lagrange_matrix(old_grid, new_grid), integration_matrix(new_grid)))
+
+    def _interpolate(self, phase, grid, L):
+        """
+        Interpolate the solution of the phase onto the given grid.
 
         Parameters
         ----------
         phase : Phase
-            The phase object whose ODE is to be evaluated at the given grid.
+            The solved phase.
         grid : GridData
-            The GridData object representing the grid at which the ODE is to be evaluated.
-        L : np.ndarray
-            The interpolation matrix used to obtain interpolated values for the states and controls
-            on the given grid, using the existing values on the current grid.
-        I : np.ndarray
-            The integration matrix used to propagate the initial states of segments across the given grid
+            The GridData object representing the grid onto which the solution is interpolated.
+        L : sp.csr_matrix
+            The interpolation matrix from the grid of the phase to the given grid.
 
         Returns
         -------
         x_hat : dict
             Interpolated state values at all nodes of the given grid.
-        x_prime : dict
-            Evaluted state values at all nodes of the given grid from use of Integration matrix.
-
+        values : dict
+            The values of the states, controls, parameters, t_initial and t_duration of the ODE
+            evaluation problem of the phase.
         """
-        time_units = phase.time_options['units']
-        grid_data = phase.options['transcription'].grid_data
-        p = om.Problem(model=om.Group())
-        ode_class = phase.options['ode_class']
-        ode_init_kwargs = phase.options['ode_init_kwargs']
-        ivc = om.IndepVarComp()
-        p.model.add_subsystem('ivc', ivc, promotes_outputs=['*'])
+        prom2abs = phase._var_allprocs_prom2abs_list
 
-        time_comp = TimeComp(num_nodes=grid.num_nodes, node_ptau=grid.node_ptau,
-                             node_dptau_dstau=grid.node_dptau_dstau, units=time_units)
+        def get_val(prom_name):
+            abs_names = prom2abs['output'].get(prom_name) or prom2abs['input'][prom_name]
+            return phase._abs_get_val(abs_names[0], vec_name='nonlinear')
 
-        p.model.add_subsystem('time', time_comp, promotes_outputs=['*'], promotes_inputs=['*'])
+        x_hat = {}
+        values = {}
 
-        p.model.add_subsystem('ode', subsys=ode_class(num_nodes=grid.num_nodes, **ode_init_kwargs))
+        for state_name in phase.state_options:
+            x_hat[state_name] = _apply(L, get_val(f'timeseries.states:{state_name}'))
+            values[f'states:{state_name}'] = x_hat[state_name]
 
-        u = {}
-        x = {}
-        x_hat = {}
-        u_hat = {}
-        f_hat = {}
-        x_prime = {}
+        for control_name in phase.control_options:
+            values[f'controls:{control_name}'] = _apply(L, get_val(f'timeseries.controls:{control_name}'))
 
-        outputs = phase.list_outputs(units=False, out_stream=None)
-        values_dict = {k: v['value'] for k, v in outputs}
-        prom_to_abs_map = phase._var_allprocs_prom2abs_list['output']
+        for var_class in ('design_parameters', 'input_parameters'):
+            for name in getattr(phase, f'{var_class[:-1]}_options'):
+                values[f'{var_class}:{name}'] = get_val(f'{var_class}:{name}')[0, ...]
 
-        inputs = phase.list_inputs(units=False, out_stream=None)
-        prom_to_abs_map.update(phase._var_allprocs_prom2abs_list['input'])
-        values_dict.update({k: v['value'] for k, v in inputs})
+        values['t_initial'] = get_val('t_initial')
+        values['t_duration'] = get_val('t_duration')
 
-        if phase.time_options['targets']:
-            p.model.connect('time',
-                            [f'ode.{t}' for t in phase.time_options['targets']])
+        return x_hat, values
 
-        if phase.time_options['time_phase_targets']:
-            p.model.connect('time_phase',
-                            [f'ode.{t}'for t in phase.time_options['time_phase_targets']],
-                            src_indices=grid_data.subset_node_indices['all'])
+    def _eval_rates(self, evaluations):
+        """
+        Evaluate the state rates of the phases on their new grids.
 
-        if phase.time_options['t_initial_targets']:
-            tgts = phase.time_options['t_initial_targets']
-            p.model.connect('t_initial',
-                            [f'ode.{t}' for t in tgts])
+        If n_workers is not 1 the phases are evaluated in a pool of processes, which is kept
+        until close is called so that each worker may reuse its evaluation problems.
 
-        if phase.time_options['t_duration_targets']:
-            tgts = phase.time_options['t_duration_targets']
-            p.model.connect('t_duration',
-                            [f'ode.{t}' for t in tgts])
+        Parameters
+        ----------
+        evaluations : dict of {phase_path: tuple}
+            The new grid, integration matrix, interpolated states and evaluation problem values of
+            each phase.
 
-        for state_name, options in phase.state_options.items():
-            prom_name = f'timeseries.states:{state_name}'
-            abs_name = prom_to_abs_map[prom_name][0]
-            x[state_name] = values_dict[abs_name]
-            x_hat[state_name] = np.dot(L, x[state_name])
-            ivc.add_output(f'states:{state_name}', val=x_hat[state_name], units=options['units'])
-            if options['targets'] is not None:
-                p.model.connect(f'states:{state_name}', [f'ode.{tgt}' for tgt in options['targets']])
-
-        for control_name, options in phase.control_options.items():
-            prom_name = f'timeseries.controls:{control_name}'
-            abs_name = prom_to_abs_map[prom_name][0]
-            u[control_name] = values_dict[abs_name]
-            u_hat[control_name] = np.dot(L, u[control_name])
-            ivc.add_output(f'controls:{control_name}', val=u_hat[control_name], units=options['units'])
-            if options['targets'] is not None:
-                p.model.connect(f'controls:{control_name}', [f'ode.{tgt}' for tgt in options['targets']])
+        Returns
+        -------
+        dict of {phase_path: tuple}
+            The state rates and dt_dstau of each phase on its new grid.
+        """
+        args = {phase_path: (_eval_problem_spec(self.phases[phase_path]), grid, values,
+                             (phase_path,) + _grid_signature(grid))
+                for phase_path, (grid, I, x_hat, values) in evaluations.items()}
 
-        for dp_name, options in phase.design_parameter_options.items():
-            prom_name = f'design_parameters:{dp_name}'
-            abs_name = prom_to_abs_map[prom_name][0]
-            dp_val = values_dict[abs_name][0, ...]
-            ivc.add_output(f'design_parameters:{dp_name}', val=dp_val, units=options['units'])
-            if options['targets'] is not None:
-                p.model.connect(f'design_parameters:{dp_name}',
-                                [f'ode.{tgt}' for tgt in options['targets']],
-                                src_indices=np.zeros(grid.num_nodes, dtype=int))
-
-        for dp_name, options in phase.input_parameter_options.items():
-            prom_name = f'input_parameters:{dp_name}'
-            abs_name = prom_to_abs_map[prom_name][0]
-            dp_val = values_dict[abs_name][0, ...]
-            ivc.add_output(f'input_parameters:{dp_name}', val=dp_val, units=options['units'])
-            if options['targets'] is not None:
-                p.model.connect(f'input_parameters:{dp_name}',
-                                [f'ode.{tgt}' for tgt in options['targets']],
-                                src_indices=np.zeros(grid.num_nodes, dtype=int))
+        if self.n_workers == 1 or len(args) < 2:
+            return {phase_path: _eval_rates(*phase_args, self._eval_problems, self.cache_size)
+                    for phase_path, phase_args in args.items()}
 
-        p.setup()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.n_workers or os.cpu_count())
 
-        ti_prom_name = f't_initial'
-        ti_abs_name = prom_to_abs_map[ti_prom_name][0]
-        t_initial = values_dict[ti_abs_name]
+        futures = {phase_path: self._executor.submit(_eval_rates_in_worker, *phase_args, self.cache_size)
+                   for phase_path, phase_args in args.items()}
 
-        td_prom_name = f't_duration'
-        td_abs_name = prom_to_abs_map[td_prom_name][0]
-        t_duration = values_dict[td_abs_name]
+        return {phase_path: future.result() for phase_path, future in futures.items()}
 
-        p.set_val('t_initial', t_initial)
-        p.set_val('t_duration', t_duration)
+    def _propagate(self, phase, grid, I, x_hat, f_hat, dt_dstau):
+        """
+        Propagate the interpolated states at the start of each segment with the integration matrix.
 
-        p.run_model()
+        Parameters
+        ----------
+        phase : Phase
+            The solved phase.
+        grid : GridData
+            The GridData object representing the grid at which the ODE was evaluated.
+        I : sp.csr_matrix
+            The integration matrix of the given grid.
+        x_hat : dict
+            Interpolated state values at all nodes of the given grid.
+        f_hat : dict
+            The state rates at all nodes of the given grid.
+        dt_dstau : np.ndarray
+            The ratio of time to segment tau at all nodes of the given grid.
 
+        Returns
+        -------
+        x_prime : dict
+            Evaluted state values at all nodes of the given grid from use of Integration matrix.
+        """
         left_end_idxs = grid.subset_node_indices['segment_ends'][0::2]
-        all_idxs = grid.subset_node_indices['all']
-        not_left_end_idxs = np.array(sorted(list(set(all_idxs).difference(set(left_end_idxs)))))
-
-        oodt_dstau = np.atleast_2d(p.get_val('dt_dstau')[not_left_end_idxs]).T
+        not_left_end_idxs = np.setdiff1d(grid.subset_node_indices['all'], left_end_idxs)
+        nnps = np.array(grid.subset_num_nodes_per_segment['all']) - 1
+        left_end_idxs_repeated = np.repeat(left_end_idxs, nnps)
 
+        x_prime = {}
         for state_name, options in phase.state_options.items():
-            rate_source = options['rate_source']
-            f_hat[state_name] = np.atleast_2d(p.get_val(f'ode.{rate_source}'))
-            if options['shape'] == (1,):
-                f_hat[state_name] = f_hat[state_name].T
-            x_prime[state_name] = np.zeros((grid.num_nodes,) + options['shape'])
-            x_prime[state_name][left_end_idxs, ...] = x_hat[state_name][left_end_idxs, ...]
-            nnps = np.array(grid.subset_num_nodes_per_segment['all']) - 1
-            left_end_idxs_repeated = np.repeat(left_end_idxs, nnps)
+            shape = options['shape']
+            oodt_dstau = np.reshape(dt_dstau[not_left_end_idxs], (-1,) + len(shape) * (1,))
 
+            x_prime[state_name] = np.zeros((grid.num_nodes,) + shape)
+            x_prime[state_name][left_end_idxs, ...] = x_hat[state_name][left_end_idxs, ...]
             x_prime[state_name][not_left_end_idxs, ...] = \
                 x_hat[state_name][left_end_idxs_repeated, ...] \
-                + oodt_dstau * np.dot(I, f_hat[state_name][not_left_end_idxs, ...])
+                + oodt_dstau * _apply(I, f_hat[state_name][not_left_end_idxs, ...])
+
+        return x_prime
+
+    def eval_ode(self, phase, grid, L, I):
+        """
+        Evaluate the phase ODE on the given grid.
+
+        Parameters
+        ----------
+        phase : Phase
+            The phase object whose ODE is to be evaluated at the given grid.
+        grid : GridData
+            The GridData object representing the grid at which the ODE is to be evaluated.
+        L : sp.csr_matrix
+            The interpolation matrix used to obtain interpolated values for the states and controls
+            on the given grid, using the existing values on the current grid.
+        I : sp.csr_matrix
+            The integration matrix used to propagate the initial states of segments across the given grid
+
+        Returns
+        -------
+        x_hat : dict
+            Interpolated state values at all nodes of the given grid.
+        x_prime : dict
+            Evaluted state values at all nodes of the given grid from use of Integration matrix.
+
+        """
+        x_hat, values = self._interpolate(phase, grid, L)
+
+        f_hat, dt_dstau = _eval_rates(_eval_problem_spec(phase), grid, values,
+                                      (phase.pathname,) + _grid_signature(grid),
+                                      self._eval_problems, self.cache_size)
 
-        return x_hat, x_prime
+        return x_hat, self._propagate(phase, grid, I, x_hat, f_hat, dt_dstau)
 
     def write_iteration(self, f, iter_number, phases, refine_results):
         """
@@ -0,0 +1,118 @@
+import unittest
+
+import numpy as np
+import scipy.sparse as sp
+
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_near_equal
+from openmdao.utils.testing_utils import use_tempdirs
+
+import dymos as dm
+from dymos.examples.brachistochrone.brachistochrone_ode import BrachistochroneODE
+from dymos.grid_refinement.ph_adaptive.ph_adaptive import PHAdaptive, interpolation_lagrange_matrix, \
+    integration_matrix
+from dymos.run_problem import find_phases
+from dymos.transcriptions.grid_data import GridData
+
+
+def _make_problem(num_phases=1):
+    p = om.Problem(model=om.Group())
+
+    traj = p.model.add_subsystem('traj', dm.Trajectory())
+
+    for i in range(num_phases):
+        phase = dm.Phase(ode_class=BrachistochroneODE,
+                         transcription=dm.Radau(num_segments=5, order=3, compressed=True))
+        traj.add_phase(f'phase{i}', phase)
+
+        phase.set_time_options(fix_initial=True, duration_bounds=(.5, 10), units='s')
+        phase.add_state('x', rate_source='xdot', units='m', fix_initial=True)
+        phase.add_state('y', rate_source='ydot', units='m', fix_initial=True)
+        phase.add_state('v', rate_source='vdot', targets=['v'], units='m/s', fix_initial=True)
+        phase.add_control('theta', targets=['theta'], units='deg', lower=0.01, upper=179.9)
+        phase.add_design_parameter('g', targets=['g'], units='m/s**2', opt=False, val=9.80665)
+
+    p.setup()
+
+    for i in range(num_phases):
+        phase = f'traj.phase{i}'
+        p[f'{phase}.t_initial'] = 0.0
+        p[f'{phase}.t_duration'] = 2.0 + i
+        p[f'{phase}.states:x'] = traj._phases[f'phase{i}'].interpolate(ys=[0, 10], nodes='state_input')
+        p[f'{phase}.states:y'] = traj._phases[f'phase{i}'].interpolate(ys=[10, 5], nodes='state_input')
+        p[f'{phase}.states:v'] = traj._phases[f'phase{i}'].interpolate(ys=[0, 9.9], nodes='state_input')
+        p[f'{phase}.controls:theta'] = traj._phases[f'phase{i}'].interpolate(ys=[5, 100], nodes='control_input')
+
+    p.run_model()
+
+    return p
+
+
+@use_tempdirs
+class TestPHAdaptive(unittest.TestCase):
+
+    def test_sparse_operators(self):
+        old_grid = GridData(num_segments=4, transcription='radau-ps', transcription_order=3)
+        new_grid = GridData(num_segments=4, transcription='radau-ps', transcription_order=4)
+
+        L = interpolation_lagrange_matrix(old_grid, new_grid)
+        I = integration_matrix(new_grid)
+
+        self.assertTrue(sp.isspmatrix_csr(L))
+        self.assertTrue(sp.isspmatrix_csr(I))
+        self.assertEqual(L.shape, (new_grid.num_nodes, old_grid.num_nodes))
+
+        # a quadratic in segment tau is interpolated exactly by the third-order segments
+        assert_near_equal(L.dot(old_grid.node_stau ** 2), new_grid.node_stau ** 2, tolerance=1.0E-12)
+
+    def test_eval_problem_reuse(self):
+        p = _make_problem()
+        phase = p.model.traj.phases.phase0
+
+        ref = PHAdaptive(find_phases(p.model))
+        error = ref.check_error()['traj.phases.phase0']['error']
+
+        self.assertEqual(len(ref._eval_problems), 1)
+        eval_prob = list(ref._eval_problems.values())[0]
+
+        # the cached evaluation problem is updated with the current solution
+        p['traj.phase0.t_duration'] = 3.0
+        p.run_model()
+        new_error = ref.check_error()['traj.phases.phase0']['error']
+
+        self.assertIs(list(ref._eval_problems.values())[0], eval_prob)
+        self.assertFalse(np.array_equal(error, new_error))
+
+        new_ref = PHAdaptive(find_phases(p.model))
+        assert_near_equal(new_ref.check_error()['traj.phases.phase0']['error'], new_error, tolerance=1.0E-12)
+
+        # a new grid gets a new evaluation problem
+        tx = phase.options['transcription']
+        tx.options['order'] = 5
+        tx.init_grid()
+        p.setup()
+        p.run_model()
+        ref.check_error()
+
+        self.assertEqual(len(ref._eval_problems), 2)
+
+    def test_parallel_check_error(self):
+        p = _make_problem(num_phases=2)
+        phases = find_phases(p.model)
+
+        serial = PHAdaptive(phases).check_error()
+
+        ref = PHAdaptive(phases, n_workers=2)
+        try:
+            for i in range(2):
+                parallel = ref.check_error()
+        finally:
+            ref.close()
+
+        for phase_path in phases:
+            assert_near_equal(parallel[phase_path]['error'], serial[phase_path]['error'], tolerance=1.0E-15)
+            self.assertTrue(np.any(serial[phase_path]['error'] > 0))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -129,6 +129,10 @@ def load_case(problem, previous_solution):
         prev_time_path = [s for s in prev_outputs if s.endswith(f'{phase_name}.timeseries.time')][0]
         prev_time = prev_outputs[prev_time_path]['value']
 
+        # Segment boundaries appear twice in the timeseries, the interpolants need distinct times.
+        nodup = np.insert(prev_time.ravel()[1:] != prev_time.ravel()[:-1], 0, True)
+        prev_time = prev_time[nodup]
+
         # initial time and duration may not be present if a simulation was loaded
         ti_path = [s for s in phase_outputs if s.endswith(f'{phase_name}.t_initial')][0]
         td_path = [s for s in phase_outputs if s.endswith(f'{phase_name}.t_duration')][0]
@@ -141,7 +145,7 @@ def load_case(problem, previous_solution):
         for state_name, options in phase.state_options.items():
             state_path = [s for s in phase_outputs if s.endswith(f'{phase_name}.states:{state_name}')][0]
             prev_state_path = [s for s in prev_outputs if s.endswith(f'{phase_name}.timeseries.states:{state_name}')][0]
-            prev_state_val = prev_outputs[prev_state_path]['value']
+            prev_state_val = prev_outputs[prev_state_path]['value'][nodup]
             prev_state_units = prev_outputs[prev_state_path]['units']
             problem.set_val(state_path,
                             phase.interpolate(xs=prev_time, ys=prev_state_val,
@@ -153,7 +157,7 @@ def load_case(problem, previous_solution):
             control_path = [s for s in phase_outputs if s.endswith(f'{phase_name}.controls:{control_name}')][0]
             prev_control_path = [s for s in prev_outputs
                                  if s.endswith(f'{phase_name}.timeseries.controls:{control_name}')][0]
-            prev_control_val = prev_outputs[prev_control_path]['value']
+            prev_control_val = prev_outputs[prev_control_path]['value'][nodup]
             prev_control_units = prev_outputs[prev_control_path]['units']
             problem.set_val(control_path,
                             phase.interpolate(xs=prev_time, ys=prev_control_val,
@@ -563,6 +563,39 @@ class TimeOptionsDictionary(om.OptionsDictionary):
                           'connected')
 
 
+class SimulationEventOptionsDictionary(om.OptionsDictionary):
+    """
+    An OptionsDictionary for events detected by scipy.integrate.solve_ivp when a Phase is simulated.
+    """
+
+    def __init__(self, read_only=False):
+        super(SimulationEventOptionsDictionary, self).__init__(read_only)
+
+        self.declare(name='name', types=str,
+                     desc='Name of the event.')
+
+        self.declare(name='var', types=str,
+                     desc='Name of the state, or path of the ODE output relative to the ODE, '
+                          'whose value triggers the event.')
+
+        self.declare(name='equals', types=(float, int), default=0.0,
+                     desc='The event occurs when the value of var crosses this value.')
+
+        self.declare(name='units', types=str, default=None, allow_none=True,
+                     desc='Units in which equals is given.  If None, the units of var are used.')
+
+        self.declare(name='index', types=int, default=0,
+                     desc='Flat index of var at a node, for variables that are not scalar.')
+
+        self.declare(name='direction', values=(-1, 0, 1), default=0,
+                     desc='Direction of the crossing.  If -1 (1) only crossings in which the value '
+                          'of var decreases (increases) trigger the event.  If 0 all crossings do.')
+
+        self.declare(name='terminal', types=bool, default=False,
+                     desc='If True, the simulation of the phase stops at the first occurrence of '
+                          'the event.')
+
+
 class GridRefinementOptionsDictionary(om.OptionsDictionary):
     """
     An OptionsDictionary for grid refinement options in a Phase.
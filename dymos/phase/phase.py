@@ -13,7 +13,8 @@ import dymos as dm
 
 from .options import ControlOptionsDictionary, DesignParameterOptionsDictionary, \
     InputParameterOptionsDictionary, StateOptionsDictionary, TimeOptionsDictionary, \
-    PolynomialControlOptionsDictionary, GridRefinementOptionsDictionary
+    PolynomialControlOptionsDictionary, GridRefinementOptionsDictionary, \
+    SimulationEventOptionsDictionary
 
 from ..transcriptions.transcription_base import TranscriptionBase
 
@@ -60,6 +61,7 @@ class Phase(om.Group):
         self.polynomial_control_options = {}
         self.design_parameter_options = {}
         self.input_parameter_options = {}
+        self.simulation_event_options = {}
         self.refine_options = GridRefinementOptionsDictionary()
 
         # Dictionaries of variable options that are set by the user via the API
@@ -80,6 +82,7 @@ class Phase(om.Group):
             self.polynomial_control_options = from_phase.polynomial_control_options.copy()
             self.design_parameter_options = from_phase.design_parameter_options.copy()
             self.input_parameter_options = from_phase.input_parameter_options.copy()
+            self.simulation_event_options = from_phase.simulation_event_options.copy()
 
             self.refine_options.update(from_phase.refine_options)
 
@@ -1250,6 +1253,47 @@ class Phase(om.Group):
         self._timeseries[timeseries]['outputs'][name]['units'] = units
         self._timeseries[timeseries]['outputs'][name]['shape'] = shape
 
+    def add_simulation_event(self, name, var, equals=0.0, units=None, index=0, direction=0,
+                             terminal=False):
+        """
+        Add an event to be detected when the phase is simulated with scipy.integrate.solve_ivp.
+
+        The event occurs when the value of var crosses equals.  The time and the states of the
+        first occurrence of the event, and the number of occurrences, are provided by the
+        simulated phase as outputs events.{name}:time, events.{name}:states:{state} and
+        events.{name}:num_occurrences.  Events are ignored by the other transcriptions.
+
+        Parameters
+        ----------
+        name : str
+            Name of the event.
+        var : str
+            Name of a state of the phase, or path of an output of the ODE relative to the ODE.
+        equals : float
+            The value of var at which the event occurs.
+        units : str or None
+            The units of equals.  If None, the units of var are used.
+        index : int
+            Flat index of var at a node, if var is not scalar.
+        direction : int
+            If -1 (1) only crossings in which var decreases (increases) trigger the event.  If 0
+            all crossings trigger the event.
+        terminal : bool
+            If True, the simulation of the phase stops at the first occurrence of the event.  The
+            states at the remaining output times of the phase hold their values at the event.
+        """
+        if name not in self.simulation_event_options:
+            self.simulation_event_options[name] = SimulationEventOptionsDictionary()
+            self.simulation_event_options[name]['name'] = name
+
+        options = self.simulation_event_options[name]
+        options['var'] = var
+        options['equals'] = equals
+        options['units'] = units
+        options['index'] = index
+        options['direction'] = direction
+        options['terminal'] = terminal
+
     def add_timeseries(self, name, transcription, subset='all'):
         r"""
         Adds a new timeseries output upon which outputs can be provided.
@@ -1730,7 +1774,8 @@ class Phase(om.Group):
             res = res.T
         return res
 
-    def get_simulation_phase(self, times_per_seg=None, method='RK45', atol=1.0E-9, rtol=1.0E-9):
+    def get_simulation_phase(self, times_per_seg=None, method='RK45', atol=1.0E-9, rtol=1.0E-9,
+                             fast_mode=True):
         """
         Return a SolveIVPPhase initialized based on data from this Phase instance and
         the given simulation times.
@@ -1746,6 +1791,9 @@ class Phase(om.Group):
             Absolute convergence tolerance for the scipy.integrate.solve_ivp method.
         rtol : float
             Relative convergence tolerance for the scipy.integrate.solve_ivp method.
+        fast_mode : bool
+            If True, solve_ivp evaluates the ODE through a compiled ODEIntegrationInterface
+            instead of calling run_model on every evaluation.
 
         Returns
         -------
@@ -1762,7 +1810,8 @@ class Phase(om.Group):
                                                     method=method,
                                                     atol=atol,
                                                     rtol=rtol,
-                                                    output_nodes_per_seg=times_per_seg))
+                                                    output_nodes_per_seg=times_per_seg,
+                                                    fast_mode=fast_mode))
 
         return sim_phase
 
@@ -1832,7 +1881,7 @@ class Phase(om.Group):
             prob['{0}input_parameters:{1}'.format(self_path, name)][...] = op['value']
 
     def simulate(self, times_per_seg=10, method='RK45', atol=1.0E-9, rtol=1.0E-9,
-                 record_file=None):
+                 record_file=None, fast_mode=True):
         """
         Simulate the Phase using scipy.integrate.solve_ivp.
 
@@ -1850,6 +1899,9 @@ class Phase(om.Group):
         record_file : str or None
             If a string, the file to which the result of the simulation will be saved.
             If None, no record of the simulation will be saved.
+        fast_mode : bool
+            If True, solve_ivp evaluates the ODE through a compiled ODEIntegrationInterface
+            instead of calling run_model on every evaluation.
 
         Returns
         -------
@@ -1862,13 +1914,14 @@ class Phase(om.Group):
 
         sim_prob = om.Problem(model=om.Group())
 
-        sim_phase = self.get_simulation_phase(times_per_seg, method=method, atol=atol, rtol=rtol)
+        sim_phase = self.get_simulation_phase(times_per_seg, method=method, atol=atol, rtol=rtol,
+                                              fast_mode=fast_mode)
 
         sim_prob.model.add_subsystem(self.name, sim_phase)
 
         if record_file is not None:
             rec = om.SqliteRecorder(record_file)
-            sim_prob.model.recording_options['includes'] = ['*.timeseries.*']
+            sim_prob.model.recording_options['includes'] = ['*.timeseries.*', '*.events.*']
 
             sim_prob.model.add_recorder(rec)
 
@@ -6,11 +6,69 @@ import dymos as dm
 import numpy as np
 from dymos.trajectory.trajectory import Trajectory
 from dymos.load_case import load_case, find_phases
+from dymos.utils.batched_sqlite_recorder import BatchedSqliteRecorder
 import os
 import sys
 
 
-def modify_problem(problem, restart=None, reset_grid=False):
+# The variables recorded at each driver iteration by each recording profile, in addition to the
+# design variables, objectives and constraints.
+#   minimal: only the design variables, objectives and constraints.
+#   restart: the times, states and controls used by load_case to restart a problem.
+#   full: all of the outputs and inputs of the model.
+recording_profiles = {'minimal': {'includes': [], 'record_inputs': False},
+                      'restart': {'includes': ['*.timeseries.time', '*.timeseries.time_phase',
+                                               '*.timeseries.states:*', '*.timeseries.controls:*',
+                                               '*.t_initial', '*.t_duration', '*.states:*',
+                                               '*.controls:*', '*.polynomial_controls:*',
+                                               '*.design_parameters:*'],
+                                  'record_inputs': False},
+                      'full': {'includes': ['*'], 'record_inputs': True}}
+
+
+def add_recorder(problem, recording='full', save_db=None):
+    """
+    Add a recorder to the driver of the problem, which records the variables of a recording profile.
+
+    The recorder must be added before the first call to final_setup of the problem, since the
+    initialization of the recording is skipped afterwards.
+
+    Parameters
+    ----------
+    problem : om.Problem
+        The problem instance to be recorded.
+    recording : str
+        The recording profile, 'minimal', 'restart' or 'full'.
+    save_db : str or None
+        The name of the database.  If None, dymos_solution.db in the current working directory.
+
+    Returns
+    -------
+    BatchedSqliteRecorder
+        The recorder added to the driver.
+    """
+    if recording not in recording_profiles:
+        raise ValueError('Invalid recording profile \'{0}\'. Valid profiles are '
+                         '{1}.'.format(recording, list(recording_profiles)))
+
+    if save_db is None:
+        save_db = os.getcwd() + '/dymos_solution.db'
+
+    try:
+        os.remove(save_db)
+    except FileNotFoundError:
+        pass  # OK if old database is not present to be deleted
+
+    print('adding recorder at:', save_db)
+    recorder = BatchedSqliteRecorder(save_db)
+    problem.driver.add_recorder(recorder)
+    problem.driver.recording_options['includes'] = recording_profiles[recording]['includes']
+    problem.driver.recording_options['record_inputs'] = recording_profiles[recording]['record_inputs']
+
+    return recorder
+
+
+def modify_problem(problem, restart=None, reset_grid=False, recording='full'):
     """
     Modifies the problem object by loading in a guess from a specified restart file.
 
@@ -22,20 +80,12 @@ def modify_problem(problem, restart=None, reset_grid=False):
         The name of a database to use for restarting the problem.
     reset_grid: Boolean
         Flag to trigger a grid reset.
+    recording : str
+        The recording profile of the solution database, 'minimal', 'restart' or 'full'.
     """
     # record variables to database when running driver under hook
     # pre-hook is important, because recording initialization is skipped if final_setup has run once
-    save_db = os.getcwd() + '/dymos_solution.db'
-
-    try:
-        os.remove(save_db)
-    except FileNotFoundError:
-        pass  # OK if old database is not present to be deleted
-
-    print('adding recorder at:', save_db)
-    problem.driver.add_recorder(om.SqliteRecorder(save_db))
-    problem.driver.recording_options['includes'] = ['*']
-    problem.driver.recording_options['record_inputs'] = True
+    add_recorder(problem, recording)
     # problem.record_iteration('final')    # TODO: not working to save only last iteration?
 
     # if opts.get('reset_grid'):  # TODO: implement this option
@@ -67,7 +117,22 @@ def modify_problem(problem, restart=None, reset_grid=False):
                 load_case(problem, case)
 
 
-def run_problem(problem, refine=False, refine_iteration_limit=10, run_driver=True, simulate=False, no_iterate=False):
+def _flush_recorders(problem):
+    """
+    Wait until the batched recorders of the driver have written the recorded iterations.
+
+    Parameters
+    ----------
+    problem : om.Problem
+        The problem whose driver recorders are flushed.
+    """
+    for recorder in problem.driver._rec_mgr._recorders:
+        if isinstance(recorder, BatchedSqliteRecorder):
+            recorder.flush()
+
+
+def run_problem(problem, refine=False, refine_iteration_limit=10, run_driver=True, simulate=False, no_iterate=False,
+                recording=None, refine_workers=1):
     """
     A Dymos-specific interface to execute an OpenMDAO problem containing Dymos Trajectories or
     Phases.  This function can iteratively call run_driver to perform grid refinement, and automatically
@@ -88,13 +153,24 @@ def run_problem(problem, refine=False, refine_iteration_limit=10, run_driver=Tru
     simulate : bool
         If True, perform a simulation of Trajectories found in the Problem after the driver
         has been run and grid refinement is complete.
+    recording : str or None
+        If not None, the recording profile of a recorder added to the driver, 'minimal',
+        'restart' or 'full'.  The solution is recorded in dymos_solution.db.
+    refine_workers : int or None
+        The number of processes which evaluate the ODEs of the phases when estimating the error of
+        the grid.  If 1, the ODEs are evaluated serially in this process.  If None, the number of
+        CPUs is used.
     """
+    if recording is not None:
+        add_recorder(problem, recording)
+
     problem.final_setup()  # make sure command line option hook has a chance to run
 
     if run_driver:
         if no_iterate:
             problem.driver.opt_settings['maxiter'] = 0
         problem.run_driver()
+        _flush_recorders(problem)
     else:
         problem.run_model()
 
@@ -103,42 +179,47 @@ def run_problem(problem, refine=False, refine_iteration_limit=10, run_driver=Tru
 
         phases = find_phases(problem.model)
 
-        ref = PHAdaptive(phases)
-        with open(out_file, 'w+') as f:
+        ref = PHAdaptive(phases, n_workers=refine_workers)
+        try:
+            with open(out_file, 'w+') as f:
 
-            for i in range(refine_iteration_limit):
-                refine_results = ref.check_error()
+                for i in range(refine_iteration_limit):
+                    refine_results = ref.check_error()
 
-                ref.refine(refine_results)
+                    ref.refine(refine_results)
 
-                for stream in f, sys.stdout:
-                    ref.write_iteration(stream, i, phases, refine_results)
+                    for stream in f, sys.stdout:
+                        ref.write_iteration(stream, i, phases, refine_results)
 
-                refined_phases = [phase_path for phase_path in refine_results if
-                                  phases[phase_path].refine_options['refine'] and
-                                  np.any(refine_results[phase_path]['need_refinement'])]
+                    refined_phases = [phase_path for phase_path in refine_results if
+                                      phases[phase_path].refine_options['refine'] and
+                                      np.any(refine_results[phase_path]['need_refinement'])]
 
-                if not refined_phases:
-                    break
+                    if not refined_phases:
+                        break
 
-                prev_soln = {'inputs': problem.model.list_inputs(out_stream=None, units=True, prom_name=True),
-                             'outputs': problem.model.list_outputs(out_stream=None, units=True, prom_name=True)}
+                    prev_soln = {'inputs': problem.model.list_inputs(out_stream=None, units=True, prom_name=True),
+                                 'outputs': problem.model.list_outputs(out_stream=None, units=True, prom_name=True)}
 
-                # TODO: Until this is fixed in OpenMDAO 3.0.1
-                if isinstance(problem.driver, om.pyOptSparseDriver):
-                    problem.driver._res_jacs = {}
+                    # TODO: Until this is fixed in OpenMDAO 3.0.1
+                    if isinstance(problem.driver, om.pyOptSparseDriver):
+                        problem.driver._res_jacs = {}
 
-                problem.setup()
+                    problem.setup()
 
-                load_case(problem, prev_soln)
+                    load_case(problem, prev_soln)
 
-                problem.run_driver()
-            for stream in [f, sys.stdout]:
-                if i == refine_iteration_limit-1:
-                    print('Iteration limit exceeded. Unable to satisfy specified tolerance', file=stream)
-                else:
-                    print('Successfully completed grid refinement.', file=stream)
-            print(50 * '=')
+                    problem.run_driver()
+                    _flush_recorders(problem)
+                for stream in [f, sys.stdout]:
+                    if i == refine_iteration_limit-1:
+                        print('Iteration limit exceeded. Unable to satisfy specified tolerance', file=stream)
+                    else:
+                        print('Successfully completed grid refinement.', file=stream)
+                print(50 * '=')
+        finally:
+            # shut down the worker processes also if the refinement fails
+            ref.close()
 
     if simulate:
         for subsys, local in problem.model._all_subsystem_iter():
@@ -16,7 +16,7 @@ class TestRunProblem(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
-        for filename in ['total_coloring.pkl', 'SLSQP.out', 'SNOPT_print.out']:
+        for filename in ['total_coloring.pkl', 'SLSQP.out', 'SNOPT_print.out', 'dymos_solution.db']:
             if os.path.exists(filename):
                 os.remove(filename)
 
@@ -253,6 +253,79 @@ class TestRunProblem(unittest.TestCase):
             assert_almost_equal(x0q, fx0s(tq), decimal=2)
             assert_almost_equal(uq, fus(tq), decimal=5)
 
+    def _make_brachistochrone(self):
+        p = om.Problem(model=om.Group())
+        p.driver = om.ScipyOptimizeDriver(optimizer='SLSQP')
+
+        traj = p.model.add_subsystem('traj', dm.Trajectory())
+        phase0 = traj.add_phase('phase0', dm.Phase(ode_class=BrachistochroneODE,
+                                                   transcription=dm.Radau(num_segments=10, order=3)))
+        phase0.set_time_options(fix_initial=True, duration_bounds=(.5, 10))
+        phase0.add_state('x', fix_initial=True, fix_final=True, rate_source='xdot', units='m')
+        phase0.add_state('y', fix_initial=True, fix_final=True, rate_source='ydot', units='m')
+        phase0.add_state('v', fix_initial=True, fix_final=False, rate_source='vdot', targets=['v'],
+                         units='m/s')
+        phase0.add_control('theta', continuity=True, rate_continuity=True, units='deg', lower=0.01,
+                           upper=179.9, targets=['theta'])
+        phase0.add_input_parameter('g', units='m/s**2', val=9.80665, targets=['g'])
+        phase0.add_objective('time', loc='final', scaler=10)
+
+        p.setup()
+
+        p.set_val('traj.phase0.t_initial', 0.0)
+        p.set_val('traj.phase0.t_duration', 2.0)
+        p.set_val('traj.phase0.states:x', phase0.interpolate(ys=[0, 10], nodes='state_input'))
+        p.set_val('traj.phase0.states:y', phase0.interpolate(ys=[10, 5], nodes='state_input'))
+        p.set_val('traj.phase0.states:v', phase0.interpolate(ys=[0, 9.9], nodes='state_input'))
+        p.set_val('traj.phase0.controls:theta', phase0.interpolate(ys=[5, 100], nodes='control_input'))
+
+        return p
+
+    def test_recording_profiles(self):
+        sizes = {}
+
+        for recording in ['minimal', 'restart', 'full']:
+            p = self._make_brachistochrone()
+            dm.run_problem(p, recording=recording)
+
+            # all of the iterations are written when run_problem returns
+            cr = om.CaseReader('dymos_solution.db')
+            cases = cr.list_cases('driver', recurse=False)
+            self.assertEqual(len(cases), p.driver.iter_count)
+
+            case = cr.get_case(cases[-1])
+            assert_near_equal(case.get_val('traj.phase0.t_duration'), 1.8016, tolerance=1.0E-3)
+
+            if recording == 'minimal':
+                self.assertNotIn('traj.phase0.timeseries.states:x', case.outputs)
+            else:
+                self.assertIn('traj.phase0.timeseries.states:x', case.outputs)
+
+            p.cleanup()
+            sizes[recording] = os.path.getsize('dymos_solution.db')
+
+        self.assertLess(sizes['minimal'], sizes['restart'])
+        self.assertLess(sizes['restart'], sizes['full'])
+
+    def test_restart_profile(self):
+        from dymos.run_problem import modify_problem
+
+        p = self._make_brachistochrone()
+        dm.run_problem(p, recording='restart')
+        p.cleanup()
+        os.rename('dymos_solution.db', 'brachistochrone_restart.db')
+
+        # the restart database has the variables needed to load the solution
+        q = self._make_brachistochrone()
+        modify_problem(q, restart='brachistochrone_restart.db', recording='minimal')
+        dm.run_problem(q, run_driver=False)
+
+        assert_near_equal(q.get_val('traj.phase0.timeseries.states:x'),
+                          p.get_val('traj.phase0.timeseries.states:x'), tolerance=1.0E-6)
+
+        q.cleanup()
+        os.remove('brachistochrone_restart.db')
+
 
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
@@ -158,6 +158,16 @@ class TestTrajectory(unittest.TestCase):
         accel_link_error = self.p.get_val('linkages.burn1|burn2_accel')
         assert_near_equal(accel_link_error, burn2_accel[0]-burn1_accel[-1])
 
+    def test_simulate_parallel(self):
+        sim_serial = self.traj.simulate(times_per_seg=5)
+        sim_parallel = self.traj.simulate(times_per_seg=5, n_workers=2)
+
+        # the phases integrated by the workers give the same timeseries as the serial simulation
+        for phase in ['burn1', 'coast', 'burn2']:
+            for var in ['time', 'states:r', 'states:theta', 'states:deltav', 'controls:u1']:
+                path = 'sim_traj.phases.{0}.timeseries.{1}'.format(phase, var)
+                assert_near_equal(sim_parallel.get_val(path), sim_serial.get_val(path), tolerance=1.0E-15)
+
 
 class TestInvalidLinkages(unittest.TestCase):
 
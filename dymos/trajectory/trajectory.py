@@ -1,6 +1,8 @@
 from collections import OrderedDict
 from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
 import itertools
+import os
 import warnings
 try:
     from itertools import izip
@@ -16,11 +18,60 @@ from ..utils.constants import INF_BOUND
 from ..transcriptions.common import InputParameterComp, PhaseLinkageComp
 from ..phase.options import TrajDesignParameterOptionsDictionary, \
     TrajInputParameterOptionsDictionary
+from ..transcriptions.solve_ivp.components import SegmentSimulationComp
 
 
 _unspecified = object()
 
 
+def _simulate_phase(traj_name, phase_name, sim_phs, design_parameter_options,
+                    input_parameter_options, values):
+    """
+    Simulate one phase of a trajectory in a standalone problem.
+
+    This function is executed by the workers of Trajectory.simulate.
+
+    Parameters
+    ----------
+    traj_name : str
+        The name of the simulated trajectory in the simulation problem.
+    phase_name : str
+        The name of the phase.
+    sim_phs : Phase
+        The simulation phase, which has not been setup.
+    design_parameter_options : dict
+        The design parameter options of the trajectory.
+    input_parameter_options : dict
+        The input parameter options of the trajectory.
+    values : dict
+        The values of the independent variables of the phase and the trajectory, keyed by
+        absolute name.
+
+    Returns
+    -------
+    dict
+        The input and output vectors of the segments of the phase, keyed by the absolute name of
+        the segment.
+    """
+    sim_traj = Trajectory(sim_mode=True)
+    sim_traj.add_phase(phase_name, sim_phs)
+
+    sim_traj.design_parameter_options.update(design_parameter_options)
+    sim_traj.input_parameter_options.update(input_parameter_options)
+
+    prob = om.Problem(model=om.Group())
+    prob.model.add_subsystem(traj_name, sim_traj)
+    prob.setup(check=False)
+
+    for name, val in values.items():
+        prob.set_val(name, val)
+
+    prob.run_model()
+
+    return {seg.pathname: (seg._inputs._data.copy(), seg._outputs._data.copy())
+            for seg in sim_phs.system_iter(recurse=True, typ=SegmentSimulationComp)}
+
+
 class Trajectory(om.Group):
     """
     A Trajectory object serves as a container for one or more Phases, as well as the linkage
@@ -270,7 +321,8 @@ class Trajectory(om.Group):
                                   'val': options['val'],
                                   'targets': tgts[phase_name]}
 
-                        if not self.options['sim_mode']:
+                        # The phase keeps the input parameter if the problem is setup again.
+                        if not self.options['sim_mode'] and name not in phs.input_parameter_options:
                             phs.add_input_parameter(name, **kwargs)
 
     def _setup_design_parameters(self):
@@ -326,7 +378,8 @@ class Trajectory(om.Group):
                                   'val': options['val'],
                                   'targets': tgts[phase_name]}
 
-                        if not self.options['sim_mode']:
+                        # The phase keeps the input parameter if the problem is setup again.
+                        if not self.options['sim_mode'] and name not in phs.input_parameter_options:
                             phs.add_input_parameter(name, **kwargs)
 
     def _setup_linkages(self):
@@ -722,7 +775,8 @@ class Trajectory(om.Group):
                 self._linkages[phase1_name, phase2_name][var] = {'locs': locs, 'units': None,
                                                                  'connected': connected}
 
-    def simulate(self, times_per_seg=10, method='RK45', atol=1.0E-9, rtol=1.0E-9, record_file=None):
+    def simulate(self, times_per_seg=10, method='RK45', atol=1.0E-9, rtol=1.0E-9, record_file=None,
+                 fast_mode=True, n_workers=1):
         """
         Simulate the Trajectory using scipy.integrate.solve_ivp.
 
@@ -740,6 +794,13 @@ class Trajectory(om.Group):
         record_file : str or None
             If a string, the file to which the result of the simulation will be saved.
             If None, no record of the simulation will be saved.
+        fast_mode : bool
+            If True, solve_ivp evaluates the ODE through a compiled ODEIntegrationInterface
+            instead of calling run_model on every evaluation.
+        n_workers : int or None
+            The number of processes which simulate the phases.  The phases are independent, since
+            each one starts from the solution of the Trajectory.  If 1, the phases are simulated
+            serially in this process.  If None, the number of CPUs is used.
 
         Returns
         -------
@@ -752,7 +813,7 @@ class Trajectory(om.Group):
 
         for name, phs in self._phases.items():
             sim_phs = phs.get_simulation_phase(times_per_seg=times_per_seg, method=method,
-                                               atol=atol, rtol=rtol)
+                                               atol=atol, rtol=rtol, fast_mode=fast_mode)
             sim_traj.add_phase(name, sim_phs)
 
         sim_traj.design_parameter_options.update(self.design_parameter_options)
@@ -767,7 +828,7 @@ class Trajectory(om.Group):
 
         if record_file is not None:
             rec = om.SqliteRecorder(record_file)
-            sim_prob.model.recording_options['includes'] = ['*.timeseries.*']
+            sim_prob.model.recording_options['includes'] = ['*.timeseries.*', '*.events.*']
             sim_prob.model.add_recorder(rec)
 
         sim_prob.setup(check=True)
@@ -792,7 +853,70 @@ class Trajectory(om.Group):
             phs.initialize_values_from_phase(sim_prob, self._phases[phase_name])
 
         print('\nSimulating trajectory {0}'.format(self.pathname))
+
+        if n_workers != 1 and len(sim_traj._phases) > 1:
+            self._simulate_phases_parallel(sim_prob, sim_traj, n_workers,
+                                           dict(times_per_seg=times_per_seg, method=method,
+                                                atol=atol, rtol=rtol, fast_mode=fast_mode))
+
         sim_prob.run_model()
         print('Done simulating trajectory {0}'.format(self.pathname))
 
         return sim_prob
+
+    def _simulate_phases_parallel(self, sim_prob, sim_traj, n_workers, sim_options):
+        """
+        Integrate the phases of the simulation problem in a pool of processes.
+
+        Each worker sets up a problem with one of the phases and the independent variables of the
+        phase and the trajectory, and returns the input and output vectors of its segments.  These
+        are given to the segments of sim_prob, which use them instead of integrating their inputs
+        when sim_prob is run.
+
+        Parameters
+        ----------
+        sim_prob : Problem
+            The simulation problem, which has been setup and initialized.
+        sim_traj : Trajectory
+            The simulated trajectory in sim_prob.
+        n_workers : int or None
+            The number of processes.  If None, the number of CPUs is used.
+        sim_options : dict
+            The keyword arguments of get_simulation_phase.
+        """
+        traj_name = sim_traj.pathname
+        phases_path = '{0}.phases.'.format(traj_name)
+
+        # the values set after setup are in the vectors of the problem after final_setup
+        sim_prob.final_setup()
+
+        # The independent variables are the outputs of the IndepVarComps and the unconnected
+        # inputs.  Those which are not in a phase are shared by all of the phases.
+        conns = sim_prob.model._conn_global_abs_in2out
+        names = [name for ivc in sim_traj.system_iter(recurse=True, typ=om.IndepVarComp)
+                 for name in ivc._var_allprocs_abs_names['output']]
+        names.extend(name for name in sim_traj._var_allprocs_abs_names['input'] if name not in conns)
+
+        traj_values = {}
+        phase_values = {name: {} for name in sim_traj._phases}
+        for name in names:
+            values = traj_values
+            if name.startswith(phases_path):
+                values = phase_values[name[len(phases_path):].split('.')[0]]
+            values[name] = sim_prob.get_val(name)
+
+        with ProcessPoolExecutor(max_workers=n_workers or os.cpu_count()) as executor:
+            futures = []
+            for name, phs in self._phases.items():
+                sim_phs = phs.get_simulation_phase(**sim_options)
+                values = dict(traj_values, **phase_values[name])
+                futures.append(executor.submit(_simulate_phase, traj_name, name, sim_phs,
+                                               self.design_parameter_options,
+                                               self.input_parameter_options, values))
+
+            results = {}
+            for future in futures:
+                results.update(future.result())
+
+        for seg in sim_traj.system_iter(recurse=True, typ=SegmentSimulationComp):
+            seg._precomputed = results[seg.pathname]
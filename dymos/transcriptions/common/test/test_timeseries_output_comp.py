@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+import scipy.sparse as sp
+
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_check_partials, assert_near_equal
+
+from dymos.transcriptions.grid_data import GridData
+from dymos.transcriptions.common import PseudospectralTimeseriesOutputComp
+
+
+class TestPseudospectralTimeseriesOutputComp(unittest.TestCase):
+
+    def _make_problem(self, igd, ogd):
+        p = om.Problem()
+
+        ts = PseudospectralTimeseriesOutputComp(input_grid_data=igd, output_grid_data=ogd)
+        ts._add_timeseries_output('x', var_class='state', shape=(1,), units='m')
+        ts._add_timeseries_output('y', var_class='ode', shape=(2, 3), units='m')
+
+        p.model.add_subsystem('timeseries', ts)
+        p.setup(force_alloc_complex=True)
+
+        np.random.seed(0)
+        p['timeseries.input_values:x'] = np.random.rand(igd.num_nodes, 1)
+        p['timeseries.input_values:y'] = np.random.rand(igd.num_nodes, 2, 3)
+
+        p.run_model()
+
+        return p
+
+    def test_sparse_interpolation(self):
+        igd = GridData(num_segments=14, transcription='gauss-lobatto', transcription_order=3)
+        ogd = GridData(num_segments=14, transcription='gauss-lobatto', transcription_order=5)
+
+        p = self._make_problem(igd, ogd)
+        ts = p.model.timeseries
+
+        self.assertTrue(sp.isspmatrix_csr(ts.interpolation_matrix))
+
+        # a quadratic in time is interpolated exactly by the 3-node segments
+        p['timeseries.input_values:x'] = igd.node_ptau[:, np.newaxis] ** 2
+        p.run_model()
+
+        assert_near_equal(p['timeseries.x'], ogd.node_ptau[:, np.newaxis] ** 2, tolerance=1.0E-12)
+
+        # the vector-valued output matches the interpolation with the dense matrix
+        L = ts.interpolation_matrix.toarray()
+        assert_near_equal(p['timeseries.y'],
+                          np.tensordot(L, p['timeseries.input_values:y'], axes=(1, 0)),
+                          tolerance=1.0E-12)
+
+        # only the nonzero entries of the block-diagonal jacobian are declared
+        subjacs = ts._subjacs_info
+        self.assertEqual(len(subjacs['timeseries.y', 'timeseries.input_values:y']['rows']),
+                         6 * ts.interpolation_matrix.nnz)
+
+        cpd = p.check_partials(method='cs', out_stream=None)
+        assert_check_partials(cpd)
+
+    def test_same_grid(self):
+        igd = GridData(num_segments=3, transcription='radau-ps', transcription_order=3)
+
+        p = self._make_problem(igd, None)
+
+        assert_near_equal(p['timeseries.y'], p['timeseries.input_values:y'], tolerance=1.0E-12)
+
+        cpd = p.check_partials(method='cs', out_stream=None)
+        assert_check_partials(cpd)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
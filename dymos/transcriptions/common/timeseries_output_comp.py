@@ -1,6 +1,6 @@
 import numpy as np
 import openmdao.api as om
-from scipy.linalg import block_diag
+import scipy.sparse as sp
 
 from dymos.transcriptions.grid_data import GridData
 from dymos.utils.lagrange import lagrange_matrices
@@ -69,6 +69,49 @@ class TimeseriesOutputCompBase(om.ExplicitComponent):
                   'distributed': distributed}
         self._timeseries_outputs.append((name, kwargs))
 
+    def _declare_interpolation_partials(self, input_name, output_name, shape):
+        """
+        Declare the constant partials of an output interpolated with self.interpolation_matrix.
+
+        The interpolation matrix is block diagonal (one block per segment) and is stored in CSR
+        format.  The jacobian of a variable of the given shape is the Kronecker product of the
+        interpolation matrix with an identity matrix of the size of the variable, so only its
+        nonzero entries are declared.
+
+        Parameters
+        ----------
+        input_name : str
+            Name of the input of values on the input grid.
+        output_name : str
+            Name of the output of values on the output grid.
+        shape : tuple
+            Shape of the variable at a single node.
+        """
+        size = np.prod(shape)
+        jac = sp.kron(self.interpolation_matrix, sp.eye(size, format='csr'), format='coo')
+
+        self.declare_partials(of=output_name, wrt=input_name,
+                              rows=jac.row, cols=jac.col, val=jac.data)
+
+    def _interpolate(self, inputs, outputs):
+        """
+        Interpolate all of the timeseries outputs from the input grid to the output grid.
+
+        Parameters
+        ----------
+        inputs : Vector
+            Unscaled, dimensional input variables read via inputs[key].
+        outputs : Vector
+            Unscaled, dimensional output variables read via outputs[key].
+        """
+        L = self.interpolation_matrix
+        num_output_nodes, num_input_nodes = L.shape
+
+        for (input_name, output_name, shape) in self._vars:
+            size = np.prod(shape)
+            vals = inputs[input_name].reshape((num_input_nodes, size))
+            outputs[output_name] = L.dot(vals).reshape((num_output_nodes,) + shape)
+
 
 class PseudospectralTimeseriesOutputComp(TimeseriesOutputCompBase):
 
@@ -118,7 +161,8 @@ class PseudospectralTimeseriesOutputComp(TimeseriesOutputCompBase):
             L, _ = lagrange_matrices(istau_segi, ostau_segi)
             L_blocks.append(L)
 
-        self.interpolation_matrix = block_diag(*L_blocks)
+        self.interpolation_matrix = sp.block_diag(L_blocks, format='csr')
+        self.interpolation_matrix.eliminate_zeros()
 
         for (name, kwargs) in self._timeseries_outputs:
             input_kwargs = {k: kwargs[k] for k in ('units', 'desc')}
@@ -136,23 +180,7 @@ class PseudospectralTimeseriesOutputComp(TimeseriesOutputCompBase):
 
             self._vars.append((input_name, output_name, shape))
 
-            size = np.prod(shape)
-            val_jac = np.zeros((output_num_nodes, size, input_num_nodes, size))
-
-            for i in range(size):
-                val_jac[:, i, :, i] = self.interpolation_matrix
-
-            val_jac = val_jac.reshape((output_num_nodes * size, input_num_nodes * size),
-                                      order='C')
-
-            val_jac_rows, val_jac_cols = np.where(val_jac != 0)
-
-            rs, cs = val_jac_rows, val_jac_cols
-            self.declare_partials(of=output_name,
-                                  wrt=input_name,
-                                  rows=rs, cols=cs, val=val_jac[rs, cs])
+            self._declare_interpolation_partials(input_name, output_name, shape)
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
-        for (input_name, output_name, _) in self._vars:
-            outputs[output_name] = np.tensordot(self.interpolation_matrix, inputs[input_name],
-                                                axes=(1, 0))
+        self._interpolate(inputs, outputs)
@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.linalg import block_diag
+import scipy.sparse as sp
 
 from ...common.timeseries_output_comp import TimeseriesOutputCompBase
 from ....transcriptions.grid_data import GridData
@@ -51,8 +51,8 @@ class RungeKuttaTimeseriesOutputComp(TimeseriesOutputCompBase):
             L, _ = lagrange_matrices(istau_segi, ostau_segi)
             L_blocks.append(L)
 
-        self.interpolation_matrix = block_diag(*L_blocks)
-        r, c = np.nonzero(self.interpolation_matrix)
+        self.interpolation_matrix = sp.block_diag(L_blocks, format='csr')
+        self.interpolation_matrix.eliminate_zeros()
 
         output_num_nodes, input_num_nodes = self.interpolation_matrix.shape
 
@@ -71,23 +71,7 @@ class RungeKuttaTimeseriesOutputComp(TimeseriesOutputCompBase):
 
             self._vars.append((input_name, output_name, kwargs['shape']))
 
-            size = np.prod(kwargs['shape'])
-            val_jac = np.zeros((output_num_nodes, size, input_num_nodes, size))
-
-            for i in range(size):
-                val_jac[:, i, :, i] = self.interpolation_matrix
-
-            val_jac = val_jac.reshape((output_num_nodes * size, input_num_nodes * size),
-                                      order='C')
-
-            val_jac_rows, val_jac_cols = np.where(val_jac != 0)
-
-            rs, cs = val_jac_rows, val_jac_cols
-            self.declare_partials(of=output_name,
-                                  wrt=input_name,
-                                  rows=rs, cols=cs, val=val_jac[rs, cs])
+            self._declare_interpolation_partials(input_name, output_name, kwargs['shape'])
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
-        for (input_name, output_name, _) in self._vars:
-            outputs[output_name] = np.tensordot(self.interpolation_matrix, inputs[input_name],
-                                                axes=(1, 0))
+        self._interpolate(inputs, outputs)
@@ -7,3 +7,4 @@ from .solve_ivp_control_group import SolveIVPControlGroup
 from .solve_ivp_polynomial_control_group import SolveIVPPolynomialControlGroup
 from .solve_ivp_timeseries_comp import SolveIVPTimeseriesOutputComp
 from .state_rate_collector_comp import StateRateCollectorComp
+from .simulation_events_comp import SimulationEventsComp
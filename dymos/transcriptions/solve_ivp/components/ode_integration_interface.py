@@ -3,7 +3,9 @@ from collections import OrderedDict
 import numpy as np
 from .odeint_control_interpolation_comp import ODEIntControlInterpolationComp
 from .state_rate_collector_comp import StateRateCollectorComp
+from ....utils.indexing import get_src_indices_by_row
 import openmdao.api as om
+from openmdao.utils.units import unit_conversion
 
 
 class ODEIntegrationInterface(object):
@@ -34,10 +36,24 @@ class ODEIntegrationInterface(object):
         The input parameter options for the phase being simulated.
     ode_init_kwargs : dict
         Keyword argument dictionary passed to the ODE at initialization.
+    num_nodes : int
+        The number of trajectories evaluated at once.  The ODE is instantiated with this number
+        of nodes and the state vector passed to the interface holds the states of every
+        trajectory, stacked as (num_nodes, num_states) and flattened in C-order.  Time, controls
+        and parameters are shared by all trajectories.
+
+    Notes
+    -----
+    Calling `compile` once the problem is setup switches the interface to a fast mode.
+    Instead of calling `run_model()` and setting the values through the Problem interface on
+    every evaluation, the time and the states are written directly into views of the output
+    vector of the model, `run_solve_nonlinear()` is called on the model, and the state rates are
+    read from views of the output vector.  The values of the parameters and controls present in
+    the problem when the interface is called are used (they are frozen during an integration).
     """
     def __init__(self, ode_class, time_options, state_options, control_options,
                  polynomial_control_options, design_parameter_options, input_parameter_options,
-                 ode_init_kwargs=None):
+                 ode_init_kwargs=None, num_nodes=1):
 
         # Get the state vector.  This isn't necessarily ordered
         # so just pick the default ordering and go with it.
@@ -61,8 +77,22 @@ class ODEIntegrationInterface(object):
                                          'targets': options['targets']}
             pos += self.state_options[state]['size']
 
-        self._state_vec = np.zeros(pos, dtype=float)
-        self._state_rate_vec = np.zeros(pos, dtype=float)
+        self.num_nodes = num_nodes
+        self.num_states = pos
+        self._state_vec = np.zeros(num_nodes * pos, dtype=float)
+        self._state_rate_vec = np.zeros(num_nodes * pos, dtype=float)
+
+        # Views of the output vector used in fast mode.  They are populated by compile.
+        self._compiled = False
+        self._views = {}
+
+        # Time and states of the last evaluation of the ODE.  Event functions evaluated at the
+        # same point read the outputs of the ODE instead of evaluating it again.
+        self._last_eval = None
+
+        # With more than one node the time, controls and static sources are scalar and are
+        # broadcast to the nodes of the ODE.
+        self._src_idxs = None if num_nodes == 1 else np.zeros(num_nodes, dtype=int)
 
         #
         # Build odeint problem interface
@@ -81,29 +111,39 @@ class ODEIntegrationInterface(object):
         model.add_subsystem('time_input', ivc, promotes_outputs=['*'])
 
         model.connect('time', ['ode.{0}'.format(tgt) for tgt in
-                               self.time_options['targets']])
+                               self.time_options['targets']],
+                      src_indices=self._src_idxs)
 
         model.connect('time_phase', ['ode.{0}'.format(tgt) for tgt in
-                                     self.time_options['time_phase_targets']])
+                                     self.time_options['time_phase_targets']],
+                      src_indices=self._src_idxs)
 
         model.connect('t_initial',
                       ['ode.{0}'.format(tgt) for tgt in
-                       self.time_options['t_initial_targets']])
+                       self.time_options['t_initial_targets']],
+                      src_indices=self._src_idxs)
 
         model.connect('t_duration',
                       ['ode.{0}'.format(tgt) for tgt in
-                       self.time_options['t_duration_targets']])
+                       self.time_options['t_duration_targets']],
+                      src_indices=self._src_idxs)
 
         # The States Comp
         for name, options in self.state_options.items():
             ivc.add_output('states:{0}'.format(name),
-                           shape=(1, np.prod(options['shape'])),
+                           shape=(num_nodes, np.prod(options['shape'])),
                            units=options['units'])
 
             rate_src = self._get_rate_source_path(name)
 
+            if rate_src.startswith('ode.') or rate_src.startswith('states:'):
+                rate_src_idxs = None
+            else:
+                rate_src_idxs = self._get_src_indices(options['shape'])
+
             model.connect(rate_src,
-                          'state_rate_collector.state_rates_in:{0}_rate'.format(name))
+                          'state_rate_collector.state_rates_in:{0}_rate'.format(name),
+                          src_indices=rate_src_idxs)
 
             if options['targets'] is not None:
                 model.connect('states:{0}'.format(name),
@@ -122,36 +162,44 @@ class ODEIntegrationInterface(object):
 
         if self.control_options:
             for name, options in self.control_options.items():
+                src_idxs = self._get_src_indices(options['shape'])
                 if options['targets']:
                     model.connect('controls:{0}'.format(name),
-                                  ['ode.{0}'.format(tgt) for tgt in options['targets']])
+                                  ['ode.{0}'.format(tgt) for tgt in options['targets']],
+                                  src_indices=src_idxs)
                 if options['rate_targets']:
                     model.connect('control_rates:{0}_rate'.format(name),
-                                  ['ode.{0}'.format(tgt) for tgt in options['rate_targets']])
+                                  ['ode.{0}'.format(tgt) for tgt in options['rate_targets']],
+                                  src_indices=src_idxs)
                 if options['rate2_targets']:
                     model.connect('control_rates:{0}_rate2'.format(name),
-                                  ['ode.{0}'.format(tgt) for tgt in options['rate2_targets']])
+                                  ['ode.{0}'.format(tgt) for tgt in options['rate2_targets']],
+                                  src_indices=src_idxs)
 
         if self.polynomial_control_options:
             for name, options in self.polynomial_control_options.items():
                 tgts = options['targets']
                 rate_tgts = options['rate_targets']
                 rate2_tgts = options['rate2_targets']
+                src_idxs = self._get_src_indices(options['shape'])
                 if options['targets']:
                     if isinstance(tgts, str):
                         tgts = [tgts]
                     model.connect('polynomial_controls:{0}'.format(name),
-                                  ['ode.{0}'.format(tgt) for tgt in tgts])
+                                  ['ode.{0}'.format(tgt) for tgt in tgts],
+                                  src_indices=src_idxs)
                 if options['rate_targets']:
                     if isinstance(rate_tgts, str):
                         rate_tgts = [rate_tgts]
                     model.connect('polynomial_control_rates:{0}_rate'.format(name),
-                                  ['ode.{0}'.format(tgt) for tgt in rate_tgts])
+                                  ['ode.{0}'.format(tgt) for tgt in rate_tgts],
+                                  src_indices=src_idxs)
                 if options['rate2_targets']:
                     if isinstance(rate2_tgts, str):
                         rate2_tgts = [rate2_tgts]
                     model.connect('polynomial_control_rates:{0}_rate2'.format(name),
-                                  ['ode.{0}'.format(tgt) for tgt in rate2_tgts])
+                                  ['ode.{0}'.format(tgt) for tgt in rate2_tgts],
+                                  src_indices=src_idxs)
 
         if self.design_parameter_options:
             for name, options in self.design_parameter_options.items():
@@ -162,8 +210,10 @@ class ODEIntegrationInterface(object):
                     tgts = options['targets']
                     if isinstance(tgts, str):
                         tgts = [tgts]
+                    src_idxs = self._get_src_indices(options['shape']) if options['dynamic'] else None
                     model.connect('design_parameters:{0}'.format(name),
-                                  ['ode.{0}'.format(tgt) for tgt in tgts])
+                                  ['ode.{0}'.format(tgt) for tgt in tgts],
+                                  src_indices=src_idxs)
 
         if self.input_parameter_options:
             for name, options in self.input_parameter_options.items():
@@ -174,21 +224,42 @@ class ODEIntegrationInterface(object):
                     tgts = options['targets']
                     if isinstance(tgts, str):
                         tgts = [tgts]
+                    src_idxs = self._get_src_indices(options['shape']) if options['dynamic'] else None
                     model.connect('input_parameters:{0}'.format(name),
-                                  ['ode.{0}'.format(tgt) for tgt in tgts])
+                                  ['ode.{0}'.format(tgt) for tgt in tgts],
+                                  src_indices=src_idxs)
 
         # The ODE System
         if ode_class is not None:
-            model.add_subsystem('ode', subsys=ode_class(num_nodes=1, **ode_init_kwargs))
+            model.add_subsystem('ode', subsys=ode_class(num_nodes=num_nodes, **ode_init_kwargs))
 
         # The state rate collector comp
         self.prob.model.add_subsystem('state_rate_collector',
                                       StateRateCollectorComp(state_options=self.state_options,
-                                                             time_units=time_options['units']))
+                                                             time_units=time_options['units'],
+                                                             num_nodes=None if num_nodes == 1 else num_nodes))
 
         # Flag that is set to true if has_controls is called
         self._has_dynamic_controls = False
 
+    def _get_src_indices(self, shape):
+        """
+        Return the source indices that broadcast a variable of the given shape to the ODE nodes.
+
+        Parameters
+        ----------
+        shape : tuple
+            The shape of the variable at each node.
+
+        Returns
+        -------
+        src_indices : np.array or None
+            The flat source indices, or None if the ODE has a single node.
+        """
+        if self.num_nodes == 1:
+            return None
+        return get_src_indices_by_row(self._src_idxs, shape)
+
     def _get_rate_source_path(self, state_var):
         var = self.state_options[state_var]['rate_source']
 
@@ -231,17 +302,19 @@ class ODEIntegrationInterface(object):
         Parameters
         ----------
         x : np.array
-            The 1D state vector.
+            The 1D state vector.  If num_nodes > 1, the states of the trajectories stacked as
+            (num_nodes, num_states) and flattened.
 
         Returns
         -------
         None
 
         """
+        x = np.reshape(x, (self.num_nodes, self.num_states))
         for state_name, state_options in self.state_options.items():
             pos = state_options['pos']
             size = state_options['size']
-            self.prob['states:{0}'.format(state_name)][0, ...] = x[pos:pos + size]
+            self.prob['states:{0}'.format(state_name)] = x[:, pos:pos + size]
 
     def _pack_state_rate_vec(self):
         """
@@ -250,17 +323,73 @@ class ODEIntegrationInterface(object):
         Returns
         -------
         dXdt: np.array
-            The 1D state-rate vector.
+            The 1D state-rate vector.  If num_nodes > 1, the rates of the trajectories stacked as
+            (num_nodes, num_states) and flattened.
 
         """
+        xdot = np.reshape(self._state_rate_vec, (self.num_nodes, self.num_states))
         for state_name, state_options in self.state_options.items():
             pos = state_options['pos']
             size = state_options['size']
-            self._state_rate_vec[pos:pos + size] = \
-                np.ravel(self.prob['state_rate_collector.'
-                                   'state_rates:{0}_rate'.format(state_name)])
+            xdot[:, pos:pos + size] = \
+                np.reshape(self.prob['state_rate_collector.'
+                                     'state_rates:{0}_rate'.format(state_name)],
+                           (self.num_nodes, size))
         return self._state_rate_vec
 
+    def compile(self):
+        """
+        Switch the interface to fast mode.
+
+        The problem must have been setup.  The views of the time, state and state rate variables
+        in the output vector of the model are stored so that the interface can call the model
+        directly.  Calling compile more than once has no effect.
+
+        Returns
+        -------
+        ODEIntegrationInterface
+            This instance.
+        """
+        if self._compiled:
+            return self
+
+        self.prob.final_setup()
+
+        model = self.prob.model
+        prom2abs = model._var_allprocs_prom2abs_list['output']
+        views = model._outputs._views
+
+        self._views['time'] = views[prom2abs['time'][0]]
+        self._views['time_phase'] = views[prom2abs['time_phase'][0]]
+        self._views['t_initial'] = views[prom2abs['t_initial'][0]]
+
+        for name in self.state_options:
+            self._views['states:{0}'.format(name)] = views[prom2abs['states:{0}'.format(name)][0]]
+            self._views['state_rates:{0}'.format(name)] = \
+                views['state_rate_collector.state_rates:{0}_rate'.format(name)]
+
+        self._compiled = True
+
+        return self
+
+    def evaluate(self, t, x):
+        """
+        Evaluate the state rates of every trajectory at time t.
+
+        Parameters
+        ----------
+        t : float
+            The current time, t.
+        x : np.array
+            The states of the trajectories, with shape (num_nodes, num_states).
+
+        Returns
+        -------
+        xdot : np.array
+            The state rates of the trajectories, with shape (num_nodes, num_states).
+        """
+        return np.reshape(self(t, np.ravel(x)), (self.num_nodes, self.num_states))
+
     def __call__(self, t, x):
         """
         The function interface used by scipy.ode
@@ -270,7 +399,8 @@ class ODEIntegrationInterface(object):
         t : float
             The current time, t.
         x : np.array
-            The 1D state vector.
+            The 1D state vector.  If num_nodes > 1, the states of the trajectories stacked as
+            (num_nodes, num_states) and flattened.
 
         Returns
         -------
@@ -278,9 +408,101 @@ class ODEIntegrationInterface(object):
             The 1D vector of state time-derivatives.
 
         """
+        self._last_eval = (t, np.array(x, copy=True))
+
+        if self._compiled:
+            return self._fast_call(t, x)
+
         self.prob['time'] = t
         self.prob['time_phase'] = t - self.prob['t_initial']
         self._unpack_state_vec(x)
         self.prob.run_model()
         xdot = self._pack_state_rate_vec()
-        return xdot
+        # solve_ivp keeps a reference to the returned rates, return a copy so that the next
+        # evaluation does not overwrite them.
+        return xdot.copy()
+
+    def get_event_function(self, options):
+        """
+        Return the event function of a simulation event in the form used by solve_ivp.
+
+        The function returns the value of the event variable minus the value at which the event
+        occurs.  If the variable is an output of the ODE and the ODE was last evaluated at the
+        given time and states, which is the case at the end of every step of the Runge-Kutta
+        methods, the ODE is not evaluated again.
+
+        Parameters
+        ----------
+        options : SimulationEventOptionsDictionary
+            The options of the event.
+
+        Returns
+        -------
+        callable
+            The function g(t, x), with the attributes terminal and direction set.
+        """
+        var = options['var']
+        idx = options['index']
+        equals = options['equals']
+        units = options['units']
+
+        if var in self.state_options:
+            pos = self.state_options[var]['pos'] + idx
+            if units is None:
+                scale, offset = 1.0, 0.0
+            else:
+                scale, offset = unit_conversion(self.state_options[var]['units'], units)
+
+            def event(t, x):
+                return (x[pos] + offset) * scale - equals
+        else:
+            path = 'ode.{0}'.format(var)
+
+            def event(t, x):
+                last = self._last_eval
+                if last is None or last[0] != t or not np.array_equal(last[1], x):
+                    self(t, x)
+                return np.ravel(self.prob.get_val(path, units=units))[idx] - equals
+
+        event.terminal = options['terminal']
+        event.direction = options['direction']
+
+        return event
+
+    def _fast_call(self, t, x):
+        """
+        Evaluate the state rates by writing directly into the output vector of the model.
+
+        Parameters
+        ----------
+        t : float
+            The current time, t.
+        x : np.array
+            The 1D state vector.
+
+        Returns
+        -------
+        xdot : np.array
+            The 1D vector of state time-derivatives.
+        """
+        views = self._views
+        x = np.reshape(x, (self.num_nodes, self.num_states))
+        xdot = np.empty_like(x)
+
+        views['time'][...] = t
+        views['time_phase'][...] = t - views['t_initial']
+
+        for name, options in self.state_options.items():
+            pos = options['pos']
+            size = options['size']
+            views['states:{0}'.format(name)][...] = x[:, pos:pos + size]
+
+        self.prob.model.run_solve_nonlinear()
+
+        for name, options in self.state_options.items():
+            pos = options['pos']
+            size = options['size']
+            xdot[:, pos:pos + size] = \
+                np.reshape(views['state_rates:{0}'.format(name)], (self.num_nodes, size))
+
+        return np.ravel(xdot)
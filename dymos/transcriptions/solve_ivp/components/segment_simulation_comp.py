@@ -20,6 +20,14 @@ class SegmentSimulationComp(om.ExplicitComponent):
 
     The resulting states are captured at all nodes within the segment.
     """
+    def __init__(self, **kwargs):
+        super(SegmentSimulationComp, self).__init__(**kwargs)
+
+        # Input and output vectors of a simulation of the segment carried out elsewhere, such as
+        # in a worker of Trajectory.simulate.  If the inputs match, the outputs are used instead
+        # of integrating the segment.
+        self._precomputed = None
+
     def initialize(self):
         self.options.declare('index', desc='the index of this segment in the parent phase.')
 
@@ -73,6 +81,14 @@ class SegmentSimulationComp(om.ExplicitComponent):
                                   'segment.  If an int (n) then results are provided at n '
                                   'equally distributed points in time within each segment.')
 
+        self.options.declare('fast_mode', default=True, types=bool,
+                             desc='If True, the ODE integration interface is compiled so that '
+                                  'solve_ivp evaluates the ODE without calling run_model.')
+
+        self.options.declare('simulation_event_options', default=None, types=dict, allow_none=True,
+                             desc='Dictionary of simulation event names/options for the segments '
+                                  'parent Phase.')
+
         self.recording_options['options_excludes'] = ['ode_integration_interface']
 
     def setup(self):
@@ -170,11 +186,38 @@ class SegmentSimulationComp(om.ExplicitComponent):
                                units=options['units'],
                                desc='values of input parameter {0}'.format(name))
 
+        if self.options['simulation_event_options']:
+            self.add_input(name='initial_terminated', val=0.0,
+                           desc='1.0 if a terminal event occurred in a previous segment.')
+
+            self.add_output(name='terminated', val=0.0,
+                            desc='1.0 if a terminal event occurred in this or a previous segment.')
+
+            for name, options in self.options['simulation_event_options'].items():
+                self.add_output(name='events:{0}:time'.format(name), val=np.nan,
+                                units=self.options['time_options']['units'],
+                                desc='Time of the first occurrence of event {0} in the '
+                                     'segment.'.format(name))
+
+                self.add_output(name='events:{0}:num_occurrences'.format(name), val=0.0,
+                                desc='Number of occurrences of event {0} in the segment.'.format(name))
+
+                for state_name, state_options in self.options['state_options'].items():
+                    self.add_output(name='events:{0}:states:{1}'.format(name, state_name),
+                                    val=np.zeros((1,) + state_options['shape']),
+                                    units=state_options['units'],
+                                    desc='Values of state {0} at the first occurrence of event {1} '
+                                         'in the segment.'.format(state_name, name))
+
         self.options['ode_integration_interface'].prob.setup(check=False)
 
         self.declare_partials(of='*', wrt='*', method='fd')
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        if self._precomputed is not None and np.array_equal(self._precomputed[0], inputs._data):
+            outputs._data[:] = self._precomputed[1]
+            return
+
         idx = self.options['index']
         gd = self.options['grid_data']
         iface_prob = self.options['ode_integration_interface'].prob
@@ -246,18 +289,79 @@ class SegmentSimulationComp(om.ExplicitComponent):
             t_eval = np.linspace(inputs['time'][0], inputs['time'][-1],
                                  self.options['output_nodes_per_seg'])
 
+        if self.options['fast_mode']:
+            self.options['ode_integration_interface'].compile()
+
+        event_options = self.options['simulation_event_options']
+        iface = self.options['ode_integration_interface']
+
+        if event_options and inputs['initial_terminated'] > 0.5:
+            # A terminal event occurred in a previous segment, the states hold their initial values
+            outputs['terminated'] = 1.0
+            for name in event_options:
+                outputs['events:{0}:time'.format(name)] = np.nan
+                outputs['events:{0}:num_occurrences'.format(name)] = 0.0
+            y = np.repeat(self.initial_state_vec[:, np.newaxis], len(t_eval), axis=1)
+            self._extract_states(y, outputs)
+            return
+
+        events = [iface.get_event_function(options) for options in event_options.values()] \
+            if event_options else None
+
         # Perform the integration using solve_ivp
-        sol = solve_ivp(fun=self.options['ode_integration_interface'],
+        sol = solve_ivp(fun=iface,
                         t_span=(inputs['time'][0], inputs['time'][-1]),
                         y0=self.initial_state_vec,
                         method=self.options['method'],
                         atol=self.options['atol'],
                         rtol=self.options['rtol'],
-                        t_eval=t_eval)
-
-        # Extract the solution
+                        t_eval=t_eval,
+                        events=events)
+
+        y = sol.y
+
+        if event_options:
+            for i, name in enumerate(event_options):
+                num_occurrences = len(sol.t_events[i])
+                outputs['events:{0}:num_occurrences'.format(name)] = num_occurrences
+                if num_occurrences > 0:
+                    outputs['events:{0}:time'.format(name)] = sol.t_events[i][0]
+                    self._extract_states(sol.y_events[i][:1, :].T, outputs,
+                                         fmt='events:{0}:states:{{0}}'.format(name))
+                else:
+                    outputs['events:{0}:time'.format(name)] = np.nan
+
+            # If a terminal event stopped the integration the states hold their values at the
+            # event for the remaining output times
+            outputs['terminated'] = 1.0 if sol.status == 1 else 0.0
+            if sol.status == 1:
+                # the integration stops at the last occurrence of the latest terminal event
+                _, y_terminal = max(((sol.t_events[i][-1], sol.y_events[i][-1])
+                                     for i, options in enumerate(event_options.values())
+                                     if options['terminal'] and len(sol.t_events[i]) > 0),
+                                    key=lambda event: event[0])
+                y = np.empty((self.state_vec_size, len(t_eval)))
+                y[:, :sol.y.shape[1]] = sol.y
+                y[:, sol.y.shape[1]:] = y_terminal[:, np.newaxis]
+
+        self._extract_states(y, outputs)
+
+    def _extract_states(self, y, outputs, fmt='states:{0}'):
+        """
+        Extract the values of the states from the 2D array of stacked state vectors.
+
+        Parameters
+        ----------
+        y : np.array
+            The state vectors, with shape (state_vec_size, num_times).
+        outputs : Vector
+            The outputs of the component.
+        fmt : str
+            The format of the output names, given the name of the state.
+        """
         pos = 0
         for name, options in self.options['state_options'].items():
             size = np.prod(options['shape'])
-            outputs['states:{0}'.format(name)] = sol.y[pos:pos+size, :].T
+            outputs[fmt.format(name)] = np.reshape(y[pos:pos + size, :].T,
+                                                   (y.shape[1],) + options['shape'])
             pos += size
@@ -0,0 +1,73 @@
+import numpy as np
+
+import openmdao.api as om
+
+
+class SimulationEventsComp(om.ExplicitComponent):
+    """
+    SimulationEventsComp gathers the events detected by solve_ivp in the segments of a simulated
+    phase.
+
+    The outputs provide the time and the states of the first occurrence of each event in the
+    phase and the number of occurrences of the event in the phase.  If the event does not occur
+    its time is nan.
+    """
+    def initialize(self):
+        self.options.declare('num_segments', types=int,
+                             desc='the number of segments in the phase.')
+
+        self.options.declare('state_options', types=dict,
+                             desc='Dictionary of state names/options for the phase.')
+
+        self.options.declare('simulation_event_options', types=dict,
+                             desc='Dictionary of simulation event names/options for the phase.')
+
+        self.options.declare('time_units', default=None, allow_none=True, types=str,
+                             desc='Units of time.')
+
+    def setup(self):
+        num_seg = self.options['num_segments']
+        time_units = self.options['time_units']
+
+        for name in self.options['simulation_event_options']:
+            for i in range(num_seg):
+                self.add_input(name='segment_{0}:{1}:time'.format(i, name), val=np.nan,
+                               units=time_units)
+                self.add_input(name='segment_{0}:{1}:num_occurrences'.format(i, name), val=0.0)
+
+            self.add_output(name='{0}:time'.format(name), val=np.nan, units=time_units,
+                            desc='Time of the first occurrence of event {0}.'.format(name))
+            self.add_output(name='{0}:num_occurrences'.format(name), val=0.0,
+                            desc='Number of occurrences of event {0}.'.format(name))
+
+            for state_name, options in self.options['state_options'].items():
+                for i in range(num_seg):
+                    self.add_input(name='segment_{0}:{1}:states:{2}'.format(i, name, state_name),
+                                   val=np.zeros((1,) + options['shape']), units=options['units'])
+
+                self.add_output(name='{0}:states:{1}'.format(name, state_name),
+                                val=np.zeros((1,) + options['shape']), units=options['units'],
+                                desc='Values of state {0} at the first occurrence of event '
+                                     '{1}.'.format(state_name, name))
+
+    def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        num_seg = self.options['num_segments']
+
+        for name in self.options['simulation_event_options']:
+            num_occurrences = [inputs['segment_{0}:{1}:num_occurrences'.format(i, name)]
+                               for i in range(num_seg)]
+            outputs['{0}:num_occurrences'.format(name)] = np.sum(num_occurrences)
+
+            first = [i for i in range(num_seg) if num_occurrences[i] > 0]
+
+            if first:
+                outputs['{0}:time'.format(name)] = inputs['segment_{0}:{1}:time'.format(first[0], name)]
+            else:
+                outputs['{0}:time'.format(name)] = np.nan
+
+            for state_name in self.options['state_options']:
+                if first:
+                    outputs['{0}:states:{1}'.format(name, state_name)] = \
+                        inputs['segment_{0}:{1}:states:{2}'.format(first[0], name, state_name)]
+                else:
+                    outputs['{0}:states:{1}'.format(name, state_name)] = np.nan
@@ -16,6 +16,9 @@ class StateRateCollectorComp(om.ExplicitComponent):
         self.options.declare(
             'time_units', default=None, allow_none=True, types=str,
             desc='Units of time')
+        self.options.declare(
+            'num_nodes', default=None, allow_none=True, types=int,
+            desc='Number of nodes of the ODE.  If None, the rates have the shape of the states.')
 
         # Save the names of the dynamic controls/parameters
         self._input_names = {}
@@ -31,6 +34,9 @@ class StateRateCollectorComp(om.ExplicitComponent):
             shape = options['shape']
             units = options['units']
 
+            if self.options['num_nodes'] is not None:
+                shape = (self.options['num_nodes'],) + shape
+
             rate_units = get_rate_units(units, time_units)
 
             self.add_input(self._input_names[name], val=np.ones(shape), units=rate_units)
@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from openmdao.utils.assert_utils import assert_near_equal
+
+from dymos.transcriptions.solve_ivp.components.ode_integration_interface import ODEIntegrationInterface
+from dymos.transcriptions.runge_kutta.test.rk_test_ode import TestODE
+from dymos.phase.options import TimeOptionsDictionary, StateOptionsDictionary
+
+
+def _make_interface(num_nodes):
+    time_options = TimeOptionsDictionary()
+    time_options['units'] = 's'
+    time_options['targets'] = 't'
+
+    state_options = {}
+    state_options['y'] = StateOptionsDictionary()
+    state_options['y']['units'] = 'm'
+    state_options['y']['targets'] = 'y'
+    state_options['y']['rate_source'] = 'ydot'
+
+    iface = ODEIntegrationInterface(ode_class=TestODE, time_options=time_options,
+                                    state_options=state_options, control_options={},
+                                    polynomial_control_options={}, design_parameter_options={},
+                                    input_parameter_options={}, ode_init_kwargs={},
+                                    num_nodes=num_nodes)
+    iface.prob.setup(check=False)
+    iface.prob.final_setup()
+
+    return iface
+
+
+class TestODEIntegrationInterface(unittest.TestCase):
+
+    def test_fast_mode(self):
+        iface = _make_interface(num_nodes=1)
+
+        xdot = iface(0.5, np.array([1.2]))
+
+        iface.compile()
+        xdot_fast = iface(0.5, np.array([1.2]))
+
+        assert_near_equal(xdot_fast, xdot, tolerance=1.0E-15)
+        assert_near_equal(xdot_fast, [1.2 - 0.25 + 1], tolerance=1.0E-15)
+
+    def test_batched_integration(self):
+        y0 = np.array([[0.5], [0.0], [1.0], [2.0]])
+        iface = _make_interface(num_nodes=y0.shape[0]).compile()
+
+        assert_near_equal(iface.evaluate(0.5, y0), y0 - 0.25 + 1, tolerance=1.0E-15)
+
+        sol = solve_ivp(fun=iface, t_span=(0.0, 2.0), y0=np.ravel(y0), method='RK45',
+                        atol=1.0E-10, rtol=1.0E-10)
+
+        # y = t**2 + 2*t + 1 - (1 - y0) * exp(t)
+        t = sol.t[-1]
+        expected = t**2 + 2*t + 1 - (1 - y0[:, 0]) * np.exp(t)
+
+        assert_near_equal(sol.y[:, -1], expected, tolerance=1.0E-8)
+
+    def test_batched_call_not_compiled(self):
+        y0 = np.array([[0.5], [0.0], [1.0], [2.0]])
+        iface = _make_interface(num_nodes=y0.shape[0])
+
+        xdot = iface(0.5, np.ravel(y0))
+        assert_near_equal(xdot, np.ravel(y0 - 0.25 + 1), tolerance=1.0E-15)
+        assert_near_equal(iface.evaluate(0.5, 2 * y0), 2 * y0 - 0.25 + 1, tolerance=1.0E-15)
+
+        # the slow and the fast mode give the same rates for every trajectory
+        iface.compile()
+        assert_near_equal(iface(0.5, np.ravel(y0)), xdot, tolerance=1.0E-15)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -1,14 +1,23 @@
 import unittest
 
+import numpy as np
+from scipy.optimize import brentq
+
 import openmdao.api as om
 from openmdao.utils.assert_utils import assert_near_equal
 
 from dymos.transcriptions.solve_ivp.components.segment_simulation_comp import SegmentSimulationComp
 from dymos.transcriptions.runge_kutta.test.rk_test_ode import TestODE
-from dymos.phase.options import TimeOptionsDictionary, StateOptionsDictionary
+from dymos.phase.options import TimeOptionsDictionary, StateOptionsDictionary, \
+    SimulationEventOptionsDictionary
 from dymos.transcriptions.grid_data import GridData
 
 
+def _solution(t):
+    # solution of the test ODE with y(0) = 0.5
+    return t**2 + 2*t + 1 - 0.5 * np.exp(t)
+
+
 class TestSegmentSimulationComp(unittest.TestCase):
 
     def test_simple_integration(self):
@@ -44,3 +53,75 @@ class TestSegmentSimulationComp(unittest.TestCase):
         assert_near_equal(p.get_val('segment_0.states:y', units='m')[-1, ...],
                           1.425639364649936,
                           tolerance=1.0E-6)
+
+    def _run_events(self, terminal):
+        p = om.Problem(model=om.Group())
+
+        time_options = TimeOptionsDictionary()
+        time_options['units'] = 's'
+        time_options['targets'] = 't'
+
+        state_options = {}
+        state_options['y'] = StateOptionsDictionary()
+        state_options['y']['units'] = 'm'
+        state_options['y']['targets'] = 'y'
+        state_options['y']['rate_source'] = 'ydot'
+
+        event_options = {}
+        event_options['y_limit'] = SimulationEventOptionsDictionary()
+        event_options['y_limit']['var'] = 'y'
+        event_options['y_limit']['equals'] = 100.0
+        event_options['y_limit']['units'] = 'cm'
+        event_options['y_limit']['terminal'] = terminal
+
+        event_options['ydot_limit'] = SimulationEventOptionsDictionary()
+        event_options['ydot_limit']['var'] = 'ydot'
+        event_options['ydot_limit']['equals'] = 1.5
+        event_options['ydot_limit']['direction'] = 1
+
+        gd = GridData(num_segments=4, transcription='gauss-lobatto', transcription_order=3)
+
+        seg0_comp = SegmentSimulationComp(index=0, grid_data=gd, method='RK45',
+                                          atol=1.0E-9, rtol=1.0E-9,
+                                          ode_class=TestODE, time_options=time_options,
+                                          state_options=state_options,
+                                          simulation_event_options=event_options)
+
+        p.model.add_subsystem('segment_0', subsys=seg0_comp)
+
+        p.setup()
+
+        p.set_val('segment_0.time', [0, 0.25, 0.5])
+        p.set_val('segment_0.initial_states:y', 0.5)
+
+        p.run_model()
+
+        return p
+
+    def test_events(self):
+        p = self._run_events(terminal=False)
+
+        t_y = brentq(lambda t: _solution(t) - 1.0, 0.0, 0.5)
+        t_ydot = brentq(lambda t: _solution(t) - t**2 + 1 - 1.5, 0.0, 0.5)
+
+        assert_near_equal(p.get_val('segment_0.events:y_limit:time'), t_y, tolerance=1.0E-8)
+        assert_near_equal(p.get_val('segment_0.events:y_limit:states:y'), [[1.0]], tolerance=1.0E-8)
+        assert_near_equal(p.get_val('segment_0.events:ydot_limit:time'), t_ydot, tolerance=1.0E-8)
+        assert_near_equal(p.get_val('segment_0.events:ydot_limit:num_occurrences'), 1.0)
+
+        # non-terminal events do not change the solution
+        assert_near_equal(p.get_val('segment_0.terminated'), 0.0)
+        assert_near_equal(p.get_val('segment_0.states:y')[-1, ...], 1.425639364649936, tolerance=1.0E-6)
+
+    def test_terminal_event(self):
+        p = self._run_events(terminal=True)
+
+        assert_near_equal(p.get_val('segment_0.terminated'), 1.0)
+
+        # the integration stops at y = 1 m, the states at the remaining nodes hold that value
+        t = p.get_val('segment_0.time')
+        y = p.get_val('segment_0.states:y')
+        t_y = p.get_val('segment_0.events:y_limit:time')
+
+        assert_near_equal(y[t < t_y, 0], _solution(t[t < t_y]), tolerance=1.0E-8)
+        assert_near_equal(y[t > t_y, 0], np.ones(np.count_nonzero(t > t_y)), tolerance=1.0E-8)
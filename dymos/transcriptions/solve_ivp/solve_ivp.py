@@ -3,7 +3,8 @@ import numpy as np
 import openmdao.api as om
 from ..transcription_base import TranscriptionBase
 from .components import SegmentSimulationComp, SegmentStateMuxComp, \
-    SolveIVPControlGroup, SolveIVPPolynomialControlGroup, SolveIVPTimeseriesOutputComp
+    SolveIVPControlGroup, SolveIVPPolynomialControlGroup, SolveIVPTimeseriesOutputComp, \
+    SimulationEventsComp
 from ..common import TimeComp
 from ...utils.misc import get_rate_units
 from ...utils.indexing import get_src_indices_by_row
@@ -41,6 +42,10 @@ class SolveIVP(TranscriptionBase):
                                   'segment.  If an int (n) then results are provided at n '
                                   'equally distributed points in time within each segment.')
 
+        self.options.declare('fast_mode', default=True, types=bool,
+                             desc='If True, the ODE integration interface of each segment is compiled '
+                                  'so that solve_ivp evaluates the ODE without calling run_model.')
+
     def init_grid(self):
         pass
 
@@ -174,10 +179,17 @@ class SolveIVP(TranscriptionBase):
                 polynomial_control_options=phase.polynomial_control_options,
                 design_parameter_options=phase.design_parameter_options,
                 input_parameter_options=phase.input_parameter_options,
-                output_nodes_per_seg=self.options['output_nodes_per_seg'])
+                output_nodes_per_seg=self.options['output_nodes_per_seg'],
+                fast_mode=self.options['fast_mode'],
+                simulation_event_options=phase.simulation_event_options)
 
             segments_group.add_subsystem('segment_{0}'.format(i), subsys=seg_i_comp)
 
+            # A terminal event stops the simulation of the remaining segments
+            if phase.simulation_event_options and i > 0:
+                phase.connect('segment_{0}.terminated'.format(i - 1),
+                              'segment_{0}.initial_terminated'.format(i))
+
         # scipy.integrate.solve_ivp does not actually evaluate the ODE at the desired output points,
         # but just returns the time and interpolated integrated state values there instead. We need
         # to instantiate a second ODE group that will call the ODE at those points so that we can
@@ -194,6 +206,23 @@ class SolveIVP(TranscriptionBase):
         phase.add_subsystem('ode', phase.options['ode_class'](num_nodes=num_output_nodes,
                                                               **phase.options['ode_init_kwargs']))
 
+        if phase.simulation_event_options:
+            phase.add_subsystem('events',
+                                SimulationEventsComp(num_segments=num_seg,
+                                                     state_options=phase.state_options,
+                                                     simulation_event_options=phase.simulation_event_options,
+                                                     time_units=phase.time_options['units']))
+
+            for name in phase.simulation_event_options:
+                for i in range(num_seg):
+                    phase.connect('segment_{0}.events:{1}:time'.format(i, name),
+                                  'events.segment_{0}:{1}:time'.format(i, name))
+                    phase.connect('segment_{0}.events:{1}:num_occurrences'.format(i, name),
+                                  'events.segment_{0}:{1}:num_occurrences'.format(i, name))
+                    for state_name in phase.state_options:
+                        phase.connect('segment_{0}.events:{1}:states:{2}'.format(i, name, state_name),
+                                      'events.segment_{0}:{1}:states:{2}'.format(i, name, state_name))
+
     def setup_controls(self, phase):
         grid_data = self.grid_data
         output_nodes_per_seg = self.options['output_nodes_per_seg']
@@ -0,0 +1,164 @@
+import atexit
+import json
+import queue
+import sqlite3
+import threading
+
+import numpy as np
+
+import openmdao.api as om
+from openmdao.utils.general_utils import make_serializable
+
+
+def _flush_first(method):
+    """
+    Wrap a method of SqliteRecorder so that the queued driver iterations are written first.
+
+    Parameters
+    ----------
+    method : callable
+        The method of SqliteRecorder that uses the database connection.
+
+    Returns
+    -------
+    callable
+        The wrapped method.
+    """
+    def wrapped(self, *args, **kwargs):
+        self.flush()
+        return method(self, *args, **kwargs)
+
+    wrapped.__name__ = method.__name__
+    wrapped.__doc__ = method.__doc__
+
+    return wrapped
+
+
+class BatchedSqliteRecorder(om.SqliteRecorder):
+    """
+    A SqliteRecorder which writes the driver iterations from a background thread.
+
+    The driver only copies the recorded values into a queue.  A writer thread serializes them
+    and inserts all the queued iterations in a single transaction, so that the driver loop does
+    not wait for the database.  The other records, which are infrequent, are written by the
+    calling thread once the queue has been written.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the recorder file.
+    batch_size : int
+        The maximum number of driver iterations written in a single transaction.
+    **kwargs : dict
+        Keyword arguments passed to SqliteRecorder.
+    """
+    def __init__(self, filepath, batch_size=50, **kwargs):
+        super(BatchedSqliteRecorder, self).__init__(filepath, **kwargs)
+        self._batch_size = batch_size
+        self._queue = queue.Queue()
+        self._writer = None
+
+    def _initialize_database(self):
+        """
+        Initialize the database with a connection that may be used by the writer thread.
+        """
+        super(BatchedSqliteRecorder, self)._initialize_database()
+
+        if self.connection:
+            # the writer thread and the calling thread never use the connection concurrently
+            self.connection.close()
+            self.connection = sqlite3.connect(self._filepath, check_same_thread=False)
+
+            self._writer = threading.Thread(target=self._write_batches, daemon=True)
+            self._writer.start()
+            atexit.register(self.flush)
+
+    def record_iteration_driver(self, recording_requester, data, metadata):
+        """
+        Queue the data and metadata from a Driver.
+
+        Parameters
+        ----------
+        recording_requester : object
+            Driver in need of recording.
+        data : dict
+            Dictionary containing desvars, objectives, constraints, responses, and System vars.
+        metadata : dict
+            Dictionary containing execution metadata.
+        """
+        if self.connection:
+            data = {kind: None if values is None else
+                    {name: np.array(val, copy=True) for name, val in values.items()}
+                    for kind, values in data.items()}
+
+            self._queue.put((self._counter, self._iteration_coordinate, metadata['timestamp'],
+                             metadata['success'], metadata['msg'], recording_requester._get_name(),
+                             data))
+
+    def _write_batches(self):
+        """
+        Write the queued driver iterations until the recorder is shut down.
+        """
+        while True:
+            batch = [self._queue.get()]
+            while batch[-1] is not None and len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            rows = [row for row in batch if row is not None]
+
+            if rows:
+                with self.connection as c:
+                    c = c.cursor()  # need a real cursor for lastrowid
+
+                    for counter, coord, timestamp, success, msg, source, data in rows:
+                        text = {}
+                        for kind in ('input', 'output', 'residual'):
+                            values = data.get(kind)
+                            if values is not None:
+                                values = {name: make_serializable(val) for name, val in values.items()}
+                            text[kind] = json.dumps(values)
+
+                        c.execute("INSERT INTO driver_iterations(counter, iteration_coordinate, "
+                                  "timestamp, success, msg, inputs, outputs, residuals) "
+                                  "VALUES(?,?,?,?,?,?,?,?)",
+                                  (counter, coord, timestamp, success, msg,
+                                   text['input'], text['output'], text['residual']))
+
+                        c.execute("INSERT INTO global_iterations(record_type, rowid, source) "
+                                  "VALUES(?,?,?)", ('driver', c.lastrowid, source))
+
+            for _ in batch:
+                self._queue.task_done()
+
+            if batch[-1] is None:
+                return
+
+    def flush(self):
+        """
+        Wait until the queued driver iterations are written to the database.
+        """
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.join()
+
+    def shutdown(self):
+        """
+        Write the queued driver iterations, stop the writer thread and shut down the recorder.
+        """
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self._writer = None
+
+        super(BatchedSqliteRecorder, self).shutdown()
+
+    startup = _flush_first(om.SqliteRecorder.startup)
+    record_iteration_problem = _flush_first(om.SqliteRecorder.record_iteration_problem)
+    record_iteration_system = _flush_first(om.SqliteRecorder.record_iteration_system)
+    record_iteration_solver = _flush_first(om.SqliteRecorder.record_iteration_solver)
+    record_derivatives_driver = _flush_first(om.SqliteRecorder.record_derivatives_driver)
+    record_metadata_system = _flush_first(om.SqliteRecorder.record_metadata_system)
+    record_metadata_solver = _flush_first(om.SqliteRecorder.record_metadata_solver)
+    record_viewer_data = _flush_first(om.SqliteRecorder.record_viewer_data)
@@ -65,6 +65,10 @@ def dymos_cmd(argv=None):
     parser.add_argument('-l', '--refine_limit', default=0,
                         help='The number of passes through the grid refinement algorithm'
                              ' to use. (default: 0)')
+    parser.add_argument('-p', '--recording', default='full', choices=['minimal', 'restart', 'full'],
+                        help='The variables recorded in dymos_solution.db at each iteration: the design'
+                             ' variables, objectives and constraints (minimal), the variables needed'
+                             ' to restart the problem (restart) or all of them (full). (default: full)')
     args = parser.parse_args(argv)  # sys.argv is used if argv parameter is None
 
     if args.solution == 'dymos_solution.db':  # make sure the loaded db is not being overwritten by the new db
@@ -78,7 +82,8 @@ def dymos_cmd(argv=None):
         'simulate': args.simulate,
         'no_solve': args.no_solve,
         'no_iterate': args.no_iterate,
-        'reset_grid': args.reset_grid
+        'reset_grid': args.reset_grid,
+        'recording': args.recording
     }
 
     class DymosHooks:
@@ -101,7 +106,7 @@ def dymos_cmd(argv=None):
                 return
             self._pre_hooks_enabled = False
 
-            modify_problem(prob, restart=opts['restart'])
+            modify_problem(prob, restart=opts['restart'], recording=opts['recording'])
             self._post_hooks_enabled = True
 
         def _post_final_setup(self, prob):
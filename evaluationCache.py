@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 16:48:03 2026
+
+Memoization of the evaluations of the model requested by the optimizer.
+
+SLSQP evaluates the objective, the constraints and the total jacobian at design vectors that were
+often already evaluated (line searches, restarts from a saved guess). CachedScipyOptimizeDriver
+stores the objective, the constraints and the total jacobian of every evaluation in an
+EvaluationCache, keyed by a hash of the scaled design vector given by the optimizer. Repeated
+evaluations are served from the cache without running the model.
+
+The cache keeps the most recently used evaluations and evicts the least recently used ones when
+its memory exceeds the option cache_max_memory (MB). The hits and misses are printed at the end of
+the optimization if disp == True. The key does not include the inputs of the model that are not
+design variables (i.e. the mission parameters changed between runs by missionSweep), so the cache is
+cleared every time the driver is run and every time the problem is setup.
+
+The model is only run for the evaluations that are not in the cache, so its outputs may correspond
+to another design vector than the last one requested. The model is run again before computing a
+jacobian that is not in the cache and at the end of the optimization. The evaluations served from
+the cache are not recorded.
+
+@author: jorge
+"""
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+from openmdao.api import ScipyOptimizeDriver
+
+
+class EvaluationCache():
+    # LRU cache of the evaluations of the model, limited by the memory of the stored arrays
+
+    def __init__(self, max_memory):
+        self.max_memory = max_memory    # (bytes)
+        self.clear()
+
+    def clear(self):
+        "This function removes all the evaluations and resets the statistics"
+
+        self._entries = OrderedDict()
+        self.memory   = 0
+        self.hits     = {'objective': 0, 'jacobian': 0}
+        self.misses   = {'objective': 0, 'jacobian': 0}
+        self.evictions = 0
+
+    @staticmethod
+    def key(x):
+        "This function returns the hash of the design vector x"
+
+        return hashlib.sha1(np.ascontiguousarray(x, dtype=float).tobytes()).hexdigest()
+
+    def get(self, key, kind):
+        "This function returns the stored value of kind ('objective' or 'jacobian') of the evaluation key, or None"
+
+        entry = self._entries.get(key)
+
+        if entry is None or kind not in entry:
+            self.misses[kind] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits[kind] += 1
+
+        return entry[kind]
+
+    def put(self, key, kind, value, nbytes):
+        "This function stores the value of kind of the evaluation key. nbytes is the memory used by the value"
+
+        entry = self._entries.setdefault(key, {'nbytes': 0})
+        self._entries.move_to_end(key)
+
+        entry[kind] = value
+        entry['nbytes'] += nbytes
+        self.memory += nbytes
+
+        # evict the least recently used evaluations. The last one is kept even if it is over the limit
+        while self.memory > self.max_memory and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.memory -= evicted['nbytes']
+            self.evictions += 1
+
+    def stats(self):
+        "This function returns the statistics of the cache"
+
+        return {'hits': dict(self.hits), 'misses': dict(self.misses), 'evictions': self.evictions,
+                'entries': len(self._entries), 'memory': self.memory}
+
+    def report(self):
+        "This function returns the statistics of the cache as a string"
+
+        lines = ['Evaluation cache: %d entries, %.1f MB, %d evictions' % (len(self._entries), self.memory / 1e6,
+                                                                          self.evictions)]
+        for kind in ['objective', 'jacobian']:
+            lines.append('    %-10s hits: %d  misses: %d' % (kind, self.hits[kind], self.misses[kind]))
+
+        return '\n'.join(lines)
+
+
+class CachedScipyOptimizeDriver(ScipyOptimizeDriver):
+    # ScipyOptimizeDriver that serves the repeated evaluations of the optimizer from an EvaluationCache
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.eval_cache = EvaluationCache(self.options['cache_max_memory'] * 1e6)
+        self._model_key = None
+        self._last_x    = None
+
+    def _declare_options(self):
+        super()._declare_options()
+
+        self.options.declare('cache_max_memory', types=(int, float), default=256, lower=0,
+                             desc='Maximum memory (MB) of the evaluations stored in the cache.')
+
+    def _setup_driver(self, problem):
+        super()._setup_driver(problem)
+
+        # the design vector and the outputs of a previous setup may be different
+        self.eval_cache.max_memory = self.options['cache_max_memory'] * 1e6
+        self.eval_cache.clear()
+        self._model_key = None
+
+    def run(self):
+        # the inputs of the model that are not design variables may have changed since the last run
+        self.eval_cache.clear()
+        self._model_key = None
+        self._last_x    = None
+
+        fail = super().run()
+
+        # leave the model at the last design vector requested by the optimizer
+        if self._last_x is not None and self._model_key != self.eval_cache.key(self._last_x):
+            super()._objfunc(self._last_x)
+            self._model_key = self.eval_cache.key(self._last_x)
+
+        if self.options['disp']:
+            print(self.eval_cache.report())
+
+        return fail
+
+    def _objfunc(self, x_new):
+        key = self.eval_cache.key(x_new)
+        self._last_x = np.array(x_new, dtype=float)
+
+        cached = self.eval_cache.get(key, 'objective')
+        if cached is not None:
+            f_new, con_cache = cached
+            self._con_cache = {name: value.copy() for name, value in con_cache.items()}
+            return f_new
+
+        f_new = super()._objfunc(x_new)
+        self._model_key = key
+
+        # the evaluations that failed are not stored
+        if getattr(self, '_exc_info', None) is None and np.all(np.isfinite(f_new)):
+            con_cache = {name: np.array(value, copy=True) for name, value in self._con_cache.items()}
+            nbytes = np.asarray(f_new).nbytes + sum(value.nbytes for value in con_cache.values())
+            self.eval_cache.put(key, 'objective', (f_new, con_cache), nbytes)
+
+        return f_new
+
+    def _gradfunc(self, x_new):
+        key = self.eval_cache.key(x_new)
+
+        grad = self.eval_cache.get(key, 'jacobian')
+        if grad is not None:
+            self._grad_cache = grad
+            return grad[0, :]
+
+        # the model must be at x_new to compute its total derivatives
+        if self._model_key != key:
+            super()._objfunc(x_new)
+            self._model_key = key
+
+        obj_grad = super()._gradfunc(x_new)
+
+        if getattr(self, '_exc_info', None) is None:
+            self.eval_cache.put(key, 'jacobian', np.array(self._grad_cache, copy=True), self._grad_cache.nbytes)
+
+        return obj_grad
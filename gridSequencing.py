@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:14:05 2026
+
+Grid-sequenced solution of the trajectory optimization.
+
+The problem is first solved with very few segments per phase. The solution is interpolated onto
+a finer grid, which becomes the initial guess of the next solve, until the grid defined in
+defineTrajectoryPhases is reached. Most of the SLSQP iterations are then done on a much smaller
+NLP, and the fine grid is started close to the optimum.
+
+After each solve the ph-adaptive error estimate of dymos is evaluated. The sequence stops as soon
+as every phase meets the tolerance of its refine options (phase.set_refine_options), even if the
+finest grid has not been reached.
+
+The solution is transferred with dymos.load_case: the states, controls and times of the phases are
+interpolated in time onto the nodes of the new grid. The other outputs of the model (design
+parameters, external parameters, phase durations handled as design parameters, ...) are copied
+when their shape does not depend on the grid.
+
+The connections with negative src_indices (the last node of a timeseries) are converted in place by
+openmdao the first time the model is run, so solveGridSequence must be called before running the
+problem.
+
+@author: jorge
+"""
+
+import copy
+
+import numpy as np
+import openmdao.api as om
+
+import dymos as dm
+from dymos.run_problem import find_phases
+from dymos.grid_refinement.ph_adaptive.ph_adaptive import PHAdaptive
+
+from coloringCache import useColoringCache
+from solverPlanning import planLinearSolvers
+
+
+# number of segments per phase of each level of the grid sequence. A phase never has more segments
+# than defined in defineTrajectoryPhases, and the last level is always the grid defined there.
+default_levels = (2, 4)
+
+# ========================================================================================================
+# grids
+# ========================================================================================================
+
+def getPhaseGrids(p):
+    "This function returns the number of segments of every phase of the problem"
+
+    return {path: phase.options['transcription'].options['num_segments']
+            for path, phase in find_phases(p.model).items()}
+
+def getNumNodes(p):
+    "This function returns the total number of nodes of the phases of the problem"
+
+    return sum(phase.options['transcription'].grid_data.num_nodes for phase in find_phases(p.model).values())
+
+def gridLevels(fine_grids, levels=default_levels):
+    "This function returns the number of segments of every phase for each level of the grid sequence"
+
+    sequence = []
+    for level in list(levels) + [None]:
+        if level is None:
+            grids = dict(fine_grids)
+        else:
+            grids = {path: min(level, num_segments) for path, num_segments in fine_grids.items()}
+
+        # skip the levels that do not change the grid
+        if not sequence or grids != sequence[-1]:
+            sequence.append(grids)
+
+    return sequence
+
+def setPhaseGrids(p, grids):
+    "This function sets the number of segments of the phases. The problem must be setup afterwards"
+
+    for path, phase in find_phases(p.model).items():
+        tx = phase.options['transcription']
+
+        if tx.options['num_segments'] == grids[path]:
+            continue
+
+        # the segments are evenly spaced and share the lowest order of the previous grid
+        tx.options['num_segments'] = grids[path]
+        tx.options['order']        = int(np.min(tx.options['order']))
+        tx.options['segment_ends'] = None
+        tx.init_grid()
+
+def saveConnections(p):
+    "This function returns a copy of the connections declared before setup in every group of the model"
+
+    return {group: copy.deepcopy(group._static_manual_connections)
+            for group in p.model.system_iter(include_self=True, recurse=True, typ=om.Group)}
+
+def restoreConnections(connections):
+    "This function restores the connections, with their negative src_indices, before the problem is setup again"
+
+    for group, manual_connections in connections.items():
+        group._static_manual_connections = copy.deepcopy(manual_connections)
+
+# ========================================================================================================
+# solution transfer
+# ========================================================================================================
+
+def getSolution(p):
+    "This function stores the current solution of the problem in the format used by dymos.load_case"
+
+    return {'inputs':  p.model.list_inputs(out_stream=None, units=True, prom_name=True),
+            'outputs': p.model.list_outputs(out_stream=None, units=True, prom_name=True)}
+
+def transferSolution(p, solution):
+    "This function sets as initial guess of the (new) problem the solution of the previous grid"
+
+    p.final_setup()
+
+    outputs = {meta['prom_name']: meta for name, meta in p.model.list_outputs(out_stream=None, units=True,
+                                                                              prom_name=True)}
+
+    # copy the outputs whose shape does not depend on the grid
+    for name, meta in solution['outputs']:
+        prom_name = meta['prom_name']
+        if prom_name in outputs and np.shape(outputs[prom_name]['value']) == np.shape(meta['value']):
+            p.set_val(prom_name, meta['value'], units=meta['units'])
+
+    # interpolate the time, states and controls of the phases onto the new grid
+    dm.load_case(p, solution)
+
+# ========================================================================================================
+# grid sequence
+# ========================================================================================================
+
+def solveGridSequence(p, levels=default_levels, check_error=True, coloring_cache=None, plan_solvers=False):
+    "This function solves the problem on a sequence of grids of increasing size. It returns the grid, the success flag of the driver and the maximum error estimate of every phase at each level"
+    " The initial guess must be set in the problem, on the grid defined in defineTrajectoryPhases"
+    " If coloring_cache is given the total coloring of each grid is stored in and read from that directory"
+    " If plan_solvers == True the linear solvers are planned again after each setup (see solverPlanning.py)"
+
+    sequence    = gridLevels(getPhaseGrids(p), levels)
+    connections = saveConnections(p)
+    history     = []
+
+    # evaluate the timeseries of the initial guess so that it can be interpolated onto the first grid
+    p.run_model()
+
+    for i, grids in enumerate(sequence):
+
+        if grids != getPhaseGrids(p):
+            solution = getSolution(p)
+            setPhaseGrids(p, grids)
+            restoreConnections(connections)
+            p.setup(check=False, force_alloc_complex=True)
+            if plan_solvers:
+                planLinearSolvers(p)
+            if coloring_cache is not None:
+                useColoringCache(p, coloring_cache)
+            transferSolution(p, solution)
+
+        failed = p.run_driver()
+
+        level = {'grids': grids, 'success': not failed, 'error': {}}
+        history.append(level)
+
+        if not check_error:
+            continue
+
+        refine_results = PHAdaptive(find_phases(p.model)).check_error()
+
+        level['error'] = {path: float(np.max(results['error'])) for path, results in refine_results.items()}
+
+        print('Grid sequence level %d: %d nodes, max error %.3e' % (i, getNumNodes(p), max(level['error'].values())))
+
+        if not any(np.any(results['need_refinement']) for results in refine_results.values()):
+            break
+
+    return history
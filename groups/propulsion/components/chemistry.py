@@ -37,6 +37,9 @@ class Chemistry (om.Group):
         
         self.options.declare('P_a', types = float, desc= 'atmospheric pressure')
         
+        self.options.declare('propellant', types = str, default = 'RP-1/LOX',
+                             desc = 'propellant pair registered in propellant_surrogate')
+        
     def setup(self):
         
         g0         = self.options['g0']
@@ -44,8 +47,9 @@ class Chemistry (om.Group):
         eta_cStar = self.options['eta_cStar']
         Rmc        = self.options['Rmc']
         P_a        = self.options['P_a']
+        propellant = self.options['propellant']
         
-        self.add_subsystem('rocket_cea', Rocket_cea(),
+        self.add_subsystem('rocket_cea', Rocket_cea(propellant = propellant),
                            promotes_inputs=['P_c', 'o_f'],
                            promotes_outputs=['gamma_t', 'tc', 'mc'])
         
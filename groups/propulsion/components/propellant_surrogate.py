@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:12:36 2026
+
+Surrogate of the Rocket CEA tables of the propellant pairs. It evaluates the isentropic coef at the
+throat, the flame temperature and the molecular mass at the chamber, and their derivatives w.r.t.
+the mass ratio oxidizer / fuel and the chamber pressure, for arrays of (o_f, P_c) in a single call.
+
+The tables are interpolated with the same bicubic spline used before (RectBivariateSpline). The
+spline is a bicubic polynomial between its knots, so the 16 coefficients of every patch are
+computed once from the values and derivatives of the spline at the corners of the patch. They are
+cached on disk in a binary file and loaded the first time a propellant pair is evaluated.
+
+As the spline, the surrogate is evaluated at the closest point of the table for values of
+(o_f, P_c) outside of it.
+
+New propellant pairs are added to the registry with registerPropellant.
+
+@author: jorge
+"""
+
+import os
+import hashlib
+from collections import namedtuple
+
+import numpy as np
+
+from diskCache import cacheKey, cachedArrays, userCacheDir
+
+#%%
+# Step by step to generate the table of a propellant pair
+
+#1. Go to: https://cearun.grc.nasa.gov/
+#2. Choose Chemical Equilibrium Problem Types = rocket
+#3. Enter low, high and interval values for pressure, also its units. This is equivalent to chamber pressure.
+# be careful in CEA when using different inputs, I've got bad outputs outside of this range.
+#4. Choose fuel (i.e. RP-1)
+#5. Choose oxidizer (i.e. O2(L))
+#6. Enter low, high and interval values for o_f
+#7. Choose Pc/Pe = 1. I'm not planning to use exit parameters so this value does not have any influence
+#8. Choose What do you want to do upon clicking 'Submit'? = Tabulate results
+#9. Select equilibrium adn frozen coompositions. Enter parameters in the folling order:
+#       gamfz, mwfz, tfz, p , ispfz
+#10. Save input, output and tabulation files
+#11. Register the table with registerPropellant
+
+#%%
+
+# units of the chamber pressure of the tables
+P_units = 'bar'
+
+# registry of the propellant pairs. (low, high, interval) values of P_c and o_f used in Rocket CEA
+propellants = {}
+
+def registerPropellant(name, table_file, P_c, o_f):
+    "This function adds a Rocket CEA table to the registry of propellant pairs"
+
+    propellants[name] = {'table_file': os.path.abspath(table_file),
+                         'P_c'       : tuple(P_c),
+                         'o_f'       : tuple(o_f)}
+
+registerPropellant('RP-1/LOX', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cea_table.csv'),
+                   P_c = (60, 170, 10), o_f = (1.6, 4.0, 0.2))
+
+# The coefficients are cached on disk, see diskCache.py.
+# Increase the version whenever the way the coefficients are computed changes.
+# The cache directory is in the cache directory of the user. It can be redefined with the environment variable CEA_CACHE_DIR
+table_version = 1
+cache_dir = os.environ.get('CEA_CACHE_DIR', userCacheDir('cea_cache'))
+
+# surrogates loaded in memory. See function getSurrogate
+_surrogates = {}
+
+CEAState = namedtuple('CEAState', ['gamma_t', 'tc', 'mc',
+                                   'dgamma_t_do_f', 'dtc_do_f', 'dmc_do_f',
+                                   'dgamma_t_dP_c', 'dtc_dP_c', 'dmc_dP_c'])
+
+# matrix of the cubic Hermite polynomial. coefficients = M [p0, p1, dp0, dp1]
+M = np.array([[ 1.,  0.,  0.,  0.],
+              [ 0.,  0.,  1.,  0.],
+              [-3.,  3., -2., -1.],
+              [ 2., -2.,  1.,  1.]])
+
+def readCEATable(name):
+    "This function reads the Rocket CEA table of a propellant pair. It returns o_f, P_c and the tables of gamma_t, tc and mc"
+
+    propellant = propellants[name]
+
+    # import chemistry data from rocket CEA csv file
+    rocket_cea = np.genfromtxt(propellant['table_file'], delimiter='', encoding="utf8", skip_header=True)
+
+    # definition of vectors
+    P_lv, P_hv, P_int       = propellant['P_c']
+    o_f_lv, o_f_hv, o_f_int = propellant['o_f']
+
+    P_c = np.arange(P_lv, P_hv + P_int, P_int)
+    o_f = np.arange(o_f_lv, o_f_hv + o_f_int, o_f_int)
+
+    # Our interest is gamma at the throat
+    # rocket cea first writes inputs at the chamber, followed by throat and finally the nozzle exit
+    # We want:
+    # - gamma at the throat: shift = 1
+    # - tc at the chamber  : shift = 0
+    # - mc at the chamber  : shift = 0
+    # Frozen eq understimates performance by 1 - 4 %.  Refer to Sutton pag 167
+    rocket_cea = rocket_cea[:len(o_f) * len(P_c) * 3].reshape(len(o_f), len(P_c), 3, -1)
+
+    m_gamma_t = rocket_cea[:, :, 1, 0]
+    m_mc      = rocket_cea[:, :, 0, 1]
+    m_tc      = rocket_cea[:, :, 0, 2]
+
+    return o_f, P_c, np.array([m_gamma_t, m_tc, m_mc])
+
+def tableKey(name):
+    "This function returns the hash identifying the coefficients of a propellant pair"
+
+    propellant = propellants[name]
+
+    with open(propellant['table_file'], 'rb') as file:
+        table = hashlib.sha256(file.read()).hexdigest()
+
+    keyData = {'version': table_version,
+               'name'   : name,
+               'P_c'    : propellant['P_c'],
+               'o_f'    : propellant['o_f'],
+               'table'  : table}
+
+    return cacheKey(keyData)
+
+def buildCoefficients(name):
+    "This function fits the tables of a propellant pair and returns the breakpoints and the bicubic coefficients of every patch"
+
+    from scipy.interpolate import RectBivariateSpline as interp
+
+    o_f, P_c, tables = readCEATable(name)
+
+    coefs = []
+    for table in tables:
+        spline = interp(o_f, P_c, table)
+
+        # the spline is a bicubic polynomial between its knots
+        x = np.unique(spline.get_knots()[0])
+        y = np.unique(spline.get_knots()[1])
+
+        hx = np.diff(x)[:, np.newaxis]
+        hy = np.diff(y)[np.newaxis, :]
+
+        # values and derivatives at the corners of the patches, scaled to the local coordinates
+        F = np.zeros((len(x) - 1, len(y) - 1, 4, 4))
+        for dx, dy in [(0, 0), (1, 0), (0, 1), (1, 1)]:
+            f = spline(x, y, dx=dx, dy=dy)
+            scale = hx ** dx * hy ** dy
+
+            F[:, :, 2*dx + 0, 2*dy + 0] = f[:-1, :-1] * scale
+            F[:, :, 2*dx + 0, 2*dy + 1] = f[:-1, 1:]  * scale
+            F[:, :, 2*dx + 1, 2*dy + 0] = f[1:,  :-1] * scale
+            F[:, :, 2*dx + 1, 2*dy + 1] = f[1:,  1:]  * scale
+
+        coefs.append(M @ F @ M.T)
+
+    return x, y, np.array(coefs)
+
+def loadCoefficients(name):
+    "This function loads the cached coefficients of a propellant pair. They are computed and written to the cache if they are missing or not valid"
+
+    def build():
+        x, y, coefs = buildCoefficients(name)
+        return {'x': x, 'y': y, 'coefs': coefs}
+
+    arrays = cachedArrays(cache_dir, 'cea_', tableKey(name), build, 'The CEA surrogate of ' + name)
+
+    return arrays['x'], arrays['y'], arrays['coefs']
+
+def getSurrogate(name):
+    "This function returns the breakpoints and coefficients of a propellant pair. They are loaded only the first time it is called"
+
+    if name not in propellants:
+        raise ValueError('Unknown propellant pair ' + repr(name) + '. Registered pairs: ' + ', '.join(propellants))
+
+    if name not in _surrogates:
+        _surrogates[name] = loadCoefficients(name)
+
+    return _surrogates[name]
+
+def ceaProperties(o_f, P_c, propellant='RP-1/LOX'):
+    "This function evaluates gamma_t, tc and mc and their derivatives w.r.t. o_f and P_c (bar) for arrays of o_f and P_c"
+
+    x, y, coefs = getSurrogate(propellant)
+
+    o_f, P_c = np.broadcast_arrays(np.asarray(o_f, dtype=float), np.asarray(P_c, dtype=float))
+    shape = o_f.shape
+
+    # patch of every point. Points outside of the table are moved to its boundary, as in the spline
+    o_f = np.clip(o_f.ravel(), x[0], x[-1])
+    P_c = np.clip(P_c.ravel(), y[0], y[-1])
+
+    i = np.clip(np.searchsorted(x, o_f, side='right') - 1, 0, len(x) - 2)
+    j = np.clip(np.searchsorted(y, P_c, side='right') - 1, 0, len(y) - 2)
+
+    hx = x[i + 1] - x[i]
+    hy = y[j + 1] - y[j]
+    u  = (o_f - x[i]) / hx
+    v  = (P_c - y[j]) / hy
+
+    one  = np.ones_like(u)
+    zero = np.zeros_like(u)
+
+    U  = np.stack([one, u, u**2, u**3], axis=-1)
+    V  = np.stack([one, v, v**2, v**3], axis=-1)
+    dU = np.stack([zero, one, 2*u, 3*u**2], axis=-1) / hx[:, np.newaxis]
+    dV = np.stack([zero, one, 2*v, 3*v**2], axis=-1) / hy[:, np.newaxis]
+
+    # coefficients of the patch of every point for gamma_t, tc and mc
+    A = coefs[:, i, j]
+
+    AV  = np.einsum('knij,nj->kni', A, V)
+    AdV = np.einsum('knij,nj->kni', A, dV)
+
+    val   = np.einsum('ni,kni->kn', U,  AV).reshape((3,) + shape)
+    d_o_f = np.einsum('ni,kni->kn', dU, AV).reshape((3,) + shape)
+    d_P_c = np.einsum('ni,kni->kn', U,  AdV).reshape((3,) + shape)
+
+    return CEAState(*val, *d_o_f, *d_P_c)
@@ -32,6 +32,12 @@ class Propulsion(om.Group):
         
          self.options.declare('P_a', types = float, desc= 'atmospheric pressure. Set to zero to calculate values at vacuum.',
                              default = 0.0)
+         
+         self.options.declare('propellant_first_stage', types = str, default = 'RP-1/LOX',
+                             desc = 'propellant pair of the first stage registered in propellant_surrogate')
+         
+         self.options.declare('propellant_second_stage', types = str, default = 'RP-1/LOX',
+                             desc = 'propellant pair of the second stage registered in propellant_surrogate')
     
     def setup(self):
         
@@ -40,9 +46,11 @@ class Propulsion(om.Group):
         nb_e_second_stage = self.options['nb_e_second_stage']
         Rmc               = self.options['Rmc']
         P_a               = self.options['P_a']
+        propellant_1      = self.options['propellant_first_stage']
+        propellant_2      = self.options['propellant_second_stage']
 
         
-        self.add_subsystem('propulsion_stage_2', PropulsionStage(g0 = g0, nb_e = nb_e_second_stage, eta_C_f = 0.98, eta_cStar = 0.98, Rmc = Rmc, P_a = P_a))
+        self.add_subsystem('propulsion_stage_2', PropulsionStage(g0 = g0, nb_e = nb_e_second_stage, eta_C_f = 0.98, eta_cStar = 0.98, Rmc = Rmc, P_a = P_a, propellant = propellant_2))
 
-        self.add_subsystem('propulsion_stage_1', PropulsionStage(g0 = g0, nb_e = nb_e_first_stage, eta_C_f = 0.98, eta_cStar = 0.98, Rmc = Rmc, P_a = P_a))
+        self.add_subsystem('propulsion_stage_1', PropulsionStage(g0 = g0, nb_e = nb_e_first_stage, eta_C_f = 0.98, eta_cStar = 0.98, Rmc = Rmc, P_a = P_a, propellant = propellant_1))
         
@@ -36,6 +36,9 @@ class PropulsionStage(om.Group):
         
         self.options.declare('P_a', types = float, desc= 'atmospheric pressure. Set to zero to calculate values at vacuum.')
         
+        self.options.declare('propellant', types = str, default = 'RP-1/LOX',
+                             desc = 'propellant pair registered in propellant_surrogate')
+        
     def setup(self):
         
         g0         = self.options['g0']
@@ -44,8 +47,10 @@ class PropulsionStage(om.Group):
         Rmc        = self.options['Rmc']
         nb_e       = self.options['nb_e']
         P_a        = self.options['P_a']
+        propellant = self.options['propellant']
         
-        self.add_subsystem('chemistry', Chemistry(g0 = g0, eta_C_f = eta_C_f, eta_cStar = eta_cStar, Rmc = Rmc, P_a = P_a),
+        self.add_subsystem('chemistry', Chemistry(g0 = g0, eta_C_f = eta_C_f, eta_cStar = eta_cStar, Rmc = Rmc, P_a = P_a,
+                                                  propellant = propellant),
                            promotes_inputs = ['P_c', 'P_e', 'o_f'],
                            promotes_outputs = ['Isp', 'cStar', 'epsilon'])
         
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 11:26:43 2026
+
+Boundary ODE subsystems. Some outputs of the ODE are only used at the initial or final node of a
+phase (boundary constraints, coupling constraints). A subsystem that computes them does not need to
+be evaluated at every node of the phase: it is evaluated with num_nodes = 1 at the boundary node,
+so its outputs and partials do not grow with the grid.
+
+The subsystem is added to the model after the trajectory. Its inputs are connected to the last (or
+first) node of the timeseries of the phase, in the same way as the coupling constraints. The
+negative src_indices are handled by gridSequencing when the grid of the phase changes.
+
+@author: jorge
+"""
+
+
+boundary_index = {'initial': 0, 'final': -1}
+
+def addBoundaryODE(p, name, subsystem, phase_path, loc='final', inputs={}):
+    "This function adds the subsystem name to the model, evaluated only at the node loc ('initial' or 'final') of the phase phase_path"
+    " inputs = {timeseries variable: [targets]} connects the timeseries of the phase to the inputs of the subsystem"
+
+    if loc not in boundary_index:
+        raise ValueError('loc of the boundary ODE ' + name + ' must be initial or final, not ' + str(loc))
+
+    p.model.add_subsystem(name, subsystem)
+
+    for var, targets in inputs.items():
+        for target in targets:
+            p.model.connect(phase_path + '.timeseries.' + var, name + '.' + target,
+                            src_indices=[boundary_index[loc]])
+
+    return subsystem
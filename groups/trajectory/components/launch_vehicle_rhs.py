@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:05:22 2026
+
+This class evaluates the whole right-hand side of the launch vehicle ODE in a single component.
+It fuses the components Altitude, USatm, Mach_number, Drag_coefficient, HeatFluxAndDynamicPressure,
+DragForce, Gravity, Thrust_losses and LaunchVehicle2DEOM. The partials are obtained by applying the
+chain rule to the partials of those components, so the results are the same as the ones of the
+group of components.
+
+The function launchVehicleRHS does the math with NumPy arrays. It can be used outside of OpenMDAO.
+
+@author: jorge
+"""
+
+import numpy as np
+import openmdao.api as om
+
+from groups.trajectory.subgroups.aero.components.us_atmos import getInterpolants
+from groups.trajectory.subgroups.aero.components.Usatm_table_generation import atmosphere_vec
+from groups.trajectory.subgroups.aero.components.drag_coefficient import getCdCurves
+
+# ratio of specific heats times gas constant. Same values as in USatm
+K_sos = 1.4 * 287
+
+# outputs of the fused component, which are the outputs of the components it replaces
+rhs_outputs = {'rdot':        ('m/s',      'speed'),
+               'lambdadot':   ('rad/s',    'angular speed'),
+               'vdot':        ('m/s**2',   'acceleration magnitude'),
+               'phidot':      ('rad/s',    'flight path angle rate of change'),
+               'mdot':        ('kg/s',     'mass rate of change'),
+               'n_f':         (None,       'axial load factor'),
+               'h':           ('m',        'altitude'),
+               'P_a':         ('Pa',       'local atmospheric pressure'),
+               'rho':         ('kg/m**3',  'local air density'),
+               'd_rho_wrt_h': ('kg/m**4',  'partial derivative of rho w.r.t. h'),
+               'sos':         ('m/s',      'speed of sound'),
+               'Mach':        (None,       'Mach number'),
+               'Cd':          (None,       'Drag coefficient'),
+               'q_dyn':       ('Pa',       'dynamic pressure'),
+               'q_heat':      ('W/m**2',   'heat flux'),
+               'Drag':        ('N',        'drag force'),
+               'g':           ('m/s**2',   'gravity acceleration'),
+               'thrust':      ('N',        'thrust accounting for losses and throttle'),
+               'mfr':         ('kg/s',     'mass flow rate after throttle is applied')}
+
+# inputs evaluated at the nodes
+rhs_dynamic_inputs = {'r':        ('m',    'radius'),
+                      'lambda':   ('rad',  'longitude'),
+                      'v':        ('m/s',  'speed'),
+                      'phi':      ('rad',  'flight path angle'),
+                      'm':        ('kg',   'mass'),
+                      'theta':    ('rad',  'pitch angle'),
+                      'throttle': (None,   'throttle. Takes values between 0 and 1')}
+
+# inputs that are constant along the phase
+rhs_static_inputs = {'thrust_vac': ('N',    'thrust at vacuum'),
+                     'Ae_t':       ('m**2', 'total nozzle exit area'),
+                     'mfr_max':    ('kg/s', 'maximum mass flow rate.'),
+                     'diameter':   ('m',    'diameter of stage')}
+
+
+def _interp(f, f_p, x):
+    "This function evaluates the interpolator f. The imaginary part of a complex step is propagated with its derivative f_p"
+
+    if np.iscomplexobj(x):
+        return f(x.real, extrapolate=True) + 1j * x.imag * f_p(x.real, extrapolate=True)
+
+    return f(x, extrapolate=True)
+
+def launchVehicleRHS(inputs, r0, mu, omega, g0, atmosphere_method='akima', partials=False, rho_scale=1.0, Cd_scale=1.0):
+    "This function evaluates the right-hand side of the launch vehicle ODE. inputs maps the names of rhs_dynamic_inputs and rhs_static_inputs to arrays."
+    " It returns a dictionary with the outputs. If partials == True it also returns a dictionary with the non-zero partials (of, wrt)"
+    " rho_scale and Cd_scale multiply the air density and the drag coefficient. They are used by the dispersion analysis"
+
+    r          = inputs['r']
+    v          = inputs['v']
+    phi        = inputs['phi']
+    m          = inputs['m']
+    theta      = inputs['theta']
+    throttle   = inputs['throttle']
+    thrust_vac = inputs['thrust_vac']
+    Ae_t       = inputs['Ae_t']
+    mfr_max    = inputs['mfr_max']
+    diameter   = inputs['diameter']
+
+    out = {}
+
+    # atmosphere
+    # ======================================================================================
+    h = r - r0
+    out['h'] = h
+
+    if atmosphere_method == 'analytic':
+        atmos = atmosphere_vec(h)
+        T, P, rho, d_rho = atmos.T, atmos.P, atmos.rho, atmos.drho_dh
+    else:
+        interp = getInterpolants()
+        T     = _interp(interp['T'],         interp['T_deriv'],    h)
+        P     = _interp(interp['P'],         interp['P_deriv'],    h)
+        rho   = _interp(interp['rho'],       interp['rho_deriv'],  h)
+        d_rho = _interp(interp['rho_deriv'], interp['rho_deriv2'], h)
+
+    rho   = rho_scale * rho
+    d_rho = rho_scale * d_rho
+
+    sos = np.sqrt(K_sos * T)
+
+    out['P_a']         = P
+    out['rho']         = rho
+    out['d_rho_wrt_h'] = d_rho
+    out['sos']         = sos
+
+    # aerodynamics
+    # ======================================================================================
+    CdCurve, CdCurve_p = getCdCurves()
+
+    Mach = v / sos
+    Cd   = Cd_scale * _interp(CdCurve, CdCurve_p, Mach)
+    S    = np.pi/4 * diameter**2
+
+    q_dyn = 0.5 * rho * v**2
+    D     = q_dyn * Cd * S
+
+    out['Mach']   = Mach
+    out['Cd']     = Cd
+    out['q_dyn']  = q_dyn
+    out['q_heat'] = 0.5 * rho * v**3
+    out['Drag']   = D
+
+    # gravity and propulsion
+    # ======================================================================================
+    g      = mu/r**2
+    thrust = thrust_vac * throttle  -  Ae_t * P
+    mfr    = mfr_max * throttle
+
+    out['g']      = g
+    out['thrust'] = thrust
+    out['mfr']    = mfr
+
+    # equations of motion
+    # ======================================================================================
+    sin_phi = np.sin(phi)
+    cos_phi = np.cos(phi)
+    cos_theta_phi = np.cos(theta-phi)
+    sin_theta_phi = np.sin(theta-phi)
+
+    out['rdot']      = v * sin_phi
+    out['lambdadot'] = v * cos_phi / r
+    out['vdot']      = (-D + thrust * cos_theta_phi) / m + (omega**2 *r - g) * sin_phi
+    out['phidot']    = (thrust * sin_theta_phi) / (m*v) + ((omega**2 *r - g)*cos_phi) / v + 2*omega + v*cos_phi / r
+    out['mdot']      = -mfr
+    out['n_f']       = (thrust - D * cos_theta_phi) / (m * g0)
+
+    if not partials:
+        return out
+
+    # partials of the components
+    # ======================================================================================
+    if atmosphere_method == 'analytic':
+        T_p, P_p, rho_p, d_rho_p = atmos.dT_dh, atmos.dP_dh, atmos.drho_dh, atmos.d2rho_dh2
+    else:
+        T_p     = interp['T_deriv'](h, extrapolate=True)
+        P_p     = interp['P_deriv'](h, extrapolate=True)
+        rho_p   = interp['rho_deriv'](h, extrapolate=True)
+        d_rho_p = interp['rho_deriv2'](h, extrapolate=True)
+
+    rho_p   = rho_scale * rho_p
+    d_rho_p = rho_scale * d_rho_p
+
+    sos_p = 0.5/sos * T_p * K_sos
+
+    Mach_r = -v/sos**2 * sos_p
+    Mach_v = 1 / sos
+
+    Cd_Mach = Cd_scale * CdCurve_p(Mach, extrapolate=True)
+
+    q_dyn_r = 0.5 * v**2 * rho_p
+    q_dyn_v = rho * v
+
+    D_r = (q_dyn_r * Cd + q_dyn * Cd_Mach * Mach_r) * S
+    D_v = (q_dyn_v * Cd + q_dyn * Cd_Mach * Mach_v) * S
+    D_diameter = q_dyn * Cd * np.pi/2 * diameter
+
+    g_r      = -2 * mu / r**3
+    thrust_r = -Ae_t * P_p
+
+    # partials of the equations of motion w.r.t. the thrust, drag and gravity
+    vdot_thrust   = cos_theta_phi / m
+    vdot_D        = -1 / m
+    vdot_g        = - sin_phi
+    phidot_thrust = sin_theta_phi / (m*v)
+    phidot_g      = - cos_phi/v
+    n_f_thrust    = 1 / (m * g0)
+    n_f_D         = (- cos_theta_phi) / (m * g0)
+
+    jac = {}
+
+    jac['h', 'r'] = np.ones_like(r)
+
+    jac['P_a', 'r']         = P_p
+    jac['rho', 'r']         = rho_p
+    jac['d_rho_wrt_h', 'r'] = d_rho_p
+    jac['sos', 'r']         = sos_p
+
+    jac['Mach', 'r'] = Mach_r
+    jac['Mach', 'v'] = Mach_v
+
+    jac['Cd', 'r'] = Cd_Mach * Mach_r
+    jac['Cd', 'v'] = Cd_Mach * Mach_v
+
+    jac['q_dyn', 'r']  = q_dyn_r
+    jac['q_dyn', 'v']  = q_dyn_v
+    jac['q_heat', 'r'] = 0.5 * v**3 * rho_p
+    jac['q_heat', 'v'] = 1.5 * rho * v**2
+
+    jac['Drag', 'r']        = D_r
+    jac['Drag', 'v']        = D_v
+    jac['Drag', 'diameter'] = D_diameter
+
+    jac['g', 'r'] = g_r
+
+    jac['thrust', 'r']          = thrust_r
+    jac['thrust', 'throttle']   = thrust_vac * np.ones_like(throttle)
+    jac['thrust', 'thrust_vac'] = throttle
+    jac['thrust', 'Ae_t']       = - P
+
+    jac['mfr', 'throttle'] = mfr_max * np.ones_like(throttle)
+    jac['mfr', 'mfr_max']  = throttle
+
+    jac['rdot', 'v']   = sin_phi
+    jac['rdot', 'phi'] = v * cos_phi
+
+    jac['lambdadot', 'v']   = cos_phi / r
+    jac['lambdadot', 'r']   = v * cos_phi * (-1/r**2)
+    jac['lambdadot', 'phi'] = - v / r * sin_phi
+
+    jac['vdot', 'r']          = omega**2 * sin_phi + vdot_thrust * thrust_r + vdot_g * g_r + vdot_D * D_r
+    jac['vdot', 'v']          = vdot_D * D_v
+    jac['vdot', 'phi']        = thrust/m * sin_theta_phi + (omega**2 * r - g) * cos_phi
+    jac['vdot', 'm']          = (-D + thrust * cos_theta_phi) * (-1/m**2)
+    jac['vdot', 'theta']      = - (thrust / m ) * sin_theta_phi
+    jac['vdot', 'throttle']   = vdot_thrust * thrust_vac
+    jac['vdot', 'thrust_vac'] = vdot_thrust * throttle
+    jac['vdot', 'Ae_t']       = vdot_thrust * (-P)
+    jac['vdot', 'diameter']   = vdot_D * D_diameter
+
+    jac['phidot', 'r']          = omega**2 / v * cos_phi + v * cos_phi * (-1/r**2) + phidot_thrust * thrust_r + phidot_g * g_r
+    jac['phidot', 'v']          = thrust * sin_theta_phi/m * (-1/v**2) + (omega**2 * r - g) * cos_phi * (-1/v**2) + cos_phi/r
+    jac['phidot', 'phi']        = -thrust/(m*v) * cos_theta_phi - (omega**2 *r -g)/v * sin_phi - v/r * sin_phi
+    jac['phidot', 'm']          = thrust * sin_theta_phi / v * (-1/m**2)
+    jac['phidot', 'theta']      = thrust / (m * v) * cos_theta_phi
+    jac['phidot', 'throttle']   = phidot_thrust * thrust_vac
+    jac['phidot', 'thrust_vac'] = phidot_thrust * throttle
+    jac['phidot', 'Ae_t']       = phidot_thrust * (-P)
+
+    jac['mdot', 'throttle'] = -mfr_max * np.ones_like(throttle)
+    jac['mdot', 'mfr_max']  = -throttle
+
+    jac['n_f', 'r']          = n_f_thrust * thrust_r + n_f_D * D_r
+    jac['n_f', 'v']          = n_f_D * D_v
+    jac['n_f', 'phi']        = -D / (m * g0) * sin_theta_phi
+    jac['n_f', 'm']          = -(thrust - D * cos_theta_phi) / (m**2 * g0)
+    jac['n_f', 'theta']      = D / (m * g0) * sin_theta_phi
+    jac['n_f', 'throttle']   = n_f_thrust * thrust_vac
+    jac['n_f', 'thrust_vac'] = n_f_thrust * throttle
+    jac['n_f', 'Ae_t']       = n_f_thrust * (-P)
+    jac['n_f', 'diameter']   = n_f_D * D_diameter
+
+    return out, jac
+
+
+class LaunchVehicleRHS(om.ExplicitComponent):
+
+    def initialize(self):
+        self.options.declare('num_nodes', types=int,
+                             desc='Number of nodes to be evaluated in the RHS')
+        self.options.declare('central_body',desc = 'object of class Earth')
+        self.options.declare('atmosphere_method', default='akima', values=['akima', 'analytic'],
+                             desc = 'evaluation of the atmospheric model. Refer to USatm')
+
+    def setup(self):
+        nn = self.options['num_nodes']
+
+        for name, (units, desc) in rhs_dynamic_inputs.items():
+            self.add_input(name, val=np.zeros(nn), desc=desc, units=units)
+
+        for name, (units, desc) in rhs_static_inputs.items():
+            self.add_input(name, val=0.0, desc=desc, units=units)
+
+        for name, (units, desc) in rhs_outputs.items():
+            self.add_output(name, val=np.zeros(nn), desc=desc, units=units)
+
+        # the sparsity pattern is given by the partials returned by launchVehicleRHS
+        ar = np.arange(nn)
+
+        inputs = {name: np.ones(nn) for name in rhs_dynamic_inputs}
+        inputs.update({name: 1.0 for name in rhs_static_inputs})
+        inputs['r'] = inputs['r'] * self.options['central_body'].r0
+
+        _, jac = launchVehicleRHS(inputs, **self._constants(), partials=True)
+
+        for of, wrt in jac:
+            if wrt in rhs_static_inputs:
+                self.declare_partials(of = of, wrt = wrt)
+            else:
+                self.declare_partials(of = of, wrt = wrt, rows=ar, cols=ar)
+
+    def _constants(self):
+        "This function returns the constants of the central body used by launchVehicleRHS"
+
+        cb = self.options['central_body']
+
+        return {'r0': cb.r0, 'mu': cb.mu, 'omega': cb.angularSpeed, 'g0': cb.g0,
+                'atmosphere_method': self.options['atmosphere_method']}
+
+    def compute(self, inputs, outputs):
+
+        out = launchVehicleRHS(inputs, **self._constants())
+
+        for name, value in out.items():
+            outputs[name] = value
+
+    def compute_partials(self, inputs, jacobian):
+
+        _, jac = launchVehicleRHS(inputs, **self._constants(), partials=True)
+
+        for key, value in jac.items():
+            jacobian[key] = value
@@ -9,8 +9,10 @@ import numpy as np
 
 from groups.trajectory.launch_vehicle_ode import LaunchVehicleODE_lift_off, LaunchVehicleODE_pitch_over_linear, LaunchVehicleODE_pitch_over_exponential
 from groups.trajectory.launch_vehicle_ode import LaunchVehicleODE_gravity_turn, LaunchVehicleODE_exoatmos_a, LaunchVehicleODE_exoatmos_b
+from groups.trajectory.launch_vehicle_ode import odePath, odeTargets
 
-def defineTrajectoryPhases(central_body, vehicle, ha, hp_min):
+def defineTrajectoryPhases(central_body, vehicle, ha, hp_min, fused_ode=False):
+    "If fused_ode == True the phases use the single component ODE LaunchVehicleRHS"
     
     # Initialize Trajectory 
     traj = dm.Trajectory()  
@@ -23,35 +25,35 @@ def defineTrajectoryPhases(central_body, vehicle, ha, hp_min):
     
     lift_off               = dm.Phase(ode_class = LaunchVehicleODE_lift_off, 
                                       transcription = dm.GaussLobatto(num_segments=7, order=3, compressed=False),
-                                      ode_init_kwargs={'central_body':central_body}) 
+                                      ode_init_kwargs={'central_body':central_body, 'fused':fused_ode}) 
     
     pitch_over_linear      = dm.Phase(ode_class = LaunchVehicleODE_pitch_over_linear,
                                       transcription = dm.GaussLobatto(num_segments=7, order=3, compressed=False),
-                                      ode_init_kwargs={'central_body':central_body })
+                                      ode_init_kwargs={'central_body':central_body, 'fused':fused_ode})
     
     pitch_over_exponential = dm.Phase(ode_class = LaunchVehicleODE_pitch_over_exponential,
                                       transcription = dm.GaussLobatto(num_segments=7, order=3, compressed=False),
-                                      ode_init_kwargs={'central_body':central_body })
+                                      ode_init_kwargs={'central_body':central_body, 'fused':fused_ode})
     
     gravity_turn           = dm.Phase(ode_class=LaunchVehicleODE_gravity_turn,
                                       transcription = dm.GaussLobatto(num_segments=4, order=3, compressed=False),
-                                      ode_init_kwargs={'central_body':central_body })
+                                      ode_init_kwargs={'central_body':central_body, 'fused':fused_ode})
     
     gravity_turn_b         = dm.Phase(ode_class=LaunchVehicleODE_gravity_turn,
                                       transcription = dm.GaussLobatto(num_segments=3, order=3, compressed=False),
-                                      ode_init_kwargs={'central_body':central_body })
+                                      ode_init_kwargs={'central_body':central_body, 'fused':fused_ode})
     
     gravity_turn_c         = dm.Phase(ode_class=LaunchVehicleODE_gravity_turn,
                                       transcription = dm.GaussLobatto(num_segments=7, order=3, compressed=False),
-                                      ode_init_kwargs={'central_body':central_body })
+                                      ode_init_kwargs={'central_body':central_body, 'fused':fused_ode})
     
     exoatmos_a             = dm.Phase(ode_class = LaunchVehicleODE_exoatmos_a,
                                       transcription = dm.GaussLobatto(num_segments=7, order=3, compressed=False),
-                                      ode_init_kwargs={'central_body':central_body })
+                                      ode_init_kwargs={'central_body':central_body, 'fused':fused_ode})
     
     exoatmos_b             = dm.Phase(ode_class=LaunchVehicleODE_exoatmos_b,
                                       transcription = dm.GaussLobatto(num_segments=14, order=3, compressed=False),
-                                      ode_init_kwargs={'central_body':central_body })
+                                      ode_init_kwargs={'central_body':central_body, 'fused':fused_ode})
     
     
     # define design paramaters
@@ -201,17 +203,6 @@ def defineTrajectoryPhases(central_body, vehicle, ha, hp_min):
                                       'exoatmos_a':['thrust_losses.Ae_t'],
                                       'exoatmos_b':['thrust_losses.Ae_t']})
     
-    traj.add_input_parameter('Isp_stage_2', units = 's',
-                             dynamic = False,
-                             targets={'lift_off':None,
-                                      'pitch_over_linear':None,
-                                      'pitch_over_exponential':None,
-                                      'gravity_turn':None,
-                                      'gravity_turn_b':None,
-                                      'gravity_turn_c':None,
-                                      'exoatmos_a':None,
-                                      'exoatmos_b':['orbitalParameters.Isp']})
-    
     # input parameters asociated to propulsion first stage
     traj.add_input_parameter('thrust_vac_stage_1', units = 'N',
                              dynamic = False, shape =(1,),
@@ -553,7 +544,7 @@ def defineTrajectoryPhases(central_body, vehicle, ha, hp_min):
     
     exoatmos_b.add_state('r', units='m', rate_source='eom.rdot',   
                          fix_initial = False, fix_final = False , 
-                         targets=['eom.r', 'aero.r', 'gravity.r', 'orbitalParameters.r'], 
+                         targets=['eom.r', 'aero.r', 'gravity.r'], 
                          ref=6.45E6, ref0=6.37E6, defect_ref=1)
     
     exoatmos_b.add_state('lambda', units='rad', rate_source='eom.lambdadot',
@@ -563,17 +554,17 @@ def defineTrajectoryPhases(central_body, vehicle, ha, hp_min):
     
     exoatmos_b.add_state('v', units='m/s', rate_source='eom.vdot',    
                          fix_initial = False, fix_final = False , 
-                         targets=['eom.v', 'aero.v', 'orbitalParameters.v'], 
+                         targets=['eom.v', 'aero.v'], 
                          ref=4E3, ref0=1E3, defect_ref=1)
     
     exoatmos_b.add_state('phi', units='rad', rate_source='eom.phidot',  
                          fix_initial = False, fix_final = False, 
-                         targets=['eom.phi', 'orbitalParameters.phi'],
+                         targets=['eom.phi'],
                          ref=1.57E0, ref0=0.0, defect_ref=1) 
     
     exoatmos_b.add_state('m', units='kg', rate_source='eom.mdot',   
                          fix_initial = False, fix_final = False ,
-                         targets=['eom.m', 'orbitalParameters.m_0'], 
+                         targets=['eom.m'], 
                          ref=9E4, ref0 = 2.2E4, defect_ref=1)
     
     exoatmos_b.add_control('throttle', units=None, opt=opt_throttle, 
@@ -630,24 +621,34 @@ def defineTrajectoryPhases(central_body, vehicle, ha, hp_min):
               'exoatmos_a':exoatmos_a, 
               'exoatmos_b':exoatmos_b}
     
-    # define the variables to be stored in Dymos timeseries. 
+    # the targets in aero, gravity and thrust_losses are inputs of the component eom of the fused ODE.
+    # =========================================================================================
+    if fused_ode:
+        for options in [traj.design_parameter_options, traj.input_parameter_options]:
+            for name in options:
+                options[name]['targets'] = odeTargets(options[name]['targets'], fused_ode)
+
+        for phase in phases.values():
+            for options in [phase.state_options, phase.control_options, phase.input_parameter_options]:
+                for name in options:
+                    options[name]['targets'] = odeTargets(options[name]['targets'], fused_ode)
+
+    # define the variables to be stored in Dymos timeseries.
     # =========================================================================================
     for phase in phases.values():
-        phase.add_timeseries_output('aero.rho',units='kg/m**3')
-        phase.add_timeseries_output('aero.Mach')
-        phase.add_timeseries_output('aero.Cd')
-        phase.add_timeseries_output('aero.q_dyn',units= 'Pa')
-        phase.add_timeseries_output('aero.q_heat',units = 'W/m**2')
-        phase.add_timeseries_output('gravity.g', units='m/s**2')
-        phase.add_timeseries_output('thrust_losses.thrust', units = 'N')
+        phase.add_timeseries_output(odePath('aero.rho', fused_ode),units='kg/m**3')
+        phase.add_timeseries_output(odePath('aero.Mach', fused_ode))
+        phase.add_timeseries_output(odePath('aero.Cd', fused_ode))
+        phase.add_timeseries_output(odePath('aero.q_dyn', fused_ode),units= 'Pa')
+        phase.add_timeseries_output(odePath('aero.q_heat', fused_ode),units = 'W/m**2')
+        phase.add_timeseries_output(odePath('gravity.g', fused_ode), units='m/s**2')
+        phase.add_timeseries_output(odePath('thrust_losses.thrust', fused_ode), units = 'N')
         phase.add_timeseries_output('eom.n_f', units = None)
         
         if phase != lift_off:
             phase.add_timeseries_output('guidance.theta',units='rad')
             
-    exoatmos_b.add_timeseries_output('orbitalParameters.ra', units = 'm')
-    exoatmos_b.add_timeseries_output('orbitalParameters.rp', units = 'm')
-    exoatmos_b.add_timeseries_output('orbitalParameters.m_final', units = 'kg')
+    # the orbital parameters are evaluated only at the final node of exoatmos_b. See defineProblem
     
     gravity_turn.add_timeseries_output('qDot.qDot', units = 'kg/m/s**3') 
     gravity_turn_b.add_timeseries_output('qDot.qDot', units = 'kg/m/s**3') 
@@ -6,21 +6,61 @@ from groups.trajectory.components.gravity import Gravity
 from groups.trajectory.components.thrust_losses import Thrust_losses as Thrust_losses
 from groups.trajectory.components.time_exoatmos import Time_exoatmos_a, Time_exoatmos_b
 from groups.trajectory.components.qDot import QDot
+from groups.trajectory.components.launch_vehicle_rhs import LaunchVehicleRHS
 
-from groups.trajectory.subgroups.orbitalParameters.orbitalParameters import OrbitalParameters
 from groups.trajectory.subgroups.aero.aero import Aero
 
+# subsystems of LaunchVehicleODE that are replaced by the component 'eom' of class LaunchVehicleRHS if fused == True
+fused_subsystems = ['aero', 'gravity', 'thrust_losses']
+
+def odePath(path, fused):
+    "This function returns the path of a variable of LaunchVehicleODE. If fused == True the variables of the fused subsystems belong to 'eom'"
+    
+    if fused and path.split('.')[0] in fused_subsystems:
+        return 'eom.' + path.split('.', 1)[1]
+    
+    return path
+
+def odeTargets(targets, fused):
+    "This function applies odePath to the targets of a state, control or parameter. Repeated targets are removed"
+    
+    if targets is None:
+        return None
+    
+    if isinstance(targets, str):
+        return odePath(targets, fused)
+    
+    if isinstance(targets, dict):
+        return {phase: odeTargets(value, fused) for phase, value in targets.items()}
+    
+    paths = []
+    for target in targets:
+        if odePath(target, fused) not in paths:
+            paths.append(odePath(target, fused))
+    
+    return paths
+
 class LaunchVehicleODE(om.Group):
 
     def initialize(self):
         self.options.declare('num_nodes', types=int, desc='Number of nodes to be evaluated in the RHS')
         self.options.declare('central_body',desc = 'object of class Earth')
+        self.options.declare('atmosphere_method', default='akima', values=['akima', 'analytic'],
+                             desc = 'evaluation of the atmospheric model. Refer to USatm')
+        self.options.declare('fused', default=False, types=bool,
+                             desc = 'evaluate aero, gravity, thrust_losses and eom in a single component. Refer to LaunchVehicleRHS')
 
     def setup(self):
         nn      = self.options['num_nodes']
         cb      = self.options['central_body']
         
-        self.add_subsystem('aero', Aero(num_nodes=nn, central_body = cb))
+        if self.options['fused']:
+            self.add_subsystem('eom', LaunchVehicleRHS(num_nodes=nn, central_body = cb,
+                                                       atmosphere_method = self.options['atmosphere_method']))
+            return
+        
+        self.add_subsystem('aero', Aero(num_nodes=nn, central_body = cb, 
+                                         atmosphere_method = self.options['atmosphere_method']))
         
         self.add_subsystem('gravity', Gravity(num_nodes = nn, mu = cb.mu))
         
@@ -85,8 +125,10 @@ class LaunchVehicleODE_gravity_turn(LaunchVehicleODE):
         
         self.connect('eom.vdot', 'qDot.vdot')
         self.connect('eom.rdot', 'qDot.rdot')
-        self.connect('aero.rho', 'qDot.rho')
-        self.connect('aero.d_rho_wrt_h', 'qDot.d_rho_wrt_h')
+        fused = self.options['fused']
+        
+        self.connect(odePath('aero.rho', fused), 'qDot.rho')
+        self.connect(odePath('aero.d_rho_wrt_h', fused), 'qDot.d_rho_wrt_h')
         
 class LaunchVehicleODE_exoatmos_a(LaunchVehicleODE):
     
@@ -108,13 +150,13 @@ class LaunchVehicleODE_exoatmos_b(LaunchVehicleODE):
     def setup(self):
         
         nn      = self.options['num_nodes']
-        cb      = self.options['central_body']
         
         self.add_subsystem('time_exoatmos_b', Time_exoatmos_b(num_nodes=nn))
         
         self.add_subsystem('guidance', Guidance_exoatmos(num_nodes=nn))
         
-        self.add_subsystem('orbitalParameters', OrbitalParameters(num_nodes=nn, central_body = cb))
+        # the orbital parameters are only needed at the final node. They are evaluated outside of the
+        # ODE, see addBoundaryODE
         
         super().setup()
         
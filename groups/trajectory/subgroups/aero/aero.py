@@ -25,6 +25,8 @@ class Aero(om.Group):
     def initialize(self):
         self.options.declare('num_nodes', types=int, desc='Number of nodes to be evaluated in the RHS')
         self.options.declare('central_body',desc = 'object of class Earth')
+        self.options.declare('atmosphere_method', default='akima', values=['akima', 'analytic'],
+                             desc = 'evaluation of the atmospheric model. Refer to USatm')
         # self.options.declare('S', types=float, desc='aerodynamic reference area (m**2)')
         
     def setup(self):
@@ -36,7 +38,7 @@ class Aero(om.Group):
                            promotes_inputs=['r'],
                            promotes_outputs=['h'])
         
-        self.add_subsystem('atmos', USatm(num_nodes=nn),
+        self.add_subsystem('atmos', USatm(num_nodes=nn, method=self.options['atmosphere_method']),
                            promotes_inputs=['h'],
                            promotes_outputs=['rho','P_a','sos', 'd_rho_wrt_h'])
         
@@ -18,25 +18,65 @@ outputs:
     - Pr  : atmospheric pressure in Pa
     - TM  : atmospheric temperature in K
     
+The function atmosphere_vec evaluates the same model for arrays of altitudes and returns 
+the analytic derivatives w.r.t. altitude. The chart of the layers is computed only 1 time.
+    
 @author: jorge
 """
 
 import numpy as np
+from collections import namedtuple
+
+# model constants. They are shared by every call of the function and define the cached tables of us_atmos
+R = 287             # gas constant                                                                             
+go = 9.806          # standard gravity
+To = 288.15         # sea level temp
+Po = 1.01325e5      # sea leve press
+re = 6378.14e3      # radius of earth at sea level. Tewari uses 
+# h = r - re          # height above sea level
+B = 2 / re
+gamma = 1.405       # adiab contant
+layers = 21
+
+# height in meters
+Z = [0 , 11019.1 , 20063.1 , 32161.9 , 47350.1 , 51412.5 , 71802.0 , 86000 , 100000 , 110000 , 120000 , 150000 ,  160000 , 170000 , 190000 , 230000 , 300000 , 400000 , 500000 , 600000 , 700000 , 2000000]
+# Temperature in kelvin
+T = [288.15 , 216.65 , 216.65 , 228.65 , 270.65 , 270.65 , 214.65 , 186.946 , 210.02 , 260.65 , 360.65 , 960.65 , 1110.60 , 1210.65 , 1350.65 , 1550.65 , 1830.65 , 2160.65 , 2420.65 , 2590.65 , 2700.00 , 2700.0]      
+# Slope K / m
+LR   = [-6.5e-3 , 0 , 1e-3 , 2.8e-3 , 0 , -2.8e-3 , -2e-3 , 1.693e-3 , 5.00e-3 , 1e-2 , 2e-2 , 1.5e-2 , 1e-2 , 7e-3 , 5e-3 , 4e-3 , 3.3e-3 , 2.6e-3 , 1.7e-3 , 1.1e-3 , 0]
+
+def layerChart():
+    "This function completes the data chart with the pressure and density at the base of every layer"
+    
+    rho0 = Po / (R * To)
+    P = [Po]
+    rho = [rho0]
+    
+    # Complete data chart with density and pressure
+    for i in range(0, layers):
+        if LR[i] != 0:
+            C1 = 1 + B * ( T[i]/LR[i] - Z[i] )
+            C2 = C1 * go / (R * LR[i])
+            C3 = T[i+1]/T[i]
+            C4 = C3**(-C2)
+            C5 = np.exp( go * B * (Z[i+1]-Z[i]) / (R * LR[i]) )
+            P.append(P[i] * C4 * C5)
+            C7 = C2 + 1
+            rho.append(rho[i] * C5 * C3**(-C7))
+        else:       
+            C8 = -go * (Z[i + 1] - Z[i]) * (1 - B * (Z[i + 1] + Z[i]) / 2) / (R * T[i])
+            P.append (P[i] * np.exp(C8))
+            rho.append (rho[i] * np.exp(C8))
+            
+    return P, rho
+
+# the chart only depends on the model constants. It is computed only 1 time
+P_chart, rho_chart = layerChart()
 
 # %% 
 def atmosphere (h, speed) :
         
         
-        R = 287             # gas constant                                                                             
-        go = 9.806          # standard gravity
-        To = 288.15         # sea level temp
-        Po = 1.01325e5      # sea leve press
-        re = 6378.14e3      # radius of earth at sea level. Tewari uses 
-        # h = r - re          # height above sea level
-        B = 2 / re
-        gamma = 1.405       # adiab contant
-        layers = 21
-        
         # Print alert if height goes above 2000 km and stop execution of this fucntion
         if h >= 2000e3:
             print('h = '+ str(h/1e3) + ' km. Atmosphere is only defined for heights under 2 000 km.')
@@ -46,32 +86,8 @@ def atmosphere (h, speed) :
         if speed < 0:
             print('v = ' + str(speed) + 'm/s. Atmosphere received a negative speed as input. Returning negative Mach number.')
         
-        # height in meters
-        Z = [0 , 11019.1 , 20063.1 , 32161.9 , 47350.1 , 51412.5 , 71802.0 , 86000 , 100000 , 110000 , 120000 , 150000 ,  160000 , 170000 , 190000 , 230000 , 300000 , 400000 , 500000 , 600000 , 700000 , 2000000]
-        # Temperature in kelvin
-        T = [288.15 , 216.65 , 216.65 , 228.65 , 270.65 , 270.65 , 214.65 , 186.946 , 210.02 , 260.65 , 360.65 , 960.65 , 1110.60 , 1210.65 , 1350.65 , 1550.65 , 1830.65 , 2160.65 , 2420.65 , 2590.65 , 2700.00 , 2700.0]      
-        # Slope K / m
-        LR   = [-6.5e-3 , 0 , 1e-3 , 2.8e-3 , 0 , -2.8e-3 , -2e-3 , 1.693e-3 , 5.00e-3 , 1e-2 , 2e-2 , 1.5e-2 , 1e-2 , 7e-3 , 5e-3 , 4e-3 , 3.3e-3 , 2.6e-3 , 1.7e-3 , 1.1e-3 , 0]                                 
-        
-        rho0 = Po / (R * To)
-        P = [Po]
-        rho = [rho0]
-        
-        # Complete data chart with density and pressure
-        for i in range(0, layers):
-            if LR[i] != 0:
-                C1 = 1 + B * ( T[i]/LR[i] - Z[i] )
-                C2 = C1 * go / (R * LR[i])
-                C3 = T[i+1]/T[i]
-                C4 = C3**(-C2)
-                C5 = np.exp( go * B * (Z[i+1]-Z[i]) / (R * LR[i]) )
-                P.append(P[i] * C4 * C5)
-                C7 = C2 + 1
-                rho.append(rho[i] * C5 * C3**(-C7))
-            else:       
-                C8 = -go * (Z[i + 1] - Z[i]) * (1 - B * (Z[i + 1] + Z[i]) / 2) / (R * T[i])
-                P.append (P[i] * np.exp(C8))
-                rho.append (rho[i] * np.exp(C8))
+        P   = P_chart
+        rho = rho_chart
             
         # Look for the correct range in the chart and interpolate
         for i in range(0, layers):
@@ -94,4 +110,70 @@ def atmosphere (h, speed) :
                 sos = (gamma * R * TM)**(1/2)
                 mach = speed / sos
                 return mach , rhoE, Pr, TM
-    
\ No newline at end of file
+    
+# %%
+USatmState = namedtuple('USatmState', ['T', 'P', 'rho', 'sos', 'mach', 
+                                       'dT_dh', 'dP_dh', 'drho_dh', 'd2rho_dh2', 'dsos_dh'])
+
+# arrays with the base values of every layer for the vectorized evaluation
+Z_base   = np.array(Z[:-1], dtype=float)
+T_base   = np.array(T[:-1], dtype=float)
+LR_base  = np.array(LR, dtype=float)
+P_base   = np.array(P_chart[:-1])
+rho_base = np.array(rho_chart[:-1])
+
+def atmosphere_vec(h, speed=0.0):
+    """
+    Vectorized version of the function atmosphere. It evaluates the model for an array of altitudes "h" in m
+    in a single pass and also returns the analytic derivatives w.r.t. h.
+    Heights above 2 000 km use the last (isothermal) layer.
+    """
+    
+    # complex inputs are kept to allow the complex step method in the components using this function
+    h = np.asarray(h)
+    if not np.iscomplexobj(h):
+        h = h.astype(float)
+    
+    # look for the correct range in the chart. Same criteria as in atmosphere: h < Z[i+1]
+    i = np.minimum(np.searchsorted(Z_base[1:], h.real, side='right'), layers - 1)
+    
+    Zi   = Z_base[i]
+    Ti   = T_base[i]
+    Li   = LR_base[i]
+    Pi   = P_base[i]
+    rhoi = rho_base[i]
+    
+    # layers with a temperature gradient. Isothermal layers use a dummy slope to avoid dividing by 0
+    grad = Li != 0
+    L    = np.where(grad, Li, 1.0)
+    
+    C1 = 1 + B * ( Ti/L - Zi )
+    C2 = C1 * go / (R * L)
+    TM = np.where(grad, Ti + Li*(h - Zi), Ti)
+    C3 = TM/Ti
+    C5 = np.exp( B * go * (h - Zi) / (R * L) )
+    C7 = C2 + 1
+    
+    # isothermal layers
+    C8    = -go * (h - Zi) * (1 - (h + Zi) * B/2) / (R * Ti)
+    C8_p  = -go * (1 - B * h) / (R * Ti)
+    C8_pp =  go * B / (R * Ti)
+    
+    P   = np.where(grad, Pi * C3**(-C2) * C5, Pi * np.exp(C8))
+    rho = np.where(grad, rhoi * C5 * C3**(-C7), rhoi * np.exp(C8))
+    
+    # logarithmic derivatives of P and rho w.r.t. h
+    dlnP_dh   = np.where(grad, -C2 * Li / TM + B * go / (R * L), C8_p)
+    dlnrho_dh = np.where(grad, -C7 * Li / TM + B * go / (R * L), C8_p)
+    d2lnrho_dh2 = np.where(grad, C7 * Li**2 / TM**2, C8_pp)
+    
+    dT_dh     = Li * np.ones_like(h)
+    dP_dh     = P * dlnP_dh
+    drho_dh   = rho * dlnrho_dh
+    d2rho_dh2 = rho * (dlnrho_dh**2 + d2lnrho_dh2)
+    
+    sos     = (gamma * R * TM)**(1/2)
+    dsos_dh = 0.5 * (gamma * R / TM)**(1/2) * dT_dh
+    mach    = speed / sos
+    
+    return USatmState(TM, P, rho, sos, mach, dT_dh, dP_dh, drho_dh, d2rho_dh2, dsos_dh)
@@ -3,7 +3,8 @@
 Created on Thu Jul  9 18:08:43 2020
 
 This class calculates the drag coefficient as a function of Mach number.
-First, an interpolator is fitted to tabulated data. This is done only 1 time per optimization procedure.
+First, an interpolator is fitted to tabulated data. This is done only 1 time per optimization procedure,
+the first time the drag coefficient is evaluated (see function getCdCurves).
 
 The drag coefficient table corresponds to Ariane 5 data according to 
 Figure 3.11 of Pagano - Global Launcher Trajectory Optimization for Lunar Base Settlement.
@@ -11,7 +12,6 @@ This has to be replaced by better quality data in the future.
 @author: jorge
 """
 
-from scipy.interpolate import PchipInterpolator
 import numpy as np
 import openmdao.api as om
 
@@ -39,9 +39,20 @@ int_data = np.array([
                 [15  , 0.59],
                 ])
 
-# pchip
-CdCurve = PchipInterpolator((int_data[:,0]),(int_data[:,1]))
-CdCurve_p = CdCurve.derivative(1)
+# interpolators are fitted on first use. See function getCdCurves
+_interpolants = {}
+
+def getCdCurves():
+    "This function returns the interpolator of the drag coefficient and its derivative. They are fitted only the first time it is called"
+    
+    if not _interpolants:
+        from scipy.interpolate import PchipInterpolator
+        
+        # pchip
+        _interpolants['Cd']   = PchipInterpolator((int_data[:,0]),(int_data[:,1]))
+        _interpolants['Cd_p'] = _interpolants['Cd'].derivative(1)
+        
+    return _interpolants['Cd'], _interpolants['Cd_p']
 
 class Drag_coefficient(om.ExplicitComponent):
     
@@ -70,9 +81,13 @@ class Drag_coefficient(om.ExplicitComponent):
         
     def compute(self, inputs, outputs):
         
+        CdCurve, CdCurve_p = getCdCurves()
+        
         outputs['Cd'] = CdCurve(inputs['Mach'], extrapolate=True)
         
     def compute_partials(self, inputs, jacobian):
         
+        CdCurve, CdCurve_p = getCdCurves()
+        
         jacobian['Cd','Mach'] = CdCurve_p(inputs['Mach'], extrapolate=True)
         
\ No newline at end of file
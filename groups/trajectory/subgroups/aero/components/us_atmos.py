@@ -5,7 +5,8 @@ Created on Wed Sep  2 14:48:32 2020
 This script calls the atmospheric table generator to build tables of data.
 Such tables are then interpolated in order to have access to continuous funtions
 and their derivatives.
-The tables are generated and interpolated only 1 time per optimization procedure.
+The tables are generated only 1 time and cached on disk (see function loadUSatmTable). 
+They are loaded and interpolated the first time USatm is evaluated.
 The interpolator is used iteratively through out the optimization.
 
 Tewari's atmospheric model is valid for heights [0 , 2000) km
@@ -15,16 +16,16 @@ Tewari - ATMOSPHERIC AND SPACE FLIGHT DYNAMICS
 """
 
 # Standard Atmosphere Derived from 1976 and 1962 U.S. Standard Atmospheres. Reference Tewari
-from groups.trajectory.subgroups.aero.components.Usatm_table_generation import atmosphere
-from collections import namedtuple
+from groups.trajectory.subgroups.aero.components import Usatm_table_generation as usatm_model
+from groups.trajectory.subgroups.aero.components.Usatm_table_generation import atmosphere_vec
+
+import os
 
 import numpy as np
-from scipy.interpolate import Akima1DInterpolator as Akima
 
 import openmdao.api as om
-import matplotlib.pyplot as plt
 
-USatmData = namedtuple('USatmData', ['T', 'P' , 'rho'])
+from diskCache import cacheKey, cachedArrays, userCacheDir
 
 # Define sampling space to call the atmosphere table generation function 
 # Tewari's atmospheric model  is valid for heights [0 , 2000) km
@@ -33,47 +34,92 @@ height_final    = 1999e3  # m
 height_sampling = 1000    # m
 numberSamples = int(((height_final -  height_initial )/height_sampling ) + 1)
 
-# define vector containing every altitude at which the atmospheric model is to be evaluated
-# to generate the table
-USatmData.alt = np.linspace(height_initial , height_final, numberSamples) 
-
-#  define variables and allocate memory
-USatmData.T   = np.zeros(numberSamples);
-USatmData.P   = np.zeros(numberSamples);
-USatmData.rho = np.zeros(numberSamples);
-
-# iteratively call atmosphere function to fill table
-for i in range(numberSamples):
-    _, USatmData.rho[i], USatmData.P[i], USatmData.T[i] = atmosphere(USatmData.alt[i],0)
-
-# interpolate the date from the tables
-T_interp = Akima(USatmData.alt, USatmData.T)
-P_interp = Akima(USatmData.alt, USatmData.P)
-rho_interp = Akima(USatmData.alt, USatmData.rho)
-
-# create function to evaluate derivatives of the interpolator
-T_interp_deriv    = T_interp.derivative(1)
-P_interp_deriv    = P_interp.derivative(1)
-rho_interp_deriv  = rho_interp.derivative(1)
-rho_interp_deriv2 = rho_interp.derivative(2)
+# The tables are cached on disk, see diskCache.py.
+# Increase the version whenever the way the tables are generated changes. 
+# The cache directory is in the cache directory of the user. It can be redefined with the environment variable USATM_CACHE_DIR
+table_version = 1
+cache_dir = os.environ.get('USATM_CACHE_DIR', userCacheDir('usatm_cache'))
+
+# interpolators are fitted on first use of USatm. See function getInterpolants
+_interpolants = {}
+
+def tableKey():
+    "This function returns the hash identifying a table for the current sampling space and model constants"
+    
+    keyData = {'version'  : table_version,
+               'grid'     : [height_initial, height_final, numberSamples],
+               'constants': [usatm_model.R, usatm_model.go, usatm_model.To, usatm_model.Po, 
+                             usatm_model.re, usatm_model.layers],
+               'Z'        : usatm_model.Z,
+               'T'        : usatm_model.T,
+               'LR'       : usatm_model.LR}
+    
+    return cacheKey(keyData)
+
+def buildUSatmTable():
+    "This function evaluates the atmospheric model in the sampling space. Rows of the table are: alt, T, P, rho"
+    
+    # define vector containing every altitude at which the atmospheric model is to be evaluated
+    # to generate the table
+    alt = np.linspace(height_initial , height_final, numberSamples) 
+    
+    # evaluate the whole table in a single call of the vectorized atmosphere function
+    state = atmosphere_vec(alt)
+        
+    return np.array([alt, state.T, state.P, state.rho])
+
+def loadUSatmTable():
+    "This function loads the cached table. The table is built and written to the cache if it is missing or not valid"
+    
+    # the cached table is memory mapped, so processes using the same file share its pages
+    return cachedArrays(cache_dir, 'usatm_', tableKey(), lambda: {'table': buildUSatmTable()},
+                        'The atmospheric table', mmap=True)['table']
+
+def getInterpolants():
+    "This function returns the interpolators of the atmospheric tables. They are fitted only the first time it is called"
+    
+    if not _interpolants:
+        from scipy.interpolate import Akima1DInterpolator as Akima
+        
+        alt, T, P, rho = loadUSatmTable()
+        
+        # interpolate the date from the tables
+        _interpolants['T']   = Akima(alt, T)
+        _interpolants['P']   = Akima(alt, P)
+        _interpolants['rho'] = Akima(alt, rho)
+        
+        # create function to evaluate derivatives of the interpolator
+        _interpolants['T_deriv']    = _interpolants['T'].derivative(1)
+        _interpolants['P_deriv']    = _interpolants['P'].derivative(1)
+        _interpolants['rho_deriv']  = _interpolants['rho'].derivative(1)
+        _interpolants['rho_deriv2'] = _interpolants['rho'].derivative(2)
+        
+    return _interpolants
 
 # % plot with height_final = 50e3 to check continuity
+# import matplotlib.pyplot as plt
+# alt, T, P, rho = loadUSatmTable()
 # plt.figure()   
-# plt.plot(USatmData.alt/1e3,USatmData.T,'o')
+# plt.plot(alt/1e3,T,'o')
 # plt.figure()
-# plt.plot(USatmData.alt/1e3,USatmData.rho,'o')
+# plt.plot(alt/1e3,rho,'o')
 # plt.figure()
-# plt.plot(USatmData.alt/1e3,rho_interp_deriv(USatmData.alt),'o')
+# plt.plot(alt/1e3,getInterpolants()['rho_deriv'](alt),'o')
 # plt.figure()
-# plt.plot(USatmData.alt/1e3,rho_interp_deriv2(USatmData.alt),'o')
+# plt.plot(alt/1e3,getInterpolants()['rho_deriv2'](alt),'o')
 # plt.figure()
-# plt.plot(USatmData.alt/1e3,USatmData.P/1e3,'o')
+# plt.plot(alt/1e3,P/1e3,'o')
 
 class USatm(om.ExplicitComponent):
 
     def initialize(self):
         self.options.declare('num_nodes', types=int,
                              desc='Number of nodes to be evaluated in the RHS')
+        
+        # 'akima'    : interpolates the cached tables (smooth second derivative of rho)
+        # 'analytic' : evaluates the closed-form model at the nodes. Derivatives are discontinuous at layer boundaries
+        self.options.declare('method', default='akima', values=['akima', 'analytic'],
+                             desc='evaluation of the atmospheric model')
 
         gamma = 1.4  # Ratio of specific heats
         gas_c = 287  # Gas constant J/(kg K)
@@ -116,18 +162,42 @@ class USatm(om.ExplicitComponent):
         self.declare_partials( of='P_a',         wrt='h',rows=ar, cols=ar)
 
     def compute(self, inputs, outputs):
-        T = T_interp(inputs['h'], extrapolate=True)
-        outputs['P_a']         = P_interp(inputs['h'], extrapolate=True)
-        outputs['rho']         = rho_interp(inputs['h'], extrapolate=True)
-        outputs['d_rho_wrt_h'] = rho_interp_deriv(inputs['h'], extrapolate=True)
+        
+        if self.options['method'] == 'analytic':
+            atmos = atmosphere_vec(inputs['h'])
+            
+            outputs['P_a']         = atmos.P
+            outputs['rho']         = atmos.rho
+            outputs['d_rho_wrt_h'] = atmos.drho_dh
+            outputs['sos']         = np.sqrt(self._K * atmos.T)
+            return
+        
+        interp = getInterpolants()
+        
+        T = interp['T'](inputs['h'], extrapolate=True)
+        outputs['P_a']         = interp['P'](inputs['h'], extrapolate=True)
+        outputs['rho']         = interp['rho'](inputs['h'], extrapolate=True)
+        outputs['d_rho_wrt_h'] = interp['rho_deriv'](inputs['h'], extrapolate=True)
         outputs['sos']         = np.sqrt(self._K * T)
 
     def compute_partials(self, inputs, partials):
+        
+        if self.options['method'] == 'analytic':
+            atmos = atmosphere_vec(inputs['h'])
+            
+            partials['P_a', 'h']         = atmos.dP_dh
+            partials['rho', 'h']         = atmos.drho_dh
+            partials['d_rho_wrt_h', 'h'] = atmos.d2rho_dh2
+            partials['sos', 'h']         = 0.5/np.sqrt(self._K * atmos.T) * atmos.dT_dh * self._K
+            return
+        
+        interp = getInterpolants()
+        
         H   = inputs['h']
-        T   = T_interp(H, extrapolate=True)
-        T_p = T_interp_deriv(H, extrapolate=True)
+        T   = interp['T'](H, extrapolate=True)
+        T_p = interp['T_deriv'](H, extrapolate=True)
         
-        partials['P_a', 'h']         = P_interp_deriv(H, extrapolate=True)
-        partials['rho', 'h']         = rho_interp_deriv(H, extrapolate=True)
-        partials['d_rho_wrt_h', 'h'] = rho_interp_deriv2(H, extrapolate=True)
+        partials['P_a', 'h']         = interp['P_deriv'](H, extrapolate=True)
+        partials['rho', 'h']         = interp['rho_deriv'](H, extrapolate=True)
+        partials['d_rho_wrt_h', 'h'] = interp['rho_deriv2'](H, extrapolate=True)
         partials['sos', 'h']         = 0.5/np.sqrt(self._K * T) * T_p * self._K
@@ -9,6 +9,7 @@ import openmdao.api as om
 import numpy as np
 
 import random
+import sqlite3
 
 
 def importInitialGuess(p, phases, design_params_str, initial_guess, states):
@@ -31,15 +32,57 @@ def importInitialGuess(p, phases, design_params_str, initial_guess, states):
     return p
 
 def readGuessFile (guess_file):
-    "this function extracts the last iteration of a dymos.db file"
-    # import the recorded cases
+    "this function extracts the last driver iteration of a dymos .db file or the initial guess of a .npz snapshot"
+    
+    # the snapshot stores only the variables set by importInitialGuess. They are read when requested
+    if guess_file.endswith('.npz'):
+        return GuessSnapshot(guess_file)
+    
+    # the reader only loads the metadata of the recorded variables
     cr = om.CaseReader(guess_file)
     
-    # extract only the last iteration
-    initial_guess = cr.get_cases()[-1]
+    # query the iteration coordinate of the last driver case and load only that row
+    with sqlite3.connect(guess_file) as con:
+        row = con.execute('SELECT iteration_coordinate FROM driver_iterations ORDER BY id DESC LIMIT 1').fetchone()
+    con.close()
+    
+    if row is None:
+        raise ValueError('The file %s has no driver cases' % guess_file)
+    
+    initial_guess = cr.get_case(row[0])
     
     return initial_guess
 
+def guessNames(phases, design_params_str, states):
+    "this function returns the names of the variables set by importInitialGuess"
+    
+    names = list(design_params_str)
+    
+    for phase in phases:
+        if 'exoatmos' not in phase:
+            names.append('traj.' + phase + '.t_duration')
+        names.append('traj.' + phase + '.t_initial')
+        for state in states:
+            names.append('traj.' + phase + '.states:' + state)
+    
+    return names
+
+def writeGuessSnapshot(initial_guess, guess_file, phases, design_params_str, states):
+    "this function saves in a .npz file the variables of an initial guess used by importInitialGuess"
+    
+    names = guessNames(phases, design_params_str, states)
+    
+    np.savez_compressed(guess_file, **{name: initial_guess.get_val(name) for name in names})
+
+class GuessSnapshot():
+    "This class reads the initial guess stored in a .npz file by writeGuessSnapshot"
+    
+    def __init__(self, guess_file):
+        self.values = np.load(guess_file)
+        
+    def get_val(self, name):
+        return self.values[name]
+
 def importInitialGuess_manualInput(p, phases, design_params, traj_phase_duration, states, randomize):
     "this function serves to define manually all of the initial values for the optimization."
     " if randomize == True the initial guess is set randomly for design parameters and time duration but manually for the states"
@@ -15,44 +15,16 @@ The main environemnts used are Dymos and OpenMDAO. Two open-source libraries by
 
 import openmdao.api as om
 import dymos as dm
-import numpy as np
 import time
-from openmdao.api import ScipyOptimizeDriver
 
 from celestialBodies import Earth
 from vehicles import TSTO
-from plotState_sim import plotState, saveTraj
 from importInitialGuess import importInitialGuess, readGuessFile, importInitialGuess_manualInput, importInitialGuess_random
-from writeReport import writeReport, updateVehicle
-from writeBatchReport import writeBatchReport
-
-from constraints.defineCouplingConstraints import defineCouplingConstraints
-
-from groups.propulsion.propulsion import Propulsion
-from groups.massSizing.massSizing import MassSizing
 
-from groups.trajectory.defineTrajectoryPhases import defineTrajectoryPhases
-from defineConnections import defineConnections
+from defineProblem import defineProblem, setBurnoutEvents
+from gridSequencing import solveGridSequence
+from solutionLibrary import SolutionLibrary, missionFeatures
 
-from external_parameters import external_params
-
-
-
-# intialize openmmdao problem
-# =========================================================================================================
-p = om.Problem(model=om.Group())
-
-# Define NLP solver
-# =========================================================================================================
-p.driver = ScipyOptimizeDriver()
-p.driver.options['optimizer'] = 'SLSQP'
-# set tol 1e-4 for a precission of  10 kg. account for objective function scaling.
-# adder = -ref0
-# scaler = 1 / (ref - ref0) 
-# x_sc = scaler (x - ref0)
-p.driver.options['tol'] = 1e-3
-p.driver.options['maxiter'] = 100
-p.driver.declare_coloring()
 
 
 # initialize earth and vehicle. Set orbit objectives and define intial guess type
@@ -72,134 +44,62 @@ hp_min = 145e3  # min height at perigee(m)
 # if guess_type == 'manual'        the initial guess uses manual inputs from the 
 #                                  file "importInitialGuess" function "importInitialGuess_manualInput".
 
-# if guess_type == 'saved'         the initial guess is read from a .db file. If any variable name 
-#                                  is changed a new .db file  must be generated.
+# if guess_type == 'saved'         the initial guess is read from the last driver case of a .db file or 
+#                                  from a .npz snapshot written by "writeGuessSnapshot". If any variable 
+#                                  name is changed a new file must be generated.
 
 # if guess_type == 'semi-random'   the initial guess is set randomly for design parameters and time duration.
 #                                  Initial guess  for states is the same as for guess_type == 'manual'.
 #                                  It convverges only 25% of the time 
+#                                  Use multiStart.py to run a batch of semi-random or random guesses in parallel.
+
+# if guess_type == 'library'       the initial guess is interpolated among the converged solutions of the
+#                                  library_dir closest to the mission. See solutionLibrary.py
 
 
 guess_type = 'saved'
 
-# specify path to initial guess .db file in case guess_type == 'saved'
+# specify path to initial guess .db or .npz file in case guess_type == 'saved'
 guess_file = 'initial_guess/F9_11Ton_400km.db'
 
+# if grid_sequencing == True the problem is first solved on coarse grids (2 and 4 segments per phase) and the
+#                            solution is interpolated onto the grid defined in defineTrajectoryPhases.
+#                            The sequence stops when the ph-adaptive error estimate meets the tolerance of every phase.
+#                            Recommended for the manual and random guesses. See gridSequencing.py
+grid_sequencing = False
+
+# directory where the total derivative coloring is cached under a hash of the structure of the model.
+# The coloring is computed only the first time a model is run. Set to None to compute it in every run.
+coloring_cache = 'coloring_cache'
+
+# if eval_cache == True the objective, constraints and total jacobian of the design vectors already evaluated
+#                       by SLSQP are served from a cache instead of running the model again. See evaluationCache.py
+eval_cache = False
+
+# if plan_solvers == True the feed-forward groups of the model use LinearRunOnce and only the coupled blocks
+#                         (the phases) a sparse DirectSolver. Otherwise a DirectSolver factorizes the jacobian of
+#                         the whole model. See solverPlanning.py
+plan_solvers = True
+
+# directory of the library of converged solutions. Every converged solution is added to it. Set to None to disable it.
+library_dir = 'solution_library'
 
-# add_main modules to the model
+# if mission_sensitivity == True the derivatives of GLOW w.r.t. md, mplf, ha and hp_min are computed at the optimum
+#                                with one evaluation of the total derivatives and written to results/sensitivityReport.txt.
+#                                See postOptimality.py
+mission_sensitivity = False
+
+
+# intialize openmmdao problem. Define the NLP solver, add the main modules to the model, define
+# the constraints, objective and connections and setup the problem
 # =========================================================================================================
-# external parameters. Contains and defines the units, bounds and scaling parameters of 
-# the variables to be optimized related to the massSizing and propulsion modules.
-external_params = p.model.add_subsystem('external_params', external_params)
-
-# add propulsion module. contains models for first and second stage
-propulsion = p.model.add_subsystem('propulsion', Propulsion( g0 = earth.g0, 
-                                                            nb_e_first_stage = rocket.stage_1.nb_e, 
-                                                            nb_e_second_stage = rocket.stage_2.nb_e))
-
-# add massSizing module. contains models for first and second stage
-massSizing = p.model.add_subsystem('massSizing', MassSizing( nb_e_first_stage = rocket.stage_1.nb_e, 
-                                                            mass_aux_1 = rocket.stage_1.mass_aux ) )
-
-# add trajectory module. Contains and defines the units, bounds and scaling parameters of 
-# the variables to be optimized related to the trajectory
-traj, phases = defineTrajectoryPhases(earth, rocket, ha, hp_min)
-p.model.add_subsystem('traj', traj)
-
-# define constraints for the trajectory
-# ===========================================================================================================
-phases['lift_off'].add_boundary_constraint('r', units = 'm', 
-                                           loc='final' , shape=(1,),
-                                           lower=earth.r0 + 150 , upper = earth.r0 + 2000,
-                                           ref= earth.r0 + 2000, ref0= earth.r0 + 150)
-
-phases['gravity_turn'].add_boundary_constraint(name='qDot.qDot', units='kg/m/s**3', 
-                                               loc='final', shape=(1,), 
-                                               equals = 0.0)
-
-phases['gravity_turn_c'].add_boundary_constraint(name='aero.q_dyn', units='Pa', 
-                                                 loc='final', shape=(1,), 
-                                                 upper=1e3, 
-                                                 ref=2e3, ref0 = 1e3)
-
-phases['exoatmos_a'].add_boundary_constraint('aero.q_heat', units = 'W/m**2',
-                                             loc= 'final', shape=(1,),
-                                             upper = 1135,  
-                                             ref= 2e4, ref0=1135)
-
-phases['exoatmos_b'].add_boundary_constraint('orbitalParameters.ra', units='m', 
-                                       loc='final', shape=(1,),
-                                       lower = earth.r0 + ha , upper = earth.r0 + ha + 2e4,
-                                       ref=earth.r0 + ha + 2e4, ref0= earth.r0 + ha)
-    
-phases['exoatmos_b'].add_boundary_constraint('orbitalParameters.rp', units='m', 
-                                       loc='final', shape=(1,),
-                                       lower = earth.r0 + hp_min,
-                                       ref=earth.r0 + 2*hp_min,
-                                       ref0=earth.r0 + hp_min )
-
-# define optimization objective 
-# ======================================================================================================
-phases['lift_off'].add_objective('m',loc='initial', ref=4.5E5, ref0 = 3.5E5)
-
-# define connections between modules
-# ======================================================================================================
-p = defineConnections(p)
-
-# define constraints for constraint coupling components. append constraints components in dictionary
-# ======================================================================================================
-p, constraintComponents = defineCouplingConstraints(p, rocket)
-
-# setup linear solver and problem
-# ======================================================================================================
-p.model.linear_solver = om.DirectSolver()
-p.setup(check=True,force_alloc_complex=True)
-
-# store constraints and design parameters in lists and dictionaries
-# =======================================================================================================
-constraints_str = []
-
-for constraintComponent in constraintComponents.values():
-    for constraint in constraintComponent.get_constraints().keys():
-        constraints_str.append(constraint)
-
-for i in traj.get_constraints().keys():
-    if 'final_boundary' in i:
-        constraints_str.append(i)
-        
-for i in propulsion.get_constraints().keys():
-    constraints_str.append(i)
-
-
-# store all the design parameters and phase_durations from trajectory in dictionaries
-design_params = {}
-traj_phase_duration = {}
-
-for key, value in traj.get_design_vars().items():
-    if '.t_duration' in key:
-        traj_phase_duration[key] = value
-    elif 'design_params' in key :
-        design_params[key] = value
-
-# this extra loop is to store phases in the right order
-for key, value in traj.get_design_vars().items():
-    if '_t_duration' in key:
-        traj_phase_duration[key] = value
-        
-# store external design parameters in list
-for key, value in external_params.get_design_vars().items():
-    if '_t_duration' not in key:
-        design_params[key] = value
-    
+p, traj, phases, design_params, traj_phase_duration, constraints_str, states = defineProblem(earth, rocket, ha, hp_min,
+                                                                                             coloring_cache=coloring_cache,
+                                                                                             eval_cache=eval_cache,
+                                                                                             plan_solvers=plan_solvers)
+
 # import initial guess
 # ==========================================================================================================
-# group states into dictionary and define lower and upper bounds for random initialization
-states = {'r':[earth.r0, earth.r0 + 200e3],
-          'v':[1e-3, 8e3],
-          'lambda':[1e-3, np.radians(15)],
-          'm':[rocket.md, 600e3],
-          'phi':[1e-3, np.pi/2]}
-
 if guess_type == 'manual':
     p = importInitialGuess_manualInput(p, phases, design_params, traj_phase_duration, states, False)
     guess_file = 'manual guess'
@@ -216,6 +116,12 @@ elif guess_type == 'saved':
     initial_guess = readGuessFile (guess_file)
     p = importInitialGuess(p, phases, design_params.keys(), initial_guess, states.keys())
 
+elif guess_type == 'library':
+    initial_guess = SolutionLibrary(library_dir).initialGuess(phases, design_params.keys(), states.keys(),
+                                                              missionFeatures(rocket, ha, hp_min))
+    p = importInitialGuess(p, phases, design_params.keys(), initial_guess, states.keys())
+    guess_file = 'library guess (' + ', '.join('%d: %.2f' % (entry['Id'], weight) for entry, weight in initial_guess.neighbours) + ')'
+
 
 # solve the problem
 # ==========================================================================================================
@@ -223,11 +129,25 @@ elif guess_type == 'saved':
 start_time = time.time()
 
 # run problem
-dm.run_problem(p)
+if grid_sequencing:
+    solveGridSequence(p, coloring_cache=coloring_cache, plan_solvers=plan_solvers)
+else:
+    dm.run_problem(p)
+
 
+# add the converged solution to the library. Status 0 is a successful exit of SLSQP
+if library_dir is not None and p.driver.result.status == 0:
+    SolutionLibrary(library_dir).add(p, phases, design_params.keys(), states.keys(), missionFeatures(rocket, ha, hp_min),
+                                     glow=p.get_val('traj.lift_off.timeseries.states:m')[0][0], njev=p.driver.result.njev)
 
-# post processing
+
+# post processing. The reports and plots are imported only here so that they are not loaded before solving
 # ==========================================================================================================
+from writeReport import writeReport, updateVehicle
+from writeBatchReport import writeBatchReport
+from plotState_sim import plotState
+from trajectoryStore import gatherResults, addCoastResults, writeTrajectory
+
 # update vehicle with the results from the optimization
 rocket = updateVehicle(p, rocket)
 
@@ -236,17 +156,26 @@ rocket = updateVehicle(p, rocket)
 writeBatchReport('0', p,  start_time)
 writeReport('0', p, guess_file, rocket, design_params.keys(), constraints_str, traj_phase_duration.keys() , start_time, ha, hp_min, False)
 
+# post-optimal sensitivity to the mission parameters
+if mission_sensitivity:
+    from postOptimality import missionSensitivity, sensitivityReport
+    with open('results/sensitivityReport.txt', 'w') as file:
+        file.write(sensitivityReport(missionSensitivity(p)) + '\n')
+
 # check partials
 std_out = open("results/std_out.txt","w")
 p.check_partials(method='cs', compact_print=True, show_only_incorrect=True, out_stream=std_out)
 std_out.close()
 
-# Get the explicitly simulated results, plot and save trajectory to txt file
+# Get the explicitly simulated results, plot and save trajectory to a .npz file (see trajectoryStore.py)
 try:
+    setBurnoutEvents(p, phases)
     exp_out = traj.simulate()
-    plotState(p,earth,phases,exp_out, False, True, '0') 
-    plotState(p,earth,phases,exp_out, True, False, '0')
-    saveTraj(p, phases, exp_out, True, earth)
+    store = gatherResults(p, phases, exp_out)
+    plotState(store, earth, False, True, '0')
+    store = addCoastResults(store, earth)
+    plotState(store, earth, True, False, '0')
+    writeTrajectory(store, 'results/trajectory_state_history.npz')
 except:
     print('An error ocurred during the simulaton of the  results')
 
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 20:05:47 2026
+
+This code maps the GLOW of the optimized vehicle over a grid of payload masses (md) and heights at
+apogee (ha) by continuation. Every point of the grid is warm started from the converged solution of
+its neighbour, read with importInitialGuess from the snapshot written when the neighbour converged.
+
+The grid is walked in two stages, starting from the point closest to the mission of the initial guess:
+
+    1. spine: two branches along ha (up and down) at the payload of the initial guess
+    2. rows:  two branches along md (up and down) for every ha, starting from the spine point of the row
+
+The branches of each stage are independent and run in a pool of worker processes. A worker builds the
+openmdao problem of a height at apogee once and reuses it for the following points with the same ha.
+The payload mass is an input of the model (mission_params.md), so it is changed without a new setup.
+
+If a point does not converge, the next point of its branch is warm started from the last converged one.
+
+For every point the snapshot of the converged solution is written in out_dir (md_<md>kg_ha_<ha>km.npz).
+Every point is appended to out_dir/sweepReport.txt as soon as its branch finishes, and the GLOW map is
+written to out_dir/glow_map.npz at the end.
+
+@author: jorge
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import dymos as dm
+
+from celestialBodies import Earth
+from vehicles import TSTO
+from importInitialGuess import importInitialGuess, readGuessFile, writeGuessSnapshot
+
+from defineProblem import defineProblem
+
+
+# problem of the worker process. It is rebuilt by getProblem when the height at apogee changes
+_worker = {}
+
+def initWorker(earth, rocket, hp_min):
+    "This function stores the arguments used to build the problems of a worker process"
+
+    _worker['args'] = (earth, rocket, hp_min)
+    _worker['ha']   = None
+
+def getProblem(ha):
+    "This function returns the problem of the worker for the height at apogee ha. It is built only if ha changes"
+
+    if _worker['ha'] != ha:
+        earth, rocket, hp_min = _worker['args']
+
+        # the n2 checks are not run in the workers. All of them would write to the same file
+        p, traj, phases, design_params, traj_phase_duration, constraints_str, states = defineProblem(earth, rocket, ha, hp_min, check=False)
+
+        _worker['ha']            = ha
+        _worker['p']             = p
+        _worker['phases']        = phases
+        _worker['design_params'] = design_params
+        _worker['states']        = states
+
+    return _worker['p']
+
+def pointFile(out_dir, md, ha):
+    "This function returns the name of the snapshot of the point (md, ha) of the grid"
+
+    return os.path.join(out_dir, 'md_%.0fkg_ha_%.0fkm.npz' % (md, ha / 1e3))
+
+def runPoint(md, ha, guess_file, out_dir):
+    "This function optimizes the vehicle for the mission (md, ha) warm started from guess_file, in a worker process"
+
+    start_time = time.time()
+
+    result = {'md':md, 'ha':ha, 'cost':None, 'njev':0, 'nfev':0, 'status':'error',
+              'warm_start':guess_file, 'guess_file':None}
+
+    # a point that can not be setup or warm started (i.e. an unreadable snapshot) is recorded as an error,
+    # so that it does not abort the sweep
+    try:
+        p = getProblem(ha)
+
+        p = importInitialGuess(p, _worker['phases'], _worker['design_params'].keys(), readGuessFile(guess_file),
+                               _worker['states'].keys())
+        p.set_val('mission_params.md', md)
+
+        dm.run_problem(p)
+    except Exception as error:
+        print('Point md = %.0f kg, ha = %.0f km failed: %s' % (md, ha / 1e3, error))
+    else:
+        result['cost']   = round( p.get_val('traj.lift_off.timeseries.states:m')[0][0] / 1e3 , 2)
+        result['njev']   = p.driver.result.njev
+        result['nfev']   = p.driver.result.nfev
+        result['status'] = p.driver.result.status
+
+        # the snapshot of the converged point is the warm start of its neighbours
+        if result['status'] == 0:
+            result['guess_file'] = pointFile(out_dir, md, ha)
+            writeGuessSnapshot(p, result['guess_file'], _worker['phases'], _worker['design_params'].keys(),
+                               _worker['states'].keys())
+
+    result['opt_time'] = round(time.time() - start_time, 2)
+
+    return result
+
+def runBranch(points, guess_file, out_dir):
+    "This function runs the points (md, ha) of a branch in order. Every point is warm started from the last converged one"
+
+    results = []
+
+    for md, ha in points:
+        result = runPoint(md, ha, guess_file, out_dir)
+        results.append(result)
+
+        if result['status'] == 0:
+            guess_file = result['guess_file']
+
+    return results
+
+def spineBranches(n_ha, i0, j0):
+    "This function returns the branches (lists of grid indices (i, j)) along ha that start at the point (i0, j0)"
+
+    branches = [[(i, j0) for i in range(i0, n_ha)],
+                [(i, j0) for i in range(i0 - 1, -1, -1)]]
+
+    return [branch for branch in branches if branch]
+
+def rowBranches(n_md, i, j0):
+    "This function returns the branches (lists of grid indices (i, j)) along md of the row i that start next to the spine point (i, j0)"
+
+    branches = [[(i, j) for j in range(j0 + 1, n_md)],
+                [(i, j) for j in range(j0 - 1, -1, -1)]]
+
+    return [branch for branch in branches if branch]
+
+def writeSweepReportHeader(out_dir):
+    "This function creates a new sweepReport.txt file with the header of the columns"
+
+    with open(os.path.join(out_dir, 'sweepReport.txt'), 'w') as file:
+        file.write('md, ha, cost, opt_time, njev, nfev, status, warm_start \n')
+
+def writeSweepReportLine(out_dir, result):
+    "This function appends the result of one point to sweepReport.txt"
+
+    with open(os.path.join(out_dir, 'sweepReport.txt'), 'a') as file:
+        file.write('%.1f, %.1f, %s, %s, %s, %s, %s, %s\n' % (result['md'], result['ha'], result['cost'], result['opt_time'],
+                                                           result['njev'], result['nfev'], result['status'],
+                                                           result['warm_start']))
+
+def runSweep(earth, rocket, hp_min, md_values, ha_values, guess_file, reference, n_workers=None,
+             out_dir='results/sweep'):
+    " This function maps the GLOW over the grid md_values x ha_values by continuation from guess_file, converged for"
+    " the mission reference = (md, ha). It returns the results of every point and writes the GLOW map (ton) to out_dir/glow_map.npz"
+
+    md_values = np.asarray(md_values, dtype=float)
+    ha_values = np.asarray(ha_values, dtype=float)
+
+    os.makedirs(out_dir, exist_ok=True)
+    writeSweepReportHeader(out_dir)
+
+    # point of the grid closest to the mission of the initial guess
+    i0 = int(np.argmin(np.abs(ha_values - reference[1])))
+    j0 = int(np.argmin(np.abs(md_values - reference[0])))
+
+    glow   = np.full((len(ha_values), len(md_values)), np.nan)
+    status = np.full((len(ha_values), len(md_values)), -1)
+
+    results     = []
+    guess_files = {}
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=initWorker,
+                             initargs=(earth, rocket, hp_min)) as executor:
+
+        # 1. spine along ha. 2. rows along md, the rows whose spine point did not converge start from guess_file
+        for stage in ['spine', 'rows']:
+
+            if stage == 'spine':
+                branches = [(branch, guess_file) for branch in spineBranches(len(ha_values), i0, j0)]
+            else:
+                branches = [(branch, guess_files.get((i, j0), guess_file)) for i in range(len(ha_values))
+                            for branch in rowBranches(len(md_values), i, j0)]
+
+            futures = {executor.submit(runBranch, [(md_values[j], ha_values[i]) for i, j in branch],
+                                       branch_guess, out_dir): branch for branch, branch_guess in branches}
+
+            for future in as_completed(futures):
+                for (i, j), result in zip(futures[future], future.result()):
+                    results.append(result)
+                    writeSweepReportLine(out_dir, result)
+
+                    if result['status'] == 0:
+                        glow[i, j]        = result['cost']
+                        status[i, j]      = 0
+                        guess_files[i, j] = result['guess_file']
+
+    np.savez(os.path.join(out_dir, 'glow_map.npz'), md=md_values, ha=ha_values, glow=glow, status=status)
+
+    return results
+
+
+if __name__ == '__main__':
+
+    # Initialize earth
+    earth = Earth()
+
+    # initialize TSTO(md, mplf, mass_aux_1, nb_e_first_stage, nb_e_second_stage, centralBody)
+    rocket = TSTO(11e3 , 1.9e3, 3e3, 9 , 1, 0.64, 0.64,  earth)
+
+    # min height at perigee(m)
+    hp_min = 145e3
+
+    # grid of payload masses (kg) and heights at apogee (m)
+    md_values = np.linspace(6e3, 15e3, 10)
+    ha_values = np.linspace(250e3, 700e3, 10)
+
+    start_time = time.time()
+
+    results = runSweep(earth, rocket, hp_min, md_values, ha_values, guess_file='initial_guess/F9_11Ton_400km.db',
+                       reference=(11e3, 400e3))
+
+    converged = [result for result in results if result['status'] == 0]
+    print('Sweep finished in ' + str(round(time.time() - start_time, 2)) + ' s. ' +
+          str(len(converged)) + ' / ' + str(len(results)) + ' points converged')
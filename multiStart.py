@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:40:03 2026
+
+This code runs a batch of optimizations of the TSTO launch vehicle from randomized
+initial guesses (multi-start). The 'semi-random' and 'random' initial guesses converge
+only a fraction of the time, so several starts are needed to find the global minimum.
+
+The starts are distributed over a pool of worker processes. Each worker builds the
+openmdao problem once and reuses it for all the starts it runs. The results are written
+to results/BatchOptReport.txt as soon as each start finishes.
+
+The batch stops early once n_agree converged designs have a GLOW within glow_tol of the
+best converged design. The starts that are still waiting in the queue are cancelled.
+
+@author: jorge
+"""
+
+import time
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import dymos as dm
+
+from celestialBodies import Earth
+from vehicles import TSTO
+from importInitialGuess import importInitialGuess_manualInput, importInitialGuess_random
+from writeBatchReport import writeBatchReportHeader, writeBatchReportLine
+
+from defineProblem import defineProblem
+
+
+# problem of the worker process. It is built once by initWorker
+_worker = {}
+
+def initWorker(earth, rocket, ha, hp_min):
+    "This function builds the openmdao problem of a worker process"
+
+    # the n2 checks are not run in the workers. All of them would write to the same file
+    p, traj, phases, design_params, traj_phase_duration, constraints_str, states = defineProblem(earth, rocket, ha, hp_min, check=False)
+
+    _worker['p']                   = p
+    _worker['phases']              = phases
+    _worker['design_params']       = design_params
+    _worker['traj_phase_duration'] = traj_phase_duration
+    _worker['states']              = states
+
+def runStart(Id, seed, guess_type):
+    "This function runs one optimization from a randomized initial guess in a worker process"
+
+    p = _worker['p']
+
+    random.seed(seed)
+
+    # importInitialGuess_manualInput pops the phase durations from design_params. Use copies
+    design_params       = dict(_worker['design_params'])
+    traj_phase_duration = dict(_worker['traj_phase_duration'])
+
+    if guess_type == 'semi-random':
+        p = importInitialGuess_manualInput(p, _worker['phases'], design_params, traj_phase_duration, _worker['states'], True)
+
+    elif guess_type == 'random':
+        p = importInitialGuess_random(p, _worker['phases'], design_params, traj_phase_duration, _worker['states'])
+
+    else:
+        raise ValueError('guess_type must be "semi-random" or "random", not "%s"' % guess_type)
+
+    start_time = time.time()
+
+    result = {'Id':Id, 'seed':seed, 'cost':None, 'njev':0, 'nfev':0, 'status':'error', 'design_vars':{}}
+
+    try:
+        dm.run_problem(p)
+    except Exception as error:
+        print('Start ' + str(Id) + ' failed: ' + str(error))
+    else:
+        result['cost']   = round( p.get_val('traj.lift_off.timeseries.states:m')[0][0] / 1e3 , 2)
+        result['njev']   = p.driver.result.njev
+        result['nfev']   = p.driver.result.nfev
+        result['status'] = p.driver.result.status
+        result['design_vars'] = {key: p.get_val(key).copy() for key in p.model.get_design_vars()}
+
+    result['opt_time'] = round(time.time() - start_time, 2)
+
+    return result
+
+def checkAgreement(results, n_agree, glow_tol):
+    "This function returns True when n_agree converged results have a GLOW within glow_tol (kg) of the best converged result"
+
+    # status 0 is a successful exit of SLSQP
+    costs = [result['cost'] for result in results if result['status'] == 0]
+
+    if len(costs) < n_agree:
+        return False
+
+    best = min(costs)
+    # the costs are written in tons
+    return sum(cost - best <= glow_tol / 1e3 for cost in costs) >= n_agree
+
+def runMultiStart(earth, rocket, ha, hp_min, n_starts, guess_type='semi-random', n_workers=None,
+                  n_agree=3, glow_tol=100.0, seed=0):
+    "This function runs n_starts optimizations in a pool of n_workers processes and returns the results sorted by GLOW."
+    " The batch stops once n_agree converged designs agree on the GLOW within glow_tol (kg)"
+
+    # the seeds of the starts are generated in advance. A start can be repeated from its seed
+    rng   = random.Random(seed)
+    seeds = [rng.randrange(2**32) for i in range(n_starts)]
+
+    writeBatchReportHeader()
+
+    results = []
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=initWorker,
+                             initargs=(earth, rocket, ha, hp_min)) as executor:
+
+        futures = [executor.submit(runStart, Id + 1, seeds[Id], guess_type) for Id in range(n_starts)]
+
+        stop = False
+        for future in as_completed(futures):
+
+            if future.cancelled():
+                continue
+
+            result = future.result()
+            results.append(result)
+
+            writeBatchReportLine(result['Id'], result['cost'], result['opt_time'],
+                                 result['njev'], result['nfev'], result['status'])
+
+            # cancel the starts that have not begun. The running ones are still recorded
+            if not stop and checkAgreement(results, n_agree, glow_tol):
+                stop = True
+                for pending in futures:
+                    pending.cancel()
+
+    converged = [result for result in results if result['status'] == 0]
+    failed    = [result for result in results if result['status'] != 0]
+
+    return sorted(converged, key=lambda result: result['cost']) + failed
+
+
+if __name__ == '__main__':
+
+    # Initialize earth
+    earth = Earth()
+
+    # initialize TSTO(md, mplf, mass_aux_1, nb_e_first_stage, nb_e_second_stage, centralBody)
+    rocket = TSTO(11e3 , 1.9e3, 3e3, 9 , 1, 0.64, 0.64,  earth)
+
+    # orbit objectives
+    ha     = 400e3  # height at apogee(m)
+    hp_min = 145e3  # min height at perigee(m)
+
+    start_time = time.time()
+
+    results = runMultiStart(earth, rocket, ha, hp_min, n_starts=32, guess_type='semi-random',
+                            n_agree=3, glow_tol=100.0, seed=0)
+
+    print('Multi-start finished in ' + str(round(time.time() - start_time, 2)) + ' s')
+    print('Best start: Id ' + str(results[0]['Id']) + ', seed ' + str(results[0]['seed']) + ', GLOW ' + str(results[0]['cost']) + ' ton')
@@ -2,65 +2,32 @@
 """
 Created on Wed Sep  9 14:51:56 2020
 
+The plots read the results from the store of trajectoryStore.py
+
 @author: jorge
 """
 
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.integrate import solve_ivp
-import json
 
-from Propagate_coast_phase import propagate_coast
+from trajectoryStore import addCoastResults, phaseEndIndex
 
 plt.rcParams.update({'font.size': 16})
 
-def saveTraj(p, phases, exp_out, plot_coast, earth):
-    "This function saves the state and load history in a txt file"
-    
-    # merge results
-    # ============================================================================================
-    results, results_sim = mergeResults(p, phases, exp_out)
-    
-    # add coast phase results and define time limits
-    # ============================================================================================
-    if plot_coast == True:
-        results_sim = addCoastResults(results_sim, earth)
-
-    # convert np.arrays into lists
-    for key, value in results.items():
-        results[key] = value.tolist()
-        
-    # convert np.arrays into lists
-    for key, value in results_sim.items():
-        results_sim[key] = value.tolist()
-        
-    # write json file
-    exDict = {'resultsDict': results,
-              'results_simDict':results_sim}
-    
-    with open('results/trajectory_state_history.txt', 'w') as file:
-         file.write(json.dumps(exDict)) 
-         
-         
-    # to read it use the following code
-    # ===========================================================================================
-    # obj_text = codecs.open('results/trajectory_state_history.txt', 'r', encoding='utf-8').read()
-    # b_new = json.loads(obj_text)
-    # a_new = np.array(b_new)
-
-def plotState(p,earth,phases,exp_out, plot_coast, plot_loads, Id):
-    "This function plots the states and the loads of the optimal trajectory"
+def plotState(store, earth, plot_coast, plot_loads, Id):
+    "This function plots the states and the loads of the optimal trajectory from the store of the results"
     # if plot_coast == True: propagates the coast phase of the second stage and plots it
     # if plot_loads == True: plot Mach, q_heat, q_dyn and load factor
     
-    # merge results
-    # ============================================================================================
-    results, results_sim = mergeResults(p, phases, exp_out)
-        
     # add coast phase results and define time limits
     # ============================================================================================
+    if plot_coast == True and 'coast' not in store['phases']['results_sim']:
+        store = addCoastResults(store, earth)
+    
+    results     = store['results']
+    results_sim = store['results_sim']
+    
     if plot_coast == True:
-        results_sim = addCoastResults(results_sim, earth)
         t_coast = 3800 # define time to ploat coast phase
     elif plot_coast == False:
         t_coast = results['time'][-1] + 20 
@@ -70,10 +37,10 @@ def plotState(p,earth,phases,exp_out, plot_coast, plot_loads, Id):
         
     # find index and time for first stage jettison and fairing jettison
     # ============================================================================================
-    stageJetisson_idx = np.where(results['r'] == p.get_val('traj.gravity_turn_b.timeseries.states:r')[-1])[0][0]
-    plfJetisson_idx   = np.where(results['r'] == p.get_val('traj.exoatmos_a.timeseries.states:r')[-1])[0][0]
-    stageJetisson_t   = p.get_val('traj.gravity_turn_b.timeseries.time')[-1]
-    plfJetisson_t     = p.get_val('traj.exoatmos_a.timeseries.time')[-1]
+    stageJetisson_idx = phaseEndIndex(store, 'gravity_turn_b')
+    plfJetisson_idx   = phaseEndIndex(store, 'exoatmos_a')
+    stageJetisson_t   = results['time'][stageJetisson_idx]
+    plfJetisson_t     = results['time'][plfJetisson_idx]
         
     
     # plot states
@@ -200,135 +167,3 @@ def plotState(p,earth,phases,exp_out, plot_coast, plot_loads, Id):
         plt.savefig('results/' + str(Id) + '_load_history.png')
         
         # ============================================================================================
-           
-
-def mergeResults(p, phases, exp_out):
-    "This function merges the results of each phase and returns them in dictionaries"
-    
-    # define empty numpy arrays to store variables
-    # ===================================================================================================
-    time  = time_sim = np.zeros(0)
-    r     = r_sim    = np.zeros(0)
-    la    = la_sim   = np.zeros(0)
-    v     = v_sim    = np.zeros(0)
-    ph    = ph_sim   = np.zeros(0)
-    m     = m_sim    = np.zeros(0)
-    th    = th_sim   = np.zeros(0)
-    
-    rho    = np.zeros(0)
-    mach   = np.zeros(0)
-    Cd     = np.zeros(0)
-    q_dyn  = np.zeros(0)
-    q_heat = np.zeros(0)
-    n_f    = np.zeros(0)
-    
-    g      = np.zeros(0)
-    thrust = np.zeros(0)
-    
-    throttle = np.zeros(0)
-    
-    # loop through phases to store values in the same array
-    # ==================================================================================================
-    for phase in phases:
-        call_str = 'traj.' + phase + '.timeseries'
-    
-        time     = np.append( time     ,       p.get_val(call_str + '.time') )
-        time_sim = np.append( time_sim , exp_out.get_val(call_str + '.time') )
-        
-        r        = np.append( r        ,       p.get_val(call_str + '.states:r') )
-        r_sim    = np.append( r_sim    , exp_out.get_val(call_str + '.states:r') )
-        
-        la       = np.append( la       ,       p.get_val(call_str + '.states:lambda') )
-        la_sim   = np.append( la_sim   , exp_out.get_val(call_str + '.states:lambda') )
-        
-        v        = np.append( v        ,       p.get_val(call_str + '.states:v') )
-        v_sim    = np.append( v_sim    , exp_out.get_val(call_str + '.states:v') )
-        
-        ph       = np.append( ph       ,       p.get_val(call_str + '.states:phi') )
-        ph_sim   = np.append( ph_sim   , exp_out.get_val(call_str + '.states:phi') )
-        
-        m        = np.append( m        ,       p.get_val(call_str + '.states:m') )
-        m_sim    = np.append( m_sim    , exp_out.get_val(call_str + '.states:m') )
-        
-        g        = np.append( g        ,       p.get_val(call_str + '.g'))
-        
-        thrust   = np.append( thrust   ,       p.get_val(call_str + '.thrust'))
-        
-        throttle = np.append( throttle ,       p.get_val(call_str + '.controls:throttle'))
-        
-        if phase == 'lift_off':
-            th     = np.append( th     ,       p.get_val(call_str + '.input_parameters:theta'))
-            th_sim = np.append( th_sim , exp_out.get_val(call_str + '.input_parameters:theta'))
-        else:
-            th     = np.append( th     ,       p.get_val(call_str + '.theta'))
-            th_sim = np.append( th_sim , exp_out.get_val(call_str + '.theta'))
-            
-        rho      = np.append( rho      ,       p.get_val(call_str + '.rho'))
-        mach     = np.append( mach     ,       p.get_val(call_str + '.Mach'))
-        Cd       = np.append( Cd       ,       p.get_val(call_str + '.Cd'))
-        q_dyn    = np.append( q_dyn    ,       p.get_val(call_str + '.q_dyn'))
-        q_heat   = np.append( q_heat   ,       p.get_val(call_str + '.q_heat'))
-        n_f      = np.append( n_f      ,       p.get_val(call_str + '.n_f'))
-    
-    # build dictionaries
-    # ==================================================================================================
-        
-    results = {'time'     : time,
-              'r'        : r,
-              'la'       : la,
-              'v'        : v,
-              'ph'       : ph,
-              'm'        : m,
-              'g'        : g,
-              'thrust'   : thrust,
-              'throttle' : throttle,
-              'th'       : th,
-              'rho'      : rho,
-              'mach'     : mach,
-              'Cd'       : Cd,
-              'q_dyn'    : q_dyn,
-              'q_heat'   : q_heat,
-              'n_f'      : n_f}
-    
-    results_sim = {'time'     : time_sim,
-                  'r'        : r_sim,
-                  'la'       : la_sim,
-                  'v'        : v_sim,
-                  'ph'       : ph_sim,
-                  'm'        : m_sim,
-                  'th'       : th_sim}
-    
-    return results, results_sim
-
-def addCoastResults(results_sim, earth):
-    " This function uses a Runge Kutta method to progate the second state  coast phase and appends the results"
-    
-    r_0   = results_sim['r'][-1]
-    v_rel = results_sim['v'][-1]
-    v_0   = v_rel - (r_0 - earth.r0) * earth.angularSpeed
-    m_0   = results_sim['m'][-1]
-    la_0  = results_sim['la'][-1]
-    ph_0  = results_sim['ph'][-1]
-    
-    y0 = [r_0 , v_0 , m_0 , la_0 , ph_0]
-    
-    # Time parameters
-    ti = results_sim['time'][-1]                                     
-    tf_max = 60*100  + ti                       
-    t_span = (ti,tf_max)
-    
-    # simulation parameters
-    max_step = 0.1
-
-    # Solve ODE Systemd
-    coast_sol = solve_ivp( lambda t,y:propagate_coast(t,y,earth), t_span , y0, method='RK45', dense_output=True, max_step = max_step, rtol=1e-4 )  
-
-    results_sim['r']    = np.append(results_sim['r'] ,   coast_sol.y[0,:])
-    results_sim['v']    = np.append(results_sim['v'] ,   coast_sol.y[1,:])
-    results_sim['m']    = np.append(results_sim['m'] ,   coast_sol.y[2,:])
-    results_sim['la']   = np.append(results_sim['la'],   coast_sol.y[3,:])
-    results_sim['ph']   = np.append(results_sim['ph'],   coast_sol.y[4,:])
-    results_sim['time'] = np.append(results_sim['time'], coast_sol.t)
-    results_sim['th']   = np.append(results_sim['th'],   coast_sol.y[4,:])
-    
-    return results_sim
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 18:40:12 2026
+
+Post-optimal sensitivity of the optimized vehicle to the mission parameters.
+
+At the optimum the gradient of the objective is balanced by the active constraints:
+
+    grad_f + A^T lambda = 0
+
+where A are the total derivatives of the active constraints (and of the design variables at their
+bounds) w.r.t. the design variables. The multipliers lambda are the least squares solution of this
+system, computed from the total derivatives of the driver at the converged design.
+
+The derivative of the optimum f* w.r.t. a mission parameter p is the derivative of the Lagrangian:
+
+    df*/dp = df/dp + lambda^T dg/dp
+
+  - md and mplf are inputs of the model (mission_params). dg/dp are their total derivatives.
+  - ha and hp_min are bounds of the constraints ra and rp. dg/dp = - d bound / dp.
+
+The first-order update of the design variables is the solution of the derivative of the KKT
+conditions w.r.t. p, with the Hessian H of the Lagrangian and the active constraints kept satisfied:
+
+    [H  A^T] [dx/dp     ]     [d grad_L / dp]
+    [A   0 ] [dlambda/dp] = - [dg/dp        ]
+
+H and d grad_L / dp are computed by finite differences of the total derivatives, one evaluation per
+design variable and per input parameter (hessian=True). Without the Hessian the update is the
+minimum norm step that keeps the active constraints satisfied, dx/dp = - pinv(A) dg/dp. It depends on
+the scaling of the design variables and ignores the curvature of the objective, so it is only an
+estimate for a warm start, exact only when the active constraints fix the design variables.
+
+Everything is computed in the scaled space of the driver. A what-if of the objective costs one
+evaluation of the total derivatives instead of a full optimization.
+
+@author: jorge
+"""
+
+import numpy as np
+
+
+# mission parameters that are inputs of the model and their source
+input_params = {'md'  : 'mission_params.md',
+                'mplf': 'mission_params.mplf'}
+
+# mission parameters that are bounds of constraints. End of the name of the constraint and derivative of its bounds
+bound_params = {'ha'    : ('orbitalParameters.apogeeAndPerigee.ra', 1.0),
+                'hp_min': ('orbitalParameters.apogeeAndPerigee.rp', 1.0)}
+
+def _scaling(meta):
+    "This function returns the scaler and adder of a design variable or response"
+
+    scaler = 1.0 if meta['scaler'] is None else meta['scaler']
+    adder  = 0.0 if meta['adder']  is None else meta['adder']
+
+    return scaler * np.ones(meta['size']), adder * np.ones(meta['size'])
+
+def _isActive(value, meta, active_tol):
+    "This function returns the mask of the active entries of a constraint or design variable"
+
+    value = np.atleast_1d(value).ravel()
+
+    if meta.get('equals') is not None:
+        return np.ones(value.shape, dtype=bool)
+
+    return (np.abs(value - meta['lower']) <= active_tol) | (np.abs(value - meta['upper']) <= active_tol)
+
+def _designVarValues(driver):
+    "This function returns the values of the design variables of the driver in physical units"
+
+    x = {}
+    for name, value in driver.get_design_var_values().items():
+        scaler, adder = _scaling(driver._designvars[name])
+        x[name] = np.array(value, dtype=float).ravel() / scaler - adder
+
+    return x
+
+def _setDesignVars(driver, x, dv_names, sizes):
+    "This function sets the flat vector x of the scaled design variables dv_names in the driver"
+
+    offset = 0
+    for name in dv_names:
+        driver.set_design_var(name, x[offset:offset + sizes[name]])
+        offset += sizes[name]
+
+def _lagrangianHessian(p, of, dv_names, sizes, n_obj, active_rows, multipliers, input_params, fd_step):
+    "This function returns the Hessian of the Lagrangian w.r.t. the scaled design variables and the derivatives of its"
+    " gradient w.r.t. the input parameters (physical units), by forward differences of the total derivatives"
+
+    driver = p.driver
+
+    def gradient():
+        p.run_model()
+        J_x = driver._compute_totals(of=of, wrt=dv_names, return_format='array')
+        return J_x[:n_obj].sum(axis=0) + J_x[n_obj:][active_rows].T @ multipliers
+
+    x0 = np.concatenate([np.array(driver.get_design_var_values()[name], dtype=float).ravel() for name in dv_names])
+    grad_0 = gradient()
+
+    H = np.zeros((x0.size, x0.size))
+    for i in range(x0.size):
+        x = x0.copy()
+        x[i] += fd_step
+        _setDesignVars(driver, x, dv_names, sizes)
+        H[:, i] = (gradient() - grad_0) / fd_step
+
+    _setDesignVars(driver, x0, dv_names, sizes)
+
+    C_p = np.zeros((x0.size, len(input_params)))
+    for j, src in enumerate(input_params.values()):
+        value = np.array(p.get_val(src), dtype=float, copy=True)
+        h = fd_step * max(1.0, np.max(np.abs(value)))
+        p.set_val(src, value + h)
+        C_p[:, j] = (gradient() - grad_0) / h
+        p.set_val(src, value)
+
+    p.run_model()
+
+    # the Hessian of a smooth Lagrangian is symmetric
+    return 0.5 * (H + H.T), C_p
+
+def missionSensitivity(p, input_params=input_params, bound_params=bound_params, active_tol=1e-4, hessian=False,
+                       fd_step=1e-6):
+    " This function computes the sensitivity of the converged problem p to the mission parameters"
+    " It returns a dictionary with the objective, its derivatives (physical units) dobj/dparam, the first-order"
+    " update of the design variables dx/dparam (physical units), the multipliers and the residual of the KKT system"
+    " If hessian == True dx/dparam is solved from the KKT system with the Hessian of the Lagrangian computed by"
+    " finite differences (one evaluation of the total derivatives per design variable). Otherwise it is the"
+    " minimum norm step that keeps the active constraints satisfied, an estimate that depends on the scaling"
+
+    driver = p.driver
+
+    obj_names = list(driver._objs)
+    con_names = list(driver._cons)
+    dv_names  = list(driver._designvars)
+    of        = obj_names + con_names
+
+    sizes = {name: meta['size'] for name, meta in driver._responses.items()}
+    sizes.update({name: meta['size'] for name, meta in driver._designvars.items()})
+
+    # total derivatives w.r.t. the design variables (scaled) and w.r.t. the parameters (physical)
+    J_x = driver._compute_totals(of=of, wrt=dv_names, return_format='array')
+
+    J_p = np.zeros((J_x.shape[0], 0))
+    if input_params:
+        J_p = p.compute_totals(of=of, wrt=list(input_params.values()), return_format='array')
+
+    # scale the rows of the parameters as the responses
+    r_scaler = np.concatenate([_scaling(driver._responses[name])[0] for name in of])
+    J_p = J_p * r_scaler[:, np.newaxis]
+
+    # bound parameters. g = c - bound
+    J_b = np.zeros((J_x.shape[0], len(bound_params)))
+    start = {}
+    offset = 0
+    for name in of:
+        start[name] = offset
+        offset += sizes[name]
+
+    for j, (param, (con_end, dbound)) in enumerate(bound_params.items()):
+        matches = [name for name in con_names if name.endswith(con_end)]
+        if len(matches) != 1:
+            raise ValueError('The constraint of the mission parameter ' + param + ' (' + con_end + ') was not found')
+
+        name = matches[0]
+        J_b[start[name]:start[name] + sizes[name], j] = -r_scaler[start[name]:start[name] + sizes[name]] * dbound
+
+    params = list(input_params) + list(bound_params)
+    J_p = np.hstack([J_p, J_b])
+
+    n_obj  = sum(sizes[name] for name in obj_names)
+    grad_f = J_x[:n_obj].sum(axis=0)
+    df_dp  = J_p[:n_obj].sum(axis=0)
+
+    # active constraints and design variables at their bounds
+    con_values = driver.get_constraint_values()
+    active_con = np.concatenate([_isActive(con_values[name], driver._cons[name], active_tol) for name in con_names])
+
+    dv_values = driver.get_design_var_values()
+    active_dv = np.concatenate([_isActive(dv_values[name], driver._designvars[name], active_tol) for name in dv_names])
+
+    A   = np.vstack([J_x[n_obj:][active_con], np.eye(J_x.shape[1])[active_dv]])
+    G_p = np.vstack([J_p[n_obj:][active_con], np.zeros((active_dv.sum(), len(params)))])
+
+    # multipliers and derivatives of the optimum (scaled)
+    multipliers = np.linalg.lstsq(A.T, -grad_f, rcond=None)[0]
+    kkt_residual = np.linalg.norm(grad_f + A.T @ multipliers)
+
+    dobj_dp = df_dp + multipliers @ G_p
+
+    if hessian:
+        n_con = int(active_con.sum())
+        H, C_p = _lagrangianHessian(p, of, dv_names, sizes, n_obj, active_con, multipliers[:n_con],
+                                    input_params, fd_step)
+
+        # the bound parameters do not change the gradient of the Lagrangian
+        C_p = np.hstack([C_p, np.zeros((H.shape[0], len(bound_params)))])
+
+        K = np.block([[H, A.T], [A, np.zeros((A.shape[0], A.shape[0]))]])
+        dx_dp = -np.linalg.lstsq(K, np.vstack([C_p, G_p]), rcond=None)[0][:H.shape[0]]
+    else:
+        dx_dp = -np.linalg.lstsq(A, G_p, rcond=None)[0]
+
+    # back to physical units
+    obj_scaler = _scaling(driver._objs[obj_names[0]])[0][0]
+    dv_scaler  = np.concatenate([_scaling(driver._designvars[name])[0] for name in dv_names])
+
+    dx_dp = dx_dp / dv_scaler[:, np.newaxis]
+
+    dx = {}
+    for j, param in enumerate(params):
+        dx[param] = {}
+        offset = 0
+        for name in dv_names:
+            dx[param][name] = dx_dp[offset:offset + sizes[name], j]
+            offset += sizes[name]
+
+    # multipliers of every constraint. The inactive entries are zero
+    lambda_con = np.zeros(active_con.shape)
+    lambda_con[active_con] = multipliers[:active_con.sum()]
+
+    offset = 0
+    lambdas = {}
+    for name in con_names:
+        lambdas[name] = lambda_con[offset:offset + sizes[name]]
+        offset += sizes[name]
+
+    objective = driver.get_objective_values(driver_scaling=False)[obj_names[0]]
+
+    return {'objective'   : float(np.ravel(objective)[0]),
+            'params'      : params,
+            'dobj'        : {param: dobj_dp[j] / obj_scaler for j, param in enumerate(params)},
+            'dx'          : dx,
+            'multipliers' : lambdas,
+            'n_active'    : int(active_con.sum() + active_dv.sum()),
+            'n_dv'        : J_x.shape[1],
+            'kkt_residual': kkt_residual}
+
+def warmStart(p, sensitivity, delta):
+    " This function returns the first-order estimate of the objective and of the design variables (physical units)"
+    " of a nearby mission. delta is a dictionary with the change of the mission parameters {param: delta}"
+    " The design variables are clipped to their bounds"
+
+    driver = p.driver
+    x = _designVarValues(driver)
+
+    objective = sensitivity['objective']
+    x_new = {name: value.copy() for name, value in x.items()}
+
+    for param, value in delta.items():
+        objective += sensitivity['dobj'][param] * value
+
+        for name in x_new:
+            x_new[name] += sensitivity['dx'][param][name] * value
+
+    for name, meta in driver._designvars.items():
+        scaler, adder = _scaling(meta)
+        x_new[name] = np.clip(x_new[name], meta['lower'] / scaler - adder, meta['upper'] / scaler - adder)
+
+    return objective, x_new
+
+def setWarmStart(p, x):
+    "This function sets the design variables x (physical units) returned by warmStart in the problem p"
+
+    for name, value in x.items():
+        scaler, adder = _scaling(p.driver._designvars[name])
+        p.driver.set_design_var(name, (value + adder) * scaler)
+
+    return p
+
+def sensitivityReport(sensitivity, units={'md': 'kg', 'mplf': 'kg', 'ha': 'm', 'hp_min': 'm'}):
+    "This function returns the derivatives of the objective w.r.t. the mission parameters as a string"
+
+    lines = ['Post-optimal sensitivity of GLOW (%.2f kg)' % sensitivity['objective'],
+             'Active constraints and bounds: %d / %d design variables. KKT residual: %.3e' %
+             (sensitivity['n_active'], sensitivity['n_dv'], sensitivity['kkt_residual'])]
+
+    for param in sensitivity['params']:
+        lines.append(('dGLOW/d' + param).ljust(20) + '%12.4f kg/%s' % (sensitivity['dobj'][param],
+                                                                       units.get(param, '-')))
+
+    return '\n'.join(lines)
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 21:18:09 2026
+
+Library of converged solutions used to build the initial guess of new missions.
+
+Every entry of the library stores the mission (md, mplf, ha, hp_min), the configuration of the
+vehicle (number of engines and auxiliary mass of the first stage) and a compressed snapshot of the
+variables set by importInitialGuess: design parameters, phase durations and states. The normalized
+time (ptau) of the state nodes of every phase is stored with the states, so that they can be
+interpolated onto a different grid.
+
+The initial guess of a new mission is interpolated among the nearest converged entries with the
+same number of engines (inverse distance weighting in the normalized mission space). The states of
+every entry are first interpolated onto the grid of the current problem in normalized time, so the
+phase durations and the states are rescaled together. The guess is set with importInitialGuess.
+
+The index of the library is a json file (index.json) in the directory of the library.
+
+@author: jorge
+"""
+
+import os
+import json
+import tempfile
+
+import numpy as np
+
+from importInitialGuess import guessNames
+
+
+# scale of the distance between missions for every parameter. The number of engines must be the same
+feature_scales = {'md'        : 1e3,     # (kg)
+                  'mplf'      : 1e3,     # (kg)
+                  'ha'        : 100e3,   # (m)
+                  'hp_min'    : 100e3,   # (m)
+                  'mass_aux_1': 1e3}     # (kg)
+
+exact_features = ['nb_e_1', 'nb_e_2']
+
+def missionFeatures(rocket, ha, hp_min):
+    "This function returns the mission and the configuration of the vehicle that identify an entry of the library"
+
+    return {'md'        : float(rocket.md),
+            'mplf'      : float(rocket.mplf),
+            'ha'        : float(ha),
+            'hp_min'    : float(hp_min),
+            'nb_e_1'    : int(rocket.stage_1.nb_e),
+            'nb_e_2'    : int(rocket.stage_2.nb_e),
+            'mass_aux_1': float(rocket.stage_1.mass_aux)}
+
+def statePtau(phase):
+    "This function returns the normalized time of the state nodes of a phase"
+
+    gd = phase.options['transcription'].grid_data
+
+    return gd.node_ptau[gd.subset_node_indices['state_input']]
+
+
+class LibraryGuess():
+    "This class holds the initial guess interpolated from the library. It is read by importInitialGuess"
+
+    def __init__(self, values, neighbours):
+        self.values     = values
+        self.neighbours = neighbours
+
+    def get_val(self, name):
+        return self.values[name]
+
+
+class SolutionLibrary():
+    # indexed library of converged solutions
+
+    def __init__(self, directory='solution_library'):
+        self.directory  = directory
+        self.index_file = os.path.join(directory, 'index.json')
+
+        try:
+            with open(self.index_file, 'r') as file:
+                self.entries = json.load(file)
+        except (OSError, ValueError):
+            self.entries = []
+
+    def _writeIndex(self):
+        "This function writes the index to a temporary file first so that it is never partially written"
+
+        fd, tmp_file = tempfile.mkstemp(dir=self.directory, suffix='.json')
+        with os.fdopen(fd, 'w') as file:
+            json.dump(self.entries, file, indent=1)
+        os.replace(tmp_file, self.index_file)
+
+    def add(self, p, phases, design_params_str, states, features, glow=None, njev=None):
+        "This function adds the solution of the problem p to the library. features is returned by missionFeatures"
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        Id = max([entry['Id'] for entry in self.entries], default=0) + 1
+        file_name = 'solution_%04d.npz' % Id
+
+        # before the final setup openmdao returns the values as they were set, i.e. a float for t_duration
+        values = {name: np.atleast_1d(p.get_val(name)) for name in guessNames(phases, design_params_str, states)}
+        for name, phase in phases.items():
+            values['traj.' + name + '.state_ptau'] = statePtau(phase)
+
+        np.savez_compressed(os.path.join(self.directory, file_name), **values)
+
+        entry = dict(features, Id=Id, file=file_name,
+                     glow=None if glow is None else float(glow),
+                     njev=None if njev is None else int(njev))
+        self.entries.append(entry)
+        self._writeIndex()
+
+        return entry
+
+    def nearest(self, features, k=3):
+        "This function returns the k nearest entries with the same number of engines and their interpolation weights"
+
+        candidates = [entry for entry in self.entries
+                      if all(entry[name] == features[name] for name in exact_features)]
+
+        if not candidates:
+            return []
+
+        distance = np.array([np.sqrt(sum(((entry[name] - features[name]) / scale)**2
+                                         for name, scale in feature_scales.items()))
+                             for entry in candidates])
+
+        order = np.argsort(distance, kind='stable')[:k]
+
+        # an entry of the same mission is used alone
+        if distance[order[0]] == 0.0:
+            return [(candidates[order[0]], 1.0)]
+
+        weights = 1.0 / distance[order]**2
+
+        return [(candidates[i], weight) for i, weight in zip(order, weights / weights.sum())]
+
+    def initialGuess(self, phases, design_params_str, states, features, k=3):
+        "This function interpolates the initial guess of the mission features among the k nearest entries onto the grid of phases"
+
+        neighbours = self.nearest(features, k)
+
+        if not neighbours:
+            raise ValueError('The library has no solution with nb_e_1 = %d and nb_e_2 = %d' %
+                             (features['nb_e_1'], features['nb_e_2']))
+
+        names  = guessNames(phases, design_params_str, states)
+        values = {name: 0.0 for name in names}
+
+        for entry, weight in neighbours:
+            with np.load(os.path.join(self.directory, entry['file'])) as data:
+                for name in names:
+                    value = data[name]
+
+                    # the states are interpolated onto the state nodes of the current grid
+                    if '.states:' in name:
+                        phase = name.split('.')[1]
+                        value = phases[phase].interpolate(xs=data['traj.' + phase + '.state_ptau'], ys=value,
+                                                          nodes='state_input')
+
+                    values[name] = values[name] + weight * value
+
+        return LibraryGuess(values, neighbours)
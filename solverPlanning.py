@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 14:10:31 2026
+
+Structure-aware configuration of the linear solvers of the model.
+
+A DirectSolver at the top of the model factorizes the jacobian of the whole model in every solve of
+the total derivatives. The data flow of the model is mostly feed-forward: external_params feeds the
+propulsion and massSizing modules, which feed the trajectory, which feeds the coupling constraints.
+The couplings between disciplines are closed by the optimizer as constraints, not by connections.
+
+The linear solvers are planned from the connections of the model after setup. For every group the
+direct subsystems are the nodes of a graph and the connections between them are its edges:
+
+  - if every connection goes from a subsystem to a later one in the execution order, one pass of
+    LinearRunOnce gives the exact derivatives. The plan continues in the subgroups.
+  - otherwise (cycles, connections against the execution order, implicit components without their
+    own linear solve or a Newton solver) the group is a coupled block and gets a sparse DirectSolver
+    (assembled jacobian). Its subgroups are solved by it.
+
+In the launch model the coupled blocks are the phases of the trajectory: the states are outputs of
+an implicit component (indep_states) whose linear solve needs the solver of the phase.
+
+planLinearSolvers must be called after the problem is setup and before it is run, and again every
+time the problem is setup (dymos sets a DirectSolver in every phase during setup).
+
+@author: jorge
+"""
+
+import time
+
+import numpy as np
+import networkx as nx
+import openmdao.api as om
+
+
+# nonlinear solvers that solve linear systems of their own group
+newton_solvers = (om.NewtonSolver, om.BroydenSolver)
+
+def childName(prefix, abs_name):
+    "This function returns the name of the direct subsystem of the group with pathname prefix that contains the variable abs_name"
+
+    return abs_name[len(prefix):].split('.')[0]
+
+def connectionGraph(group, connections):
+    "This function returns the directed graph of the connections between the direct subsystems of the group"
+    " connections = {absolute input: absolute output} of the model"
+
+    prefix = group.pathname + '.' if group.pathname else ''
+
+    graph = nx.DiGraph()
+    graph.add_nodes_from(system.name for system in group.system_iter(recurse=False))
+
+    for tgt, src in connections.items():
+        if tgt.startswith(prefix) and src.startswith(prefix):
+            src_system = childName(prefix, src)
+            tgt_system = childName(prefix, tgt)
+            if src_system != tgt_system:
+                graph.add_edge(src_system, tgt_system)
+
+    return graph
+
+def coupledReason(group, graph):
+    "This function returns why the linear system of the group can not be solved with one pass of LinearRunOnce, or None if it can"
+
+    if isinstance(group.nonlinear_solver, newton_solvers):
+        return 'nonlinear solver ' + type(group.nonlinear_solver).__name__
+
+    for system in group.system_iter(recurse=False):
+        if isinstance(system, om.ImplicitComponent) and type(system).solve_linear is om.ImplicitComponent.solve_linear:
+            return 'implicit component ' + system.name
+
+    for component in nx.strongly_connected_components(graph):
+        if len(component) > 1:
+            return 'cycle ' + ', '.join(sorted(component))
+
+    order = {name: i for i, name in enumerate(graph.nodes)}
+    for src, tgt in graph.edges:
+        if order[src] > order[tgt]:
+            return 'feedback ' + src + ' -> ' + tgt
+
+    return None
+
+def planLinearSolvers(p, assemble_jac=True, apply=True):
+    "This function sets LinearRunOnce in the feed-forward groups and a sparse DirectSolver in the coupled blocks of the setup problem p"
+    " It returns the plan {group pathname: reason of the DirectSolver or None}. If apply == False the solvers are not changed"
+
+    connections = p.model._conn_global_abs_in2out
+    plan = {}
+
+    def planGroup(group):
+        reason = coupledReason(group, connectionGraph(group, connections))
+        plan[group.pathname] = reason
+
+        if reason is not None:
+            if apply:
+                group.linear_solver = om.DirectSolver(assemble_jac=assemble_jac)
+            return
+
+        if apply:
+            group.linear_solver = om.LinearRunOnce()
+        for subgroup in group.system_iter(recurse=False, typ=om.Group):
+            planGroup(subgroup)
+
+    planGroup(p.model)
+
+    return plan
+
+def solverPlanReport(plan):
+    "This function returns the coupled blocks of the plan and the number of feed-forward groups as a string"
+
+    lines = ['Linear solvers: %d feed-forward groups (LinearRunOnce), %d coupled blocks (DirectSolver)' %
+             (sum(reason is None for reason in plan.values()), sum(reason is not None for reason in plan.values()))]
+
+    for path, reason in plan.items():
+        if reason is not None:
+            lines.append('  ' + (path or 'model').ljust(40) + reason)
+
+    return '\n'.join(lines)
+
+def benchmarkLinearSolvers(p, repeat=3):
+    "This function returns the mean time (s) of the linearization of the model and of the total derivatives of the driver"
+    " The solve time is the time of the total derivatives minus the linearization, which they include"
+
+    p.final_setup()
+    p.run_model()
+
+    t_linearize = []
+    t_totals    = []
+
+    for i in range(repeat):
+        start = time.perf_counter()
+        p.model.run_linearize()
+        t_linearize.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        totals = p.driver._compute_totals(return_format='array')
+        t_totals.append(time.perf_counter() - start)
+
+    return {'linearize': np.mean(t_linearize),
+            'totals':    np.mean(t_totals),
+            'solve':     max(np.mean(t_totals) - np.mean(t_linearize), 0.0),
+            'jacobian':  totals}
+
+
+if __name__ == '__main__':
+
+    from celestialBodies import Earth
+    from vehicles import TSTO
+    from importInitialGuess import importInitialGuess, readGuessFile
+
+    from defineProblem import defineProblem
+
+    # Initialize earth
+    earth = Earth()
+
+    # initialize TSTO(md, mplf, mass_aux_1, nb_e_first_stage, nb_e_second_stage, centralBody)
+    rocket = TSTO(11e3 , 1.9e3, 3e3, 9 , 1, 0.64, 0.64,  earth)
+
+    ha     = 400e3
+    hp_min = 145e3
+
+    initial_guess = readGuessFile('initial_guess/F9_11Ton_400km.db')
+
+    # benchmark of the top level DirectSolver and of the planned linear solvers at the same point
+    results = {}
+    for name, plan_solvers in [('top level DirectSolver', False), ('planned', True)]:
+        p, traj, phases, design_params, traj_phase_duration, constraints_str, states = defineProblem(earth, rocket, ha, hp_min,
+                                                                                                     check=False, coloring_cache=None,
+                                                                                                     plan_solvers=plan_solvers)
+        p = importInitialGuess(p, phases, design_params.keys(), initial_guess, states.keys())
+
+        results[name] = benchmarkLinearSolvers(p)
+
+        if plan_solvers:
+            print(solverPlanReport(planLinearSolvers(p, apply=False)))
+
+    for name, result in results.items():
+        print(name.ljust(25) + 'linearize %8.4f s   solve %8.4f s   totals %8.4f s' %
+              (result['linearize'], result['solve'], result['totals']))
+
+    difference = np.max(np.abs(results['planned']['jacobian'] - results['top level DirectSolver']['jacobian']))
+    print('max difference of the total derivatives: %.3e' % difference)
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:12:41 2026
+
+Tests for the tables of the U.S. Standard Atmosphere used by the USatm component.
+
+@author: jorge
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_check_partials, assert_near_equal
+
+from groups.trajectory.subgroups.aero.components import us_atmos
+from groups.trajectory.subgroups.aero.components.Usatm_table_generation import atmosphere, atmosphere_vec
+
+
+class TestUSatmTableCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = us_atmos.cache_dir
+        us_atmos.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(us_atmos.cache_dir)
+        us_atmos.cache_dir = self.cache_dir
+
+    def test_cached_table(self):
+
+        table = us_atmos.loadUSatmTable()
+
+        # the second call must return the memory mapped table from the cache
+        cached = us_atmos.loadUSatmTable()
+        self.assertIsInstance(cached, np.memmap)
+
+        assert_near_equal(np.asarray(cached), table, 0.0)
+        assert_near_equal(table, us_atmos.buildUSatmTable(), 0.0)
+
+    def test_invalid_hash(self):
+
+        table = us_atmos.loadUSatmTable()
+
+        # corrupt the sidecar of the table. The table must be rebuilt instead of being loaded
+        hash_file = os.path.join(us_atmos.cache_dir, 'usatm_' + us_atmos.tableKey()[:16] + '.json')
+        with open(hash_file, 'w') as file:
+            json.dump({'key': us_atmos.tableKey(), 'sha256': ''}, file)
+
+        rebuilt = us_atmos.loadUSatmTable()
+        self.assertNotIsInstance(rebuilt, np.memmap)
+        assert_near_equal(rebuilt, table, 0.0)
+
+
+class TestAtmosphereVectorized(unittest.TestCase):
+
+    def test_value(self):
+
+        h = np.linspace(0, 1999e3, 4001)
+        atmos = atmosphere_vec(h, 300.0)
+
+        for i in range(h.size):
+            mach, rho, P, T = atmosphere(h[i], 300.0)
+            assert_near_equal(atmos.mach[i], mach, 1e-12)
+            assert_near_equal(atmos.rho[i],  rho,  1e-12)
+            assert_near_equal(atmos.P[i],    P,    1e-12)
+            assert_near_equal(atmos.T[i],    T,    1e-12)
+
+    def test_partials(self):
+
+        nn = 50
+        p = om.Problem()
+        p.model.add_subsystem('atmos', us_atmos.USatm(num_nodes=nn, method='analytic'))
+        p.setup(force_alloc_complex=True)
+
+        # avoid the boundaries of the layers, where the derivatives are discontinuous
+        p['atmos.h'] = np.linspace(1e3, 190e3, nn) + 123.4
+        p.run_model()
+
+        # the closed-form model must be close to the interpolated tables
+        akima = us_atmos.getInterpolants()
+        assert_near_equal(p.get_val('atmos.rho'), akima['rho'](p.get_val('atmos.h')), 1e-3)
+        assert_near_equal(p.get_val('atmos.P_a'), akima['P'](p.get_val('atmos.h')), 1e-3)
+
+        cpd = p.check_partials(method='cs', compact_print=True, out_stream=None)
+        assert_check_partials(cpd, atol=1e-10, rtol=1e-8)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
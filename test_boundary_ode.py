@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 12:04:51 2026
+
+The orbital parameters evaluated as a boundary ODE at the final node of a phase are compared
+against the orbital parameters evaluated at every node.
+
+@author: jorge
+"""
+
+import unittest
+
+import numpy as np
+import openmdao.api as om
+
+from celestialBodies import Earth
+from groups.trajectory.boundaryODE import addBoundaryODE
+from groups.trajectory.subgroups.orbitalParameters.orbitalParameters import OrbitalParameters
+
+
+nn = 7
+
+def defineProblem(loc):
+    "This function returns a problem with a fake timeseries of a phase and the orbital parameters at every node and at the node loc"
+
+    earth = Earth()
+
+    p = om.Problem(model=om.Group())
+
+    rng = np.random.RandomState(0)
+    states = {'r'  : earth.r0 + 150e3 + 50e3 * rng.rand(nn, 1),
+              'v'  : 7.2e3 + 300 * rng.rand(nn, 1),
+              'phi': 0.05 * rng.rand(nn, 1),
+              'm'  : 1e4 + 5e3 * rng.rand(nn, 1)}
+    units  = {'r': 'm', 'v': 'm/s', 'phi': 'rad', 'm': 'kg'}
+
+    phase = p.model.add_subsystem('phase', om.Group())
+    timeseries = phase.add_subsystem('timeseries', om.IndepVarComp())
+    for name, value in states.items():
+        timeseries.add_output('states:' + name, val=value, units=units[name])
+
+    params = p.model.add_subsystem('params', om.IndepVarComp())
+    params.add_output('Isp', val=340.0, units='s')
+
+    p.model.add_subsystem('nodes', OrbitalParameters(num_nodes=nn, central_body=earth))
+    for name, target in [('r', 'r'), ('v', 'v'), ('phi', 'phi'), ('m', 'm_0')]:
+        p.model.connect('phase.timeseries.states:' + name, 'nodes.' + target, src_indices=np.arange(nn))
+
+    addBoundaryODE(p, 'boundary', OrbitalParameters(num_nodes=1, central_body=earth), 'phase', loc=loc,
+                   inputs={'states:r': ['r'], 'states:v': ['v'], 'states:phi': ['phi'], 'states:m': ['m_0']})
+
+    p.model.connect('params.Isp', ['nodes.Isp', 'boundary.Isp'])
+
+    p.setup(force_alloc_complex=True)
+    p.run_model()
+
+    return p
+
+
+class TestBoundaryODE(unittest.TestCase):
+
+    def test_final(self):
+
+        p = defineProblem('final')
+
+        for name in ['ra', 'rp', 'm_final']:
+            self.assertEqual(p.get_val('boundary.' + name).shape, (1,))
+            np.testing.assert_allclose(p.get_val('boundary.' + name), p.get_val('nodes.' + name)[-1:], rtol=1e-12)
+
+    def test_initial(self):
+
+        p = defineProblem('initial')
+
+        for name in ['ra', 'rp', 'm_final']:
+            np.testing.assert_allclose(p.get_val('boundary.' + name), p.get_val('nodes.' + name)[:1], rtol=1e-12)
+
+    def test_loc(self):
+
+        p = om.Problem(model=om.Group())
+
+        with self.assertRaises(ValueError):
+            addBoundaryODE(p, 'boundary', OrbitalParameters(num_nodes=1, central_body=Earth()), 'phase', loc='middle')
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 12:04:18 2026
+
+The closed-form coast phase is compared to the Runge Kutta propagation of the equations of motion
+of the coast phase.
+
+@author: jorge
+"""
+
+import unittest
+
+import numpy as np
+from scipy.integrate import solve_ivp
+from openmdao.utils.assert_utils import assert_near_equal
+
+from celestialBodies import Earth
+from Propagate_coast_phase import propagate_coast, keplerCoast
+
+
+class TestKeplerCoast(unittest.TestCase):
+
+    def setUp(self):
+        self.earth = Earth()
+
+        # burnout state of a transfer orbit to 400 km
+        self.r_0  = self.earth.r0 + 150e3
+        self.v_0  = 7.5e3
+        self.la_0 = 0.3
+        self.ph_0 = np.radians(1.0)
+
+    def coast(self, t):
+        earth = self.earth
+        return keplerCoast(t, self.r_0, self.v_0, self.la_0, self.ph_0, earth.mu, earth.angularSpeed, earth.r0)
+
+    def test_runge_kutta(self):
+
+        earth = self.earth
+        t = np.linspace(0, 6000, 61)
+
+        # same conversion of the speed as the Runge Kutta propagation of the coast phase
+        y0 = [self.r_0, self.v_0 - (self.r_0 - earth.r0) * earth.angularSpeed, 1e3, self.la_0, self.ph_0]
+        sol = solve_ivp(lambda t, y: propagate_coast(t, y, earth), (0, 6000), y0, t_eval=t,
+                        method='DOP853', rtol=1e-12, atol=1e-9)
+
+        coast = self.coast(t)
+
+        assert_near_equal(coast['r'],  sol.y[0], 1e-8)
+        assert_near_equal(coast['v'],  sol.y[1] + (sol.y[0] - earth.r0) * earth.angularSpeed, 1e-8)
+        assert_near_equal(coast['la'], sol.y[3], 1e-8)
+        assert_near_equal(coast['ph'], sol.y[4], 1e-6)
+
+        # the burnout state is recovered at t = 0
+        assert_near_equal([coast['r'][0], coast['v'][0], coast['la'][0], coast['ph'][0]],
+                          [self.r_0, self.v_0, self.la_0, self.ph_0], 1e-12)
+
+    def test_apogee(self):
+
+        t_apogee = self.coast(0.0)['t_apogee']
+
+        # the radius is maximum at the apogee
+        r = self.coast(t_apogee + np.array([-1.0, 0.0, 1.0]))['r']
+        self.assertGreater(r[1], r[0])
+        self.assertGreater(r[1], r[2])
+
+    def test_vectorized(self):
+
+        # one coast per burnout state
+        coast = keplerCoast(np.array([[0.0], [100.0]]), self.r_0 + np.array([0.0, 10e3]), self.v_0,
+                            self.la_0, self.ph_0, self.earth.mu, self.earth.angularSpeed, self.earth.r0)
+
+        self.assertEqual(coast['r'].shape, (2, 2))
+        self.assertEqual(coast['t_apogee'].shape, (2,))
+
+        assert_near_equal(coast['r'][1, 0], self.coast(100.0)['r'], 1e-14)
+
+    def test_hyperbolic(self):
+
+        coast = keplerCoast(100.0, self.r_0, 12e3, self.la_0, self.ph_0, self.earth.mu, self.earth.angularSpeed,
+                            self.earth.r0)
+
+        self.assertTrue(np.isnan(coast['r']))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:31:20 2026
+
+The coloring cache is checked on the brachistochrone problem of dymos.
+
+@author: jorge
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import openmdao.api as om
+
+from coloringCache import modelHash, modelStructure, useColoringCache, coloring_file
+from brachistochroneProblem import brachistochroneProblem
+
+
+def defineSmallProblem(src_index=-1, size=3, diag_partials=True):
+    "This function returns a setup problem whose structure changes only in the src_indices, shapes and declared partials"
+
+    p = om.Problem(model=om.Group())
+
+    ivc = p.model.add_subsystem('ivc', om.IndepVarComp())
+    ivc.add_output('x', shape=(size,))
+    ivc.add_design_var('x')
+
+    p.model.add_subsystem('comp', om.ExecComp('y = 2.0 * x', x=np.ones(size), y=np.ones(size),
+                                              has_diag_partials=diag_partials))
+    p.model.add_subsystem('last', om.ExecComp('z = 3.0 * x'))
+    p.model.add_objective('last.z')
+
+    p.model.connect('ivc.x', 'comp.x')
+    p.model.connect('comp.y', 'last.x', src_indices=[src_index])
+
+    p.setup()
+
+    return p
+
+
+class TestColoringCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tempdir = tempfile.mkdtemp()
+        os.chdir(self.tempdir)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tempdir)
+
+    def test_model_hash(self):
+
+        # the hash does not depend on the instance of the problem
+        self.assertEqual(modelHash(brachistochroneProblem(driver=om.ScipyOptimizeDriver)), modelHash(brachistochroneProblem(driver=om.ScipyOptimizeDriver)))
+
+        # the hash changes with the grid and with the constraints
+        self.assertNotEqual(modelHash(brachistochroneProblem(driver=om.ScipyOptimizeDriver)), modelHash(brachistochroneProblem(num_segments=6, driver=om.ScipyOptimizeDriver)))
+        self.assertNotEqual(modelHash(brachistochroneProblem(driver=om.ScipyOptimizeDriver)), modelHash(brachistochroneProblem(driver=om.ScipyOptimizeDriver, fix_final_y=False)))
+
+    def test_structure_hash(self):
+
+        # the hash changes with the src_indices, the shapes and the declared partials of the model
+        reference = modelHash(defineSmallProblem())
+
+        # the partials are declared in the final setup, which modelHash runs
+        partials = modelStructure(defineSmallProblem())['partials']
+        self.assertIn('comp.y,comp.x', partials)
+        self.assertIsNotNone(partials['comp.y,comp.x'][0])
+
+        self.assertEqual(reference, modelHash(defineSmallProblem()))
+        self.assertNotEqual(reference, modelHash(defineSmallProblem(src_index=0)))
+        self.assertNotEqual(reference, modelHash(defineSmallProblem(size=4)))
+        self.assertNotEqual(reference, modelHash(defineSmallProblem(diag_partials=False)))
+
+    def test_cache(self):
+
+        # the coloring is computed in the first run and written in the cache
+        p = brachistochroneProblem(driver=om.ScipyOptimizeDriver)
+        self.assertFalse(useColoringCache(p, 'cache'))
+        p.run_driver()
+
+        fname = os.path.join(self.tempdir, 'cache', modelHash(p), coloring_file)
+        self.assertTrue(os.path.isfile(fname))
+        tf = p.get_val('traj.phase0.timeseries.time')[-1]
+
+        # the same model uses the cached coloring and reaches the same solution
+        p = brachistochroneProblem(driver=om.ScipyOptimizeDriver)
+        self.assertTrue(useColoringCache(p, 'cache'))
+        self.assertEqual(p.driver._coloring_info['static'], fname)
+        p.run_driver()
+        self.assertAlmostEqual(p.get_val('traj.phase0.timeseries.time')[-1][0], tf[0], 6)
+
+        # a different model does not use it
+        p = brachistochroneProblem(num_segments=6, driver=om.ScipyOptimizeDriver)
+        self.assertFalse(useColoringCache(p, 'cache'))
+        self.assertIsNone(p.driver._coloring_info['static'])
+
+        # the staging directory of the run is removed once the coloring is moved to the cache
+        self.assertEqual(os.listdir(os.path.join(self.tempdir, 'cache', modelHash(brachistochroneProblem(driver=om.ScipyOptimizeDriver)))), [coloring_file])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 09:58:03 2026
+
+Tests of the disk cache of arrays shared by the atmospheric tables and the propellant surrogates.
+
+@author: jorge
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from diskCache import cacheKey, cachedArrays, atomicWrite, userCacheDir, package_cache_name
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.builds = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def build(self):
+        self.builds += 1
+        return {'a': np.arange(5.0), 'b': np.eye(3)}
+
+    def test_cached(self):
+
+        key = cacheKey({'version': 1, 'grid': np.arange(3)})
+        arrays = cachedArrays(self.cache_dir, 'test_', key, self.build, 'The test arrays')
+        cached = cachedArrays(self.cache_dir, 'test_', key, self.build, 'The test arrays')
+
+        self.assertEqual(self.builds, 1)
+        for name in arrays:
+            np.testing.assert_array_equal(cached[name], arrays[name])
+
+        # another key is a different entry
+        cachedArrays(self.cache_dir, 'test_', cacheKey({'version': 2}), self.build, 'The test arrays')
+        self.assertEqual(self.builds, 2)
+
+    def test_mmap(self):
+
+        key = cacheKey('table')
+        build = lambda: {'table': np.arange(12.0).reshape(3, 4)}
+
+        table = cachedArrays(self.cache_dir, 'test_', key, build, 'The test table', mmap=True)['table']
+        cached = cachedArrays(self.cache_dir, 'test_', key, build, 'The test table', mmap=True)['table']
+
+        self.assertNotIsInstance(table, np.memmap)
+        self.assertIsInstance(cached, np.memmap)
+        np.testing.assert_array_equal(cached, table)
+
+    def test_invalid_entry(self):
+
+        key = cacheKey('invalid')
+        cachedArrays(self.cache_dir, 'test_', key, self.build, 'The test arrays')
+
+        # the data file is replaced after the sidecar was written. The entry must be rebuilt
+        np.savez(os.path.join(self.cache_dir, 'test_' + key[:16] + '.npz'), a=np.zeros(7))
+
+        arrays = cachedArrays(self.cache_dir, 'test_', key, self.build, 'The test arrays')
+        self.assertEqual(self.builds, 2)
+        np.testing.assert_array_equal(arrays['a'], np.arange(5.0))
+
+        # a sidecar without the size and modification time of the data file is not valid
+        with open(os.path.join(self.cache_dir, 'test_' + key[:16] + '.json'), 'w') as file:
+            json.dump({'key': key, 'name': None, 'sha256': ''}, file)
+
+        cachedArrays(self.cache_dir, 'test_', key, self.build, 'The test arrays')
+        self.assertEqual(self.builds, 3)
+
+    def test_no_hash_on_load(self):
+
+        key = cacheKey('table')
+        build = lambda: {'table': np.arange(12.0).reshape(3, 4)}
+        cachedArrays(self.cache_dir, 'test_', key, build, 'The test table', mmap=True)
+
+        # the content of a valid entry is not read to hash it
+        with mock.patch('diskCache.arraysHash', side_effect=AssertionError('hashed on load')):
+            cached = cachedArrays(self.cache_dir, 'test_', key, build, 'The test table', mmap=True)['table']
+
+        self.assertIsInstance(cached, np.memmap)
+
+    def test_user_cache_dir(self):
+
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': self.cache_dir}):
+            self.assertEqual(userCacheDir('tables'), os.path.join(self.cache_dir, package_cache_name, 'tables'))
+
+    def test_atomic_write(self):
+
+        file_name = os.path.join(self.cache_dir, 'sub', 'file.txt')
+        atomicWrite(file_name, lambda file: file.write('data'), binary=False)
+
+        with open(file_name, 'r') as file:
+            self.assertEqual(file.read(), 'data')
+
+        # a failed write leaves the previous file and no temporary file
+        def fail(file):
+            file.write('partial')
+            raise RuntimeError('write failed')
+
+        with self.assertRaises(RuntimeError):
+            atomicWrite(file_name, fail, binary=False)
+
+        with open(file_name, 'r') as file:
+            self.assertEqual(file.read(), 'data')
+        self.assertEqual(os.listdir(os.path.dirname(file_name)), ['file.txt'])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:05:36 2026
+
+The propagation of the dispersed trajectories is checked on a short mission with the
+phases of the TSTO trajectory. The phases last a few seconds so the test runs fast.
+
+@author: jorge
+"""
+
+import unittest
+
+import numpy as np
+from openmdao.utils.assert_utils import assert_near_equal
+
+from celestialBodies import Earth
+from dispersionAnalysis import phase_stage, state_names, default_dispersions, sampleDispersions
+from dispersionAnalysis import propagatePhase, propagateDispersions, runDispersionAnalysis
+
+
+def defineMission():
+    "This function returns a mission with short phases and the propulsion and masses of a TSTO launch vehicle"
+
+    earth = Earth()
+
+    mission = {'constants': {'r0': earth.r0, 'mu': earth.mu, 'omega': earth.angularSpeed, 'g0': earth.g0},
+               'initial_states': {'r': earth.r0, 'lambda': 0.0, 'v': 1e-3, 'phi': np.pi/2, 'm': 4e5},
+               'guidance': {'theta_lift_off': np.pi/2, 'delta_theta_pitch_over': np.radians(5),
+                            'delta_theta_exoatmos': np.radians(10), 'theta_f': np.radians(5), 'xi': 0.2,
+                            'theta_gt': np.radians(30), 'exoatmos_a_t_duration': 4.0, 'exoatmos_b_t_duration': 4.0},
+               'stages': {1: {'thrust_vac': 7.6e6, 'mfr_max': 2.5e3, 'Ae_t': 9.0, 'Isp': 310.0, 'ms': 2.5e4, 'mp': 3.0e5},
+                          2: {'thrust_vac': 9.0e5, 'mfr_max': 2.7e2, 'Ae_t': 1.0, 'Isp': 340.0, 'ms': 4.0e3, 'mp': 6.0e4}},
+               'diameter': 3.7,
+               'm_separation': 7.7e4,
+               'm_fairing': 1.9e3,
+               'phases': {}}
+
+    for name in phase_stage:
+        mission['phases'][name] = {'duration': 4.0, 'throttle': (np.array([0.0, 4.0]), np.array([1.0, 1.0]))}
+
+    return mission
+
+
+class TestDispersionAnalysis(unittest.TestCase):
+
+    def test_nominal(self):
+
+        mission = defineMission()
+
+        # without dispersions all the samples follow the nominal trajectory
+        factors = sampleDispersions(3, {name: 0.0 for name in default_dispersions})
+        results = propagateDispersions(mission, factors)
+
+        single = propagateDispersions(mission, {name: value[:1] for name, value in factors.items()})
+
+        for name, value in results.items():
+            assert_near_equal(value, np.repeat(single[name], 3, axis=0), 1e-14)
+
+        # lift-off is vertical. The pitch over reduces the flight path angle
+        self.assertTrue(np.all(results['final_states'][:, 3] < np.pi/2))
+        self.assertTrue(np.all(results['max_n_f'] > 0))
+
+    def test_burnout(self):
+
+        mission = defineMission()
+        mission['phases']['lift_off']['duration'] = 10.0
+
+        factors = sampleDispersions(2, {name: 0.0 for name in default_dispersions})
+
+        stage  = mission['stages'][1]
+        inputs = {'thrust_vac': np.full(2, stage['thrust_vac']), 'mfr_max': np.full(2, stage['mfr_max']),
+                  'Ae_t': np.full(2, stage['Ae_t']), 'diameter': np.full(2, mission['diameter'])}
+
+        y = np.array([np.full(2, mission['initial_states'][state]) for state in state_names])
+
+        # the propellant is exhausted after 5 s. The mass stops decreasing at the burnout mass
+        m_burnout = mission['initial_states']['m'] - 5 * stage['mfr_max']
+
+        y, max_q_dyn, max_n_f = propagatePhase(mission, 'lift_off', y, inputs, m_burnout, factors, dt=0.5)
+
+        assert_near_equal(y[4], np.full(2, m_burnout), 1e-12)
+
+    def test_workers(self):
+
+        mission = defineMission()
+
+        # the results do not depend on the number of workers and chunks
+        factors_1, results_1 = runDispersionAnalysis(mission, 10, n_workers=1, seed=3)
+        factors_2, results_2 = runDispersionAnalysis(mission, 10, n_workers=2, n_chunks=3, seed=3)
+
+        for name in factors_1:
+            assert_near_equal(factors_2[name], factors_1[name], 1e-15)
+
+        for name in results_1:
+            assert_near_equal(results_2[name], results_1[name], 1e-14)
+
+        # the samples are dispersed
+        self.assertGreater(np.std(results_1['max_q_dyn']), 0.0)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 17:25:41 2026
+
+The evaluation cache is checked alone and with the brachistochrone problem of dymos.
+
+@author: jorge
+"""
+
+import unittest
+
+import numpy as np
+import openmdao.api as om
+
+from evaluationCache import EvaluationCache, CachedScipyOptimizeDriver
+from brachistochroneProblem import brachistochroneProblem
+
+
+class TestEvaluationCache(unittest.TestCase):
+
+    def test_lru(self):
+
+        cache = EvaluationCache(max_memory=3 * 8)
+
+        keys = [cache.key(np.array([i, 1.0])) for i in range(4)]
+        self.assertEqual(keys[0], cache.key([0.0, 1.0]))
+        self.assertNotEqual(keys[0], keys[1])
+
+        for key in keys[:3]:
+            cache.put(key, 'objective', 1.0, 8)
+
+        # the first evaluation is used, so the second one is the least recently used
+        self.assertEqual(cache.get(keys[0], 'objective'), 1.0)
+        cache.put(keys[3], 'objective', 1.0, 8)
+
+        self.assertIsNone(cache.get(keys[1], 'objective'))
+        self.assertIsNone(cache.get(keys[0], 'jacobian'))
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'],    {'objective': 1, 'jacobian': 0})
+        self.assertEqual(stats['misses'],  {'objective': 1, 'jacobian': 1})
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['entries'],   3)
+        self.assertEqual(stats['memory'],    24)
+
+        # an evaluation larger than the limit is kept alone
+        cache.put(keys[1], 'jacobian', np.zeros(10), 80)
+        self.assertEqual(cache.stats()['entries'], 1)
+        self.assertIsNotNone(cache.get(keys[1], 'jacobian'))
+
+        cache.clear()
+        self.assertEqual(cache.stats()['entries'], 0)
+        self.assertEqual(cache.stats()['memory'],  0)
+
+    def test_driver(self):
+
+        p = brachistochroneProblem(driver=om.ScipyOptimizeDriver)
+        p.run_driver()
+
+        p_cached = brachistochroneProblem(driver=CachedScipyOptimizeDriver)
+        p_cached.run_driver()
+
+        # same solution, and the model is left at the last design vector
+        tf = p.get_val('traj.phase0.timeseries.time')[-1]
+        self.assertAlmostEqual(p_cached.get_val('traj.phase0.timeseries.time')[-1][0], tf[0], 6)
+
+        stats = p_cached.driver.eval_cache.stats()
+        self.assertGreater(stats['misses']['objective'], 0)
+        self.assertGreater(stats['misses']['jacobian'],  0)
+
+        # the repeated evaluations are served from the cache
+        driver = p_cached.driver
+        x = driver._last_x
+
+        f    = driver._objfunc(x)
+        grad = driver._gradfunc(x)
+        hits = driver.eval_cache.stats()['hits']
+
+        self.assertEqual(f, driver._objfunc(x))
+        np.testing.assert_array_equal(grad, driver._gradfunc(x))
+
+        stats = driver.eval_cache.stats()
+        self.assertEqual(stats['hits']['objective'], hits['objective'] + 1)
+        self.assertEqual(stats['hits']['jacobian'],  hits['jacobian'] + 1)
+
+        # the cache is cleared in every run, an input of the model may have changed
+        p.set_val('traj.phase0.design_parameters:g', 5.0)
+        p.run_driver()
+
+        # the driver is run without the final setup of run_driver, which also clears the cache
+        p_cached.set_val('traj.phase0.design_parameters:g', 5.0)
+        p_cached.driver.run()
+
+        tf = p.get_val('traj.phase0.timeseries.time')[-1]
+        self.assertAlmostEqual(p_cached.get_val('traj.phase0.timeseries.time')[-1][0], tf[0], 6)
+        stats = p_cached.driver.eval_cache.stats()
+        self.assertEqual(stats['hits']['objective'] + stats['misses']['objective'], p_cached.driver.result.nfev)
+
+        # the cache is cleared in every setup
+        p_cached.setup()
+        p_cached.final_setup()
+        self.assertEqual(p_cached.driver.eval_cache.stats()['entries'], 0)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
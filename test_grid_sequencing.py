@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:47:12 2026
+
+The grid sequence is checked on the brachistochrone problem of dymos, with the gravity set as a
+design parameter of the trajectory so that the transfer of the outputs that do not depend on the grid
+is also checked.
+
+@author: jorge
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_near_equal
+
+from gridSequencing import gridLevels, getPhaseGrids, solveGridSequence
+from brachistochroneProblem import brachistochroneProblem
+
+
+def gridProblem():
+    "This function returns the brachistochrone problem on 8 segments with a guess of the gravity different from its value"
+
+    p = brachistochroneProblem(num_segments=8, driver=om.ScipyOptimizeDriver, compressed=False, trajectory_g=True,
+                               force_alloc_complex=True)
+    p['traj.design_parameters:g'] = 9.0
+
+    return p
+
+
+class TestGridSequencing(unittest.TestCase):
+
+    def setUp(self):
+        # the coloring files are written in the working directory
+        self.cwd = os.getcwd()
+        self.tempdir = tempfile.mkdtemp()
+        os.chdir(self.tempdir)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tempdir)
+
+    def test_grid_levels(self):
+
+        sequence = gridLevels({'lift_off': 7, 'gravity_turn_b': 3, 'exoatmos_b': 14}, (2, 4))
+
+        self.assertEqual(sequence, [{'lift_off': 2, 'gravity_turn_b': 2, 'exoatmos_b': 2},
+                                    {'lift_off': 4, 'gravity_turn_b': 3, 'exoatmos_b': 4},
+                                    {'lift_off': 7, 'gravity_turn_b': 3, 'exoatmos_b': 14}])
+
+        # the levels that do not change the grid are skipped
+        self.assertEqual(gridLevels({'lift_off': 2}, (2, 4)), [{'lift_off': 2}])
+
+    def test_grid_sequence(self):
+
+        p = gridProblem()
+        p.run_driver()
+        tf = p.get_val('traj.phase0.timeseries.time')[-1]
+
+        p = gridProblem()
+        history = solveGridSequence(p, check_error=False)
+
+        # all the levels are solved and the problem ends on the grid it was defined with
+        self.assertEqual([level['grids']['traj.phases.phase0'] for level in history], [2, 4, 8])
+        self.assertEqual(getPhaseGrids(p), {'traj.phases.phase0': 8})
+        self.assertTrue(all(level['success'] for level in history))
+
+        # same solution as the direct solve, with the gravity of the initial guess
+        assert_near_equal(p.get_val('traj.design_parameters:g'), [[9.0]], 1e-15)
+        assert_near_equal(p.get_val('traj.phase0.timeseries.time')[-1], tf, 1e-6)
+
+    def test_error_tolerance(self):
+
+        p = gridProblem()
+        p.model.traj.phases.phase0.set_refine_options(tol=1e-2)
+
+        history = solveGridSequence(p)
+
+        # the coarse grids meet the loose tolerance, the sequence stops before the finest grid
+        self.assertLess(len(history), 3)
+        self.assertLess(history[-1]['error']['traj.phases.phase0'], 1e-2)
+        self.assertTrue(np.all(list(getPhaseGrids(p).values()) < np.array([8])))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
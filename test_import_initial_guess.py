@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:02:41 2026
+
+The warm-start reader is checked on a database recorded by a small optimization whose
+variables have the names of the design parameters, times and states of the trajectory.
+
+@author: jorge
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_near_equal
+
+from importInitialGuess import importInitialGuess, readGuessFile, writeGuessSnapshot
+
+
+phases            = ['gravity_turn', 'exoatmos_a']
+design_params_str = ['traj.design_parameters:xi']
+states            = ['r', 'm']
+
+def defineProblem(recorder=None):
+    "This function returns a problem with the variables read by importInitialGuess"
+    
+    p = om.Problem()
+    
+    traj = p.model.add_subsystem('traj', om.Group())
+    
+    ivc = traj.add_subsystem('design_params', om.IndepVarComp(), promotes_outputs=['*'])
+    ivc.add_output('design_parameters:xi', val=0.0)
+    
+    for phase in phases:
+        ivc = traj.add_subsystem(phase, om.Group()).add_subsystem('ivc', om.IndepVarComp(),
+                                                                 promotes_outputs=['*'])
+        ivc.add_output('t_initial', val=0.0, units='s')
+        ivc.add_output('t_duration', val=1.0, units='s')
+        for state in states:
+            ivc.add_output('states:' + state, val=np.zeros((5, 1)))
+    
+    # the design parameter converges to 0.3
+    p.model.add_subsystem('obj', om.ExecComp('f = (xi - 0.3)**2'))
+    p.model.connect('traj.design_parameters:xi', 'obj.xi')
+    
+    p.model.add_design_var('traj.design_parameters:xi', lower=-1, upper=1)
+    p.model.add_objective('obj.f')
+    
+    if recorder is not None:
+        p.driver = om.ScipyOptimizeDriver(optimizer='SLSQP', tol=1e-10)
+        p.driver.add_recorder(recorder)
+        p.driver.recording_options['includes'] = ['*']
+        p.driver.recording_options['record_inputs'] = True
+    
+    p.setup()
+    
+    return p
+
+
+class TestImportInitialGuess(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.db = os.path.join(self.tempdir, 'guess.db')
+        
+        p = defineProblem(om.SqliteRecorder(self.db))
+        
+        for i, phase in enumerate(phases):
+            p['traj.' + phase + '.t_initial'] = 10.0 * i
+            for state in states:
+                p['traj.' + phase + '.states:' + state] = np.random.rand(5, 1)
+        
+        p.run_driver()
+        p.cleanup()
+        
+        self.p = p
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_last_driver_case(self):
+        
+        initial_guess = readGuessFile(self.db)
+        
+        # same case as the one returned by the full case reader
+        last_case = om.CaseReader(self.db).get_cases('driver')[-1]
+        
+        self.assertEqual(initial_guess.name, last_case.name)
+        assert_near_equal(initial_guess.get_val('traj.design_parameters:xi'), 0.3, 1e-6)
+        
+    def test_snapshot(self):
+        
+        snapshot = os.path.join(self.tempdir, 'guess.npz')
+        writeGuessSnapshot(readGuessFile(self.db), snapshot, phases, design_params_str, states)
+        
+        # the snapshot and the database give the same initial guess
+        for guess_file in [self.db, snapshot]:
+            p = defineProblem()
+            p = importInitialGuess(p, phases, design_params_str, readGuessFile(guess_file), states)
+            
+            assert_near_equal(p['traj.design_parameters:xi'], self.p['traj.design_parameters:xi'], 1e-15)
+            for phase in phases:
+                assert_near_equal(p['traj.' + phase + '.t_initial'], self.p['traj.' + phase + '.t_initial'], 1e-15)
+                for state in states:
+                    assert_near_equal(p['traj.' + phase + '.states:' + state], 
+                                      self.p['traj.' + phase + '.states:' + state], 1e-15)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 10:37:05 2026
+
+Import-time benchmark of the launch vehicle ODE. The modules are imported in a new process, so the
+time includes every table or fit built at import. openmdao, dymos and numpy are imported first and
+are not part of the budget.
+
+The budget (s) can be redefined with the environment variable IMPORT_TIME_BUDGET.
+
+@author: jorge
+"""
+
+import os
+import sys
+import json
+import subprocess
+import unittest
+
+# import time (s) allowed for the modules of this repository
+import_time_budget = float(os.environ.get('IMPORT_TIME_BUDGET', 0.5))
+
+# number of new processes. The minimum time is compared to the budget
+repetitions = 3
+
+benchmark = """
+import sys, json, time
+import numpy, openmdao.api, dymos
+loaded = set(sys.modules)
+t0 = time.perf_counter()
+import {module}
+t1 = time.perf_counter()
+print(json.dumps({{'time': t1 - t0, 'modules': sorted(set(sys.modules) - loaded)}}))
+"""
+
+def importTime(module):
+    "This function imports module in a new process. It returns the import time and the names of the modules loaded by the import"
+
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    out = subprocess.run([sys.executable, '-c', benchmark.format(module=module)], cwd=cwd,
+                         stdout=subprocess.PIPE, check=True, universal_newlines=True).stdout
+
+    result = json.loads(out.splitlines()[-1])
+
+    return result['time'], result['modules']
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_launch_vehicle_ode(self):
+
+        times = []
+        for i in range(repetitions):
+            t, _ = importTime('groups.trajectory.launch_vehicle_ode')
+            times.append(t)
+
+        print('import groups.trajectory.launch_vehicle_ode: %.3f s (budget %.3f s)' % (min(times), import_time_budget))
+
+        self.assertLess(min(times), import_time_budget)
+
+    def test_lazy_imports(self):
+
+        _, modules = importTime('groups.trajectory.launch_vehicle_ode, groups.propulsion.propulsion')
+
+        # plotting is never imported with the model and the interpolators are fitted on first use
+        self.assertNotIn('matplotlib', modules)
+        self.assertNotIn('matplotlib.pyplot', modules)
+        self.assertNotIn('scipy.interpolate', modules)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 09:52:18 2026
+
+The KS aggregation is compared against the maximum of its inputs and its partials are checked
+with complex step.
+
+@author: jorge
+"""
+
+import unittest
+
+import numpy as np
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_check_partials
+
+from constraints.ksAggregation import KSAggregation
+
+
+input_nodes = {'phase_a': 12, 'phase_b': 9}
+
+def defineProblem(ref, rho):
+    "This function returns a problem with the KS aggregation of two random timeseries"
+
+    p = om.Problem(model=om.Group())
+    p.model.add_subsystem('ks', KSAggregation(input_nodes=input_nodes, units='Pa', ref=ref, rho=rho),
+                          promotes=['*'])
+    p.setup(force_alloc_complex=True)
+
+    rng = np.random.RandomState(0)
+    for name, size in input_nodes.items():
+        p[name] = 3e4 * rng.rand(size, 1)
+
+    p.run_model()
+
+    return p
+
+
+class TestKSAggregation(unittest.TestCase):
+
+    def test_bounds(self):
+
+        n = sum(input_nodes.values())
+
+        for ref, rho in [(1e3, 100.0), (1e3, 10.0), (1e4, 50.0)]:
+            p = defineProblem(ref, rho)
+            x_max = max(np.max(p[name]) for name in input_nodes)
+
+            # the KS is a conservative estimate of the maximum
+            self.assertGreaterEqual(p['ks'][0], x_max)
+            self.assertLessEqual(p['ks'][0], x_max + ref * np.log(n) / rho)
+
+    def test_partials(self):
+
+        p = defineProblem(1e3, 100.0)
+        assert_check_partials(p.check_partials(method='cs', compact_print=True, out_stream=None))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:48:10 2026
+
+The fused ODE (component LaunchVehicleRHS) is compared against the group of components
+of LaunchVehicleODE that it replaces.
+
+@author: jorge
+"""
+
+import unittest
+
+import numpy as np
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_check_partials, assert_near_equal
+
+from celestialBodies import Earth
+from groups.trajectory.launch_vehicle_ode import LaunchVehicleODE, odePath, odeTargets
+from groups.trajectory.components.launch_vehicle_rhs import LaunchVehicleRHS
+
+
+nn = 20
+
+# inputs of the ODE and their targets in the group of components
+targets = {'r':          ['eom.r', 'aero.r', 'gravity.r'],
+           'lambda':     ['eom.lambda'],
+           'v':          ['eom.v', 'aero.v'],
+           'phi':        ['eom.phi'],
+           'm':          ['eom.m'],
+           'theta':      ['eom.theta'],
+           'throttle':   ['thrust_losses.throttle'],
+           'thrust_vac': ['thrust_losses.thrust_vac'],
+           'Ae_t':       ['thrust_losses.Ae_t'],
+           'mfr_max':    ['thrust_losses.mfr_max'],
+           'diameter':   ['aero.diameter']}
+
+outputs = ['eom.rdot', 'eom.lambdadot', 'eom.vdot', 'eom.phidot', 'eom.mdot', 'eom.n_f',
+           'aero.rho', 'aero.P_a', 'aero.d_rho_wrt_h', 'aero.Mach', 'aero.Cd', 'aero.q_dyn',
+           'aero.q_heat', 'aero.Drag', 'gravity.g', 'thrust_losses.thrust', 'thrust_losses.mfr']
+
+def setupODE(fused):
+    "This function returns a problem with the ODE fed by an IndepVarComp with the states of a trajectory"
+
+    earth = Earth()
+
+    p = om.Problem()
+    ivc = p.model.add_subsystem('ivc', om.IndepVarComp())
+
+    ivc.add_output('r',          val=earth.r0 + np.linspace(100, 150e3, nn), units='m')
+    ivc.add_output('lambda',     val=np.linspace(0, 1e-2, nn), units='rad')
+    ivc.add_output('v',          val=np.linspace(10, 6e3, nn), units='m/s')
+    ivc.add_output('phi',        val=np.linspace(1.5, 0.1, nn), units='rad')
+    ivc.add_output('m',          val=np.linspace(4e5, 1e5, nn), units='kg')
+    ivc.add_output('theta',      val=np.linspace(1.5, 0.2, nn), units='rad')
+    ivc.add_output('throttle',   val=np.linspace(1.0, 0.7, nn), units=None)
+    ivc.add_output('thrust_vac', val=7.6e6, units='N')
+    ivc.add_output('Ae_t',       val=9.0, units='m**2')
+    ivc.add_output('mfr_max',    val=2.5e3, units='kg/s')
+    ivc.add_output('diameter',   val=4.5, units='m')
+
+    p.model.add_subsystem('ode', LaunchVehicleODE(num_nodes=nn, central_body=earth, fused=fused))
+
+    for name, target in targets.items():
+        for path in odeTargets(target, fused):
+            p.model.connect('ivc.' + name, 'ode.' + path)
+
+    p.setup(force_alloc_complex=True)
+    p.run_model()
+
+    return p
+
+
+class TestLaunchVehicleRHS(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.p_ref   = setupODE(False)
+        cls.p_fused = setupODE(True)
+
+    def test_value(self):
+
+        for output in outputs:
+            assert_near_equal(self.p_fused.get_val('ode.' + odePath(output, True)),
+                              self.p_ref.get_val('ode.' + output), 1e-12)
+
+    def test_totals(self):
+
+        wrt = ['ivc.' + name for name in targets]
+
+        J_ref   = self.p_ref.compute_totals(of=['ode.' + output for output in outputs], wrt=wrt)
+        J_fused = self.p_fused.compute_totals(of=['ode.' + odePath(output, True) for output in outputs], wrt=wrt)
+
+        for output in outputs:
+            for name in wrt:
+                np.testing.assert_allclose(J_fused['ode.' + odePath(output, True), name],
+                                           J_ref['ode.' + output, name], rtol=1e-10, atol=1e-30)
+
+    def test_partials(self):
+
+        for method in ['akima', 'analytic']:
+
+            p = om.Problem()
+            p.model.add_subsystem('rhs', LaunchVehicleRHS(num_nodes=nn, central_body=Earth(),
+                                                          atmosphere_method=method))
+            p.setup(force_alloc_complex=True)
+
+            for name in targets:
+                p['rhs.' + name] = self.p_ref.get_val('ivc.' + name)
+
+            # avoid the boundaries of the layers, where the analytic derivatives are discontinuous
+            p['rhs.r'] = p['rhs.r'] + 123.4
+            p.run_model()
+
+            cpd = p.check_partials(method='cs', compact_print=True, out_stream=None)
+            assert_check_partials(cpd, atol=1e-8, rtol=1e-8)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
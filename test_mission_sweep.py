@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 20:41:16 2026
+
+The continuation branches of the mission sweep cover every point of the grid once and start next to
+the point of the initial guess.
+
+@author: jorge
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import missionSweep
+from missionSweep import spineBranches, rowBranches, pointFile, runPoint
+
+
+class TestMissionSweep(unittest.TestCase):
+
+    def checkBranches(self, n_ha, n_md, i0, j0):
+
+        spine = spineBranches(n_ha, i0, j0)
+        rows  = [branch for i in range(n_ha) for branch in rowBranches(n_md, i, j0)]
+
+        points = [point for branch in spine + rows for point in branch]
+
+        # every point is run once
+        self.assertEqual(sorted(points), [(i, j) for i in range(n_ha) for j in range(n_md)])
+
+        # the spine starts at the point of the initial guess and every row next to its spine point
+        self.assertEqual(spine[0][0], (i0, j0))
+        for branch in spine:
+            self.assertTrue(all(j == j0 for i, j in branch))
+            self.assertEqual(abs(branch[0][0] - i0), 0 if branch is spine[0] else 1)
+
+        for branch in rows:
+            i = branch[0][0]
+            self.assertEqual(abs(branch[0][1] - j0), 1)
+            self.assertTrue(all(point[0] == i for point in branch))
+
+        # consecutive points of a branch are neighbours
+        for branch in spine + rows:
+            for (i_a, j_a), (i_b, j_b) in zip(branch[:-1], branch[1:]):
+                self.assertEqual(abs(i_a - i_b) + abs(j_a - j_b), 1)
+
+    def test_branches(self):
+
+        self.checkBranches(10, 10, 3, 5)
+        self.checkBranches(10, 10, 0, 0)
+        self.checkBranches(4, 7, 3, 6)
+        self.checkBranches(1, 1, 0, 0)
+
+    def test_point_file(self):
+
+        self.assertEqual(pointFile('sweep', 11e3, 400e3).replace('\\', '/'), 'sweep/md_11000kg_ha_400km.npz')
+
+    def test_unreadable_guess(self):
+
+        # the problem of the worker is already built for ha. The warm start can not be read
+        out_dir = tempfile.mkdtemp()
+        guess_file = os.path.join(out_dir, 'broken.db')
+        with open(guess_file, 'w') as file:
+            file.write('not a case recorder file')
+
+        missionSweep._worker.update({'ha': 400e3, 'p': None, 'phases': {}, 'design_params': {}, 'states': {}})
+
+        try:
+            result = runPoint(11e3, 400e3, guess_file, out_dir)
+        finally:
+            missionSweep._worker.clear()
+            shutil.rmtree(out_dir)
+
+        self.assertEqual(result['status'], 'error')
+        self.assertIsNone(result['guess_file'])
+        self.assertEqual(result['warm_start'], guess_file)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 19:12:30 2026
+
+The post-optimal sensitivity is checked on a problem with a known solution:
+
+    min  x^2 + y^2
+    s.t. x + y + c >= b
+
+The optimum is x = y = (b - c) / 2 and f* = (b - c)^2 / 2. c is an input of the model and b a bound.
+
+@author: jorge
+"""
+
+import unittest
+
+import numpy as np
+import openmdao.api as om
+
+from postOptimality import missionSensitivity, warmStart, setWarmStart, sensitivityReport
+
+
+def defineProblem(b=2.0, c=0.0):
+    "This function returns the solved test problem"
+
+    p = om.Problem(model=om.Group())
+
+    params = p.model.add_subsystem('params', om.IndepVarComp())
+    params.add_output('c', val=c)
+
+    dvs = p.model.add_subsystem('dvs', om.IndepVarComp())
+    dvs.add_output('x', val=0.3)
+    dvs.add_output('y', val=0.1)
+    dvs.add_design_var('x', lower=-10, upper=10, ref=10)
+    dvs.add_design_var('y', lower=-10, upper=10, ref0=-1, ref=4)
+
+    p.model.add_subsystem('obj', om.ExecComp('f = x**2 + y**2'))
+    p.model.add_subsystem('con', om.ExecComp('s = x + y + c'))
+
+    p.model.connect('dvs.x', ['obj.x', 'con.x'])
+    p.model.connect('dvs.y', ['obj.y', 'con.y'])
+    p.model.connect('params.c', 'con.c')
+
+    p.model.add_objective('obj.f', ref=3)
+    p.model.add_constraint('con.s', lower=b, ref=2)
+
+    p.driver = om.ScipyOptimizeDriver(optimizer='SLSQP', tol=1e-12, disp=False)
+
+    p.setup()
+    p.run_driver()
+
+    return p
+
+
+class TestPostOptimality(unittest.TestCase):
+
+    input_params = {'c': 'params.c'}
+    bound_params = {'b': ('con.s', 1.0)}
+
+    def test_sensitivity(self):
+
+        p = defineProblem()
+        sens = missionSensitivity(p, self.input_params, self.bound_params, hessian=True)
+
+        self.assertEqual(sens['params'], ['c', 'b'])
+        self.assertAlmostEqual(sens['objective'], 2.0, 8)
+        self.assertLess(sens['kkt_residual'], 1e-6)
+
+        # df*/dc = -(b - c), df*/db = b - c
+        self.assertAlmostEqual(sens['dobj']['c'], -2.0, 5)
+        self.assertAlmostEqual(sens['dobj']['b'],  2.0, 5)
+
+        # dx/dc = dy/dc = -1/2, dx/db = dy/db = 1/2
+        self.assertEqual(len(sens['dx']['c']), 2)
+        for name in sens['dx']['c']:
+            np.testing.assert_allclose(sens['dx']['c'][name], -0.5, atol=1e-5)
+            np.testing.assert_allclose(sens['dx']['b'][name],  0.5, atol=1e-5)
+
+        # the problem is left at the optimum
+        np.testing.assert_allclose(p.get_val('dvs.x'), 1.0, atol=1e-6)
+
+        # without the Hessian the step only keeps the active constraint satisfied, d(x + y)/dc = -1, d(x + y)/db = 1
+        sens = missionSensitivity(p, self.input_params, self.bound_params)
+        self.assertAlmostEqual(sum(sens['dx']['c'][name][0] for name in sens['dx']['c']), -1.0, 6)
+        self.assertAlmostEqual(sum(sens['dx']['b'][name][0] for name in sens['dx']['b']),  1.0, 6)
+
+        self.assertIn('dGLOW/db', sensitivityReport(sens))
+
+    def test_warm_start(self):
+
+        p = defineProblem()
+        sens = missionSensitivity(p, self.input_params, self.bound_params, hessian=True)
+
+        # first-order estimate of the objective. The optimum x = y = (b - c) / 2 is linear, so the warm start is exact
+        objective, x = warmStart(p, sens, {'b': 0.5, 'c': -0.1})
+        self.assertAlmostEqual(objective, 2.0 + 2.0 * 0.5 - 2.0 * -0.1, 5)
+
+        p_new = defineProblem(b=2.5, c=-0.1)
+        for name in x:
+            np.testing.assert_allclose(x[name], p_new.get_val(name), atol=1e-5)
+
+        # the warm start is set in a problem
+        setWarmStart(p, x)
+        for name in x:
+            np.testing.assert_allclose(p.get_val(name), x[name], atol=1e-12)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -9,11 +9,16 @@ Comparisson made for Frozen composition
 @author: jorge
 """
 
+import shutil
+import tempfile
 import unittest
 
+import numpy as np
 import openmdao.api as om
 from openmdao.utils.assert_utils import assert_check_partials, assert_near_equal
+from scipy.interpolate import RectBivariateSpline
 from groups.propulsion.propulsionStage import PropulsionStage
+from groups.propulsion.components import propellant_surrogate
 
 
 class TestPropulsion(unittest.TestCase):
@@ -104,6 +109,50 @@ class TestPropulsion(unittest.TestCase):
         
 
 
+class TestPropellantSurrogate(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = propellant_surrogate.cache_dir
+        propellant_surrogate.cache_dir = tempfile.mkdtemp()
+        propellant_surrogate._surrogates.clear()
+
+    def tearDown(self):
+        shutil.rmtree(propellant_surrogate.cache_dir)
+        propellant_surrogate.cache_dir = self.cache_dir
+        propellant_surrogate._surrogates.clear()
+
+    def test_value(self):
+
+        # random points of the table and points outside of it
+        np.random.seed(0)
+        o_f = np.concatenate([np.random.uniform(1.6, 4.0, 1000), [1.0, 5.0, 2.0]])
+        P_c = np.concatenate([np.random.uniform(60, 170, 1000), [100, 100, 200]])
+
+        cea = propellant_surrogate.ceaProperties(o_f, P_c)
+
+        o_f_table, P_c_table, tables = propellant_surrogate.readCEATable('RP-1/LOX')
+        for k, var in enumerate(['gamma_t', 'tc', 'mc']):
+            spline = RectBivariateSpline(o_f_table, P_c_table, tables[k])
+
+            assert_near_equal(getattr(cea, var),              spline(o_f, P_c, grid=False), 1e-12)
+            assert_near_equal(getattr(cea, 'd' + var + '_do_f'), spline(o_f, P_c, dx=1, grid=False), 1e-9)
+            assert_near_equal(getattr(cea, 'd' + var + '_dP_c'), spline(o_f, P_c, dy=1, grid=False), 1e-9)
+
+    def test_cache(self):
+
+        x, y, coefs = propellant_surrogate.loadCoefficients('RP-1/LOX')
+
+        # the second call reads the coefficients from the cache
+        cached = propellant_surrogate.loadCoefficients('RP-1/LOX')
+        assert_near_equal(cached[2], coefs, 0.0)
+        assert_near_equal(coefs, propellant_surrogate.buildCoefficients('RP-1/LOX')[2], 0.0)
+
+    def test_unknown_propellant(self):
+
+        with self.assertRaises(ValueError):
+            propellant_surrogate.ceaProperties(2.4, 100, 'N2O4/UDMH')
+
+
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
     
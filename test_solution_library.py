@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 21:52:33 2026
+
+The solution library is checked with the brachistochrone problem of dymos on two different grids.
+
+@author: jorge
+"""
+
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from importInitialGuess import importInitialGuess
+from solutionLibrary import SolutionLibrary
+from brachistochroneProblem import brachistochroneProblem
+
+
+states = ['x', 'y', 'v']
+
+features = {'md': 11e3, 'mplf': 1.9e3, 'ha': 400e3, 'hp_min': 145e3, 'nb_e_1': 9, 'nb_e_2': 1, 'mass_aux_1': 3e3}
+
+class TestSolutionLibrary(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_library(self):
+
+        library = SolutionLibrary(self.tempdir)
+
+        p = brachistochroneProblem(t_duration=2.0, y_final=4.0)
+        phases = {'phase0': p.model.traj.phases.phase0}
+        library.add(p, phases, [], states, dict(features, md=10e3), glow=1.0, njev=10)
+
+        p = brachistochroneProblem(t_duration=3.0, y_final=6.0)
+        phases = {'phase0': p.model.traj.phases.phase0}
+        library.add(p, phases, [], states, dict(features, md=12e3))
+
+        # a vehicle with a different number of engines is not in the library
+        p = brachistochroneProblem(num_segments=8)
+        phases = {'phase0': p.model.traj.phases.phase0}
+        library.add(p, phases, [], states, dict(features, nb_e_1=7))
+
+        # the index is read back
+        library = SolutionLibrary(self.tempdir)
+        self.assertEqual([entry['Id'] for entry in library.entries], [1, 2, 3])
+        self.assertEqual(library.entries[0]['glow'], 1.0)
+
+        # the same mission is used alone
+        guess = library.initialGuess(phases, [], states, dict(features, md=10e3))
+        self.assertEqual([(entry['Id'], weight) for entry, weight in guess.neighbours], [(1, 1.0)])
+
+        # the mission between both entries is interpolated on a finer grid
+        p = brachistochroneProblem(num_segments=8)
+        phases = {'phase0': p.model.traj.phases.phase0}
+        guess = library.initialGuess(phases, [], states, features)
+        np.testing.assert_allclose([weight for entry, weight in guess.neighbours], [0.5, 0.5])
+
+        p = importInitialGuess(p, phases, [], guess, states)
+
+        self.assertAlmostEqual(p.get_val('traj.phase0.t_duration')[0], 2.5)
+        y = p.get_val('traj.phase0.states:y')
+        self.assertEqual(y.shape, phases['phase0'].interpolate(ys=[0, 1], nodes='state_input').shape)
+        np.testing.assert_allclose(y.ravel(), phases['phase0'].interpolate(ys=[10, 5], nodes='state_input').ravel())
+
+        with self.assertRaises(ValueError):
+            library.initialGuess(phases, [], states, dict(features, nb_e_2=2))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 15:02:37 2026
+
+The linear solver plan is checked on a model with a feed-forward group, a coupled group and a group
+with a connection against the execution order. The total derivatives with the planned solvers are
+compared against the total derivatives with a DirectSolver on the whole model.
+
+@author: jorge
+"""
+
+import unittest
+
+import numpy as np
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_near_equal
+
+from solverPlanning import connectionGraph, planLinearSolvers, solverPlanReport
+
+
+def defineProblem(plan_solvers):
+    "This function returns the test problem run at its initial point"
+
+    p = om.Problem(model=om.Group())
+
+    dvs = p.model.add_subsystem('dvs', om.IndepVarComp())
+    dvs.add_output('x', val=1.5)
+    dvs.add_design_var('x', lower=0.0, upper=3.0)
+
+    # feed-forward group
+    forward = p.model.add_subsystem('forward', om.Group())
+    forward.add_subsystem('a', om.ExecComp('y = 2.0 * x**2'))
+    forward.add_subsystem('b', om.ExecComp('y = 3.0 * x + x**3'))
+    forward.connect('a.y', 'b.x')
+
+    # coupled group y1 = x + 0.2 y2, y2 = 0.5 y1
+    coupled = p.model.add_subsystem('coupled', om.Group())
+    coupled.add_subsystem('c1', om.ExecComp('y = x + 0.2 * z'))
+    coupled.add_subsystem('c2', om.ExecComp('y = 0.5 * x'))
+    coupled.connect('c1.y', 'c2.x')
+    coupled.connect('c2.y', 'c1.z')
+    coupled.nonlinear_solver = om.NonlinearBlockGS(maxiter=100, atol=1e-14, rtol=1e-14, iprint=-1)
+
+    # acyclic group whose components are not in the order of the data flow
+    feedback = p.model.add_subsystem('feedback', om.Group())
+    feedback.add_subsystem('d2', om.ExecComp('y = x**2'))
+    feedback.add_subsystem('d1', om.ExecComp('y = 4.0 * x'))
+    feedback.connect('d1.y', 'd2.x')
+    feedback.nonlinear_solver = om.NonlinearBlockGS(maxiter=10, atol=1e-14, rtol=1e-14, iprint=-1)
+
+    p.model.add_subsystem('obj', om.ExecComp('f = u + v + w'))
+
+    p.model.connect('dvs.x', ['forward.a.x', 'coupled.c1.x', 'feedback.d1.x'])
+    p.model.connect('forward.b.y',  'obj.u')
+    p.model.connect('coupled.c2.y', 'obj.v')
+    p.model.connect('feedback.d2.y', 'obj.w')
+
+    p.model.add_objective('obj.f')
+
+    if not plan_solvers:
+        p.model.linear_solver = om.DirectSolver()
+
+    p.setup()
+
+    plan = planLinearSolvers(p) if plan_solvers else None
+
+    p.run_model()
+
+    return p, plan
+
+
+class TestSolverPlanning(unittest.TestCase):
+
+    def test_plan(self):
+
+        p, plan = defineProblem(True)
+
+        self.assertIsNone(plan[''])
+        self.assertIsNone(plan['forward'])
+        self.assertTrue(plan['coupled'].startswith('cycle'))
+        self.assertEqual(plan['feedback'], 'feedback d1 -> d2')
+
+        self.assertIsInstance(p.model.linear_solver, om.LinearRunOnce)
+        self.assertIsInstance(p.model.forward.linear_solver, om.LinearRunOnce)
+        self.assertIsInstance(p.model.coupled.linear_solver, om.DirectSolver)
+        self.assertIsInstance(p.model.feedback.linear_solver, om.DirectSolver)
+
+        graph = connectionGraph(p.model, p.model._conn_global_abs_in2out)
+        self.assertEqual(list(graph.nodes), ['dvs', 'forward', 'coupled', 'feedback', 'obj'])
+        self.assertIn(('dvs', 'coupled'), graph.edges)
+
+        self.assertIn('2 coupled blocks', solverPlanReport(plan))
+
+    def test_totals(self):
+
+        p_planned = defineProblem(True)[0]
+        p_direct  = defineProblem(False)[0]
+
+        assert_near_equal(p_planned.get_val('obj.f'), p_direct.get_val('obj.f'), 1e-12)
+
+        totals_planned = p_planned.compute_totals(of=['obj.f'], wrt=['dvs.x'], return_format='array')
+        totals_direct  = p_direct.compute_totals(of=['obj.f'], wrt=['dvs.x'], return_format='array')
+
+        # df/dx = 4 x (3 + 3 (2 x^2)^2) + 0.5 / 0.9 + 32 x
+        x = 1.5
+        assert_near_equal(totals_direct[0, 0], 4 * x * (3 + 3 * (2 * x**2)**2) + 0.5 / 0.9 + 32 * x, 1e-10)
+        np.testing.assert_allclose(totals_planned, totals_direct, rtol=1e-10)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 15:10:32 2026
+
+Tests for the store of the trajectory results.
+
+@author: jorge
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from openmdao.utils.assert_utils import assert_near_equal
+
+from celestialBodies import Earth
+from trajectoryStore import gatherTable, phaseEndIndex, addCoastResults, writeTrajectory, loadTrajectory, \
+                            results_sim_vars
+
+
+def timeseries(num_nodes, t_0, theta_name='theta'):
+    "This function returns the timeseries of a phase of a circular orbit at 400 km"
+
+    earth = Earth()
+    t = t_0 + np.linspace(0, 10, num_nodes)[:, np.newaxis]
+
+    return {'time'          : t,
+            'states:r'      : np.full_like(t, earth.r0 + 400e3),
+            'states:lambda' : t * 1e-3,
+            'states:v'      : np.full_like(t, earth.relativeOrbitalSpeed(400e3, earth.r0)),
+            'states:phi'    : np.zeros_like(t),
+            'states:m'      : 1e4 - t,
+            theta_name      : np.zeros_like(t)}
+
+
+class TestTrajectoryStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+
+        phases = ['lift_off', 'exoatmos_b']
+        results_sim, index = gatherTable({'lift_off':   timeseries(5, 0.0, 'input_parameters:theta'),
+                                          'exoatmos_b': timeseries(7, 10.0)}, phases, results_sim_vars)
+
+        self.store = {'results'    : results_sim,
+                      'results_sim': results_sim,
+                      'phases'     : {'results': phases, 'results_sim': list(phases)},
+                      'phase_index': {'results': index, 'results_sim': index},
+                      'events'     : {'exoatmos_b.apogee': {'time': 12.5, 'index': 7}}}
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_gather(self):
+
+        assert_near_equal(self.store['phase_index']['results'], [0, 5, 12], 0.0)
+        assert_near_equal(self.store['results']['time'][5:], np.linspace(10, 20, 7), 1e-15)
+        self.assertEqual(phaseEndIndex(self.store, 'lift_off'), 4)
+
+    def test_coast(self):
+
+        store = addCoastResults(self.store, Earth(), t_coast=100, time_step=1.0)
+
+        self.assertEqual(store['phases']['results_sim'][-1], 'coast')
+        self.assertEqual(store['phase_index']['results_sim'][-1], 12 + 101)
+        self.assertEqual(phaseEndIndex(store, 'coast', 'results_sim'), 112)
+
+        # the store given is not modified
+        self.assertEqual(len(self.store['results_sim']['time']), 12)
+
+    def test_write_load(self):
+
+        for compressed in [False, True]:
+            file_name = os.path.join(self.tempdir, 'trajectory.npz')
+            writeTrajectory(self.store, file_name, compressed)
+
+            store = loadTrajectory(file_name)
+
+            # the columns of an uncompressed file are memory mapped
+            self.assertEqual(isinstance(store['results']['r'], np.memmap), not compressed)
+
+            for table in ['results', 'results_sim']:
+                self.assertEqual(store['phases'][table], self.store['phases'][table])
+                assert_near_equal(store['phase_index'][table], self.store['phase_index'][table], 0.0)
+
+                for name, value in self.store[table].items():
+                    assert_near_equal(np.asarray(store[table][name]), value, 0.0)
+
+            self.assertEqual(store['events'], self.store['events'])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
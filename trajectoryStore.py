@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 14:22:50 2026
+
+Store of the results of the optimized and simulated trajectory.
+
+The timeseries of all the phases are read from the problem and from the simulation in a single
+call to list_outputs and copied into preallocated arrays. The store is a dictionary:
+
+    store['results']       columns of the optimized trajectory (time, r, la, v, ph, m, th, loads, ...)
+    store['results_sim']   columns of the simulated trajectory (time, r, la, v, ph, m, th)
+    store['phases']        names of the phases of each table
+    store['phase_index']   index of the first node of every phase of each table, and the length of the table
+    store['events']        time of the simulation events (phase.event) and index of the closest node of results_sim
+
+The store is written in a .npz file (one .npy per column) with writeTrajectory and read back with
+loadTrajectory. The columns of an uncompressed file are memory mapped, so large simulations are
+read without loading them in memory. The columns of a compressed file are read in memory.
+
+Plots and reports take the store, so that they do not query the problem again.
+
+@author: jorge
+"""
+
+import zipfile
+
+import numpy as np
+
+from Propagate_coast_phase import keplerCoast
+
+
+# columns of the store and the timeseries output of the phases they are read from
+results_vars = {'time'     : 'time',
+                'r'        : 'states:r',
+                'la'       : 'states:lambda',
+                'v'        : 'states:v',
+                'ph'       : 'states:phi',
+                'm'        : 'states:m',
+                'g'        : 'g',
+                'thrust'   : 'thrust',
+                'throttle' : 'controls:throttle',
+                'th'       : 'theta',
+                'rho'      : 'rho',
+                'mach'     : 'Mach',
+                'Cd'       : 'Cd',
+                'q_dyn'    : 'q_dyn',
+                'q_heat'   : 'q_heat',
+                'n_f'      : 'n_f'}
+
+results_sim_vars = {name: results_vars[name] for name in ['time', 'r', 'la', 'v', 'ph', 'm', 'th']}
+
+# theta is an input parameter of the lift off phase
+lift_off_vars = {'th': 'input_parameters:theta'}
+
+tables = ['results', 'results_sim']
+
+def getTimeseries(p, phases):
+    "This function returns the timeseries outputs of the phases of the problem in a dictionary {phase: {var: value}}"
+
+    timeseries = {phase: {} for phase in phases}
+
+    for name, meta in p.model.list_outputs(out_stream=None):
+        if '.timeseries.' not in name:
+            continue
+
+        path, var = name.split('.timeseries.', 1)
+        phase = path.split('.')[-1]
+
+        if phase in timeseries:
+            timeseries[phase][var] = meta['value']
+
+    return timeseries
+
+def gatherTable(timeseries, phases, variables):
+    "This function copies the timeseries of the phases into preallocated arrays. It returns the columns and the index of the first node of every phase"
+
+    phase_index = np.zeros(len(phases) + 1, dtype=int)
+    for i, phase in enumerate(phases):
+        phase_index[i + 1] = phase_index[i] + len(timeseries[phase]['time'])
+
+    columns = {name: np.empty(phase_index[-1]) for name in variables}
+
+    for i, phase in enumerate(phases):
+        for name, var in variables.items():
+            if phase == 'lift_off' and name in lift_off_vars:
+                var = lift_off_vars[name]
+
+            columns[name][phase_index[i]:phase_index[i + 1]] = timeseries[phase][var].ravel()
+
+    return columns, phase_index
+
+def gatherResults(p, phases, exp_out):
+    "This function gathers the optimized trajectory (p) and the simulated trajectory (exp_out) in a store. phases is the dictionary of phases of defineTrajectoryPhases"
+
+    phase_names = list(phases)
+
+    results, results_index         = gatherTable(getTimeseries(p, phase_names), phase_names, results_vars)
+    results_sim, results_sim_index = gatherTable(getTimeseries(exp_out, phase_names), phase_names, results_sim_vars)
+
+    store = {'results'    : results,
+             'results_sim': results_sim,
+             'phases'     : {'results': phase_names, 'results_sim': list(phase_names)},
+             'phase_index': {'results': results_index, 'results_sim': results_sim_index},
+             'events'     : {}}
+
+    # simulation events. See add_simulation_event in defineProblem
+    for i, phase in enumerate(phase_names):
+        for event in phases[phase].simulation_event_options:
+            t_event = exp_out.get_val('traj.' + phase + '.events.' + event + ':time')[0]
+
+            if np.isnan(t_event):
+                continue
+
+            # closest node of the phase in results_sim
+            start, end = results_sim_index[i], results_sim_index[i + 1]
+            index = start + np.argmin(np.abs(results_sim['time'][start:end] - t_event))
+
+            store['events'][phase + '.' + event] = {'time': t_event, 'index': index}
+
+    return store
+
+def phaseEndIndex(store, phase, table='results'):
+    "This function returns the index of the last node of a phase in a table of the store"
+
+    return store['phase_index'][table][store['phases'][table].index(phase) + 1] - 1
+
+def addCoastResults(store, earth, t_coast=6000, time_step=0.1):
+    " This function evaluates the second stage coast phase in closed form (keplerCoast) and appends it as phase 'coast' of results_sim"
+    " The coast is evaluated every time_step (s) during t_coast (s) after the burnout. It returns a new store"
+
+    results_sim = store['results_sim']
+
+    r_0   = results_sim['r'][-1]
+    v_0   = results_sim['v'][-1]
+    m_0   = results_sim['m'][-1]
+    la_0  = results_sim['la'][-1]
+    ph_0  = results_sim['ph'][-1]
+
+    # Time parameters
+    ti = results_sim['time'][-1]
+    t  = np.arange(0, t_coast + time_step, time_step)
+
+    coast = keplerCoast(t, r_0, v_0, la_0, ph_0, earth.mu, earth.angularSpeed, earth.r0)
+    coast = {'time': ti + t, 'r': coast['r'], 'v': coast['v'], 'm': np.full(t.shape, m_0),
+             'la': coast['la'], 'ph': coast['ph'], 'th': coast['ph']}
+
+    new_store = dict(store)
+    new_store['results_sim'] = {name: np.concatenate([value, coast[name]]) for name, value in results_sim.items()}
+    new_store['phases']      = dict(store['phases'], results_sim=store['phases']['results_sim'] + ['coast'])
+    new_store['phase_index'] = dict(store['phase_index'],
+                                    results_sim=np.append(store['phase_index']['results_sim'],
+                                                          len(results_sim['time']) + len(t)))
+
+    return new_store
+
+def writeTrajectory(store, file_name='results/trajectory_state_history.npz', compressed=False):
+    "This function writes the store in a .npz file. If compressed == False the columns can be memory mapped when the file is loaded"
+
+    arrays = {}
+    for table in tables:
+        for name, value in store[table].items():
+            arrays[table + ':' + name] = np.asarray(value)
+
+        arrays['phases:' + table]      = np.array(store['phases'][table])
+        arrays['phase_index:' + table] = np.asarray(store['phase_index'][table])
+
+    arrays['event_names'] = np.array(list(store['events']), dtype=str)
+    arrays['event_time']  = np.array([event['time'] for event in store['events'].values()], dtype=float)
+    arrays['event_index'] = np.array([event['index'] for event in store['events'].values()], dtype=int)
+
+    if compressed:
+        np.savez_compressed(file_name, **arrays)
+    else:
+        np.savez(file_name, **arrays)
+
+def _mapNpz(file_name):
+    "This function returns the arrays of a .npz file. The arrays stored without compression are memory mapped"
+
+    arrays = {}
+
+    with zipfile.ZipFile(file_name) as archive, open(file_name, 'rb') as file:
+        for info in archive.infolist():
+            name = info.filename[:-len('.npy')]
+
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member)
+                continue
+
+            # the data of a stored member starts after its local header
+            file.seek(info.header_offset)
+            header = file.read(30)
+            offset = info.header_offset + 30 + int.from_bytes(header[26:28], 'little') + \
+                     int.from_bytes(header[28:30], 'little')
+
+            file.seek(offset)
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+
+            if dtype.hasobject or 0 in shape:
+                file.seek(offset)
+                arrays[name] = np.lib.format.read_array(file)
+            else:
+                arrays[name] = np.memmap(file_name, dtype=dtype, mode='r', offset=file.tell(), shape=shape,
+                                         order='F' if fortran_order else 'C')
+
+    return arrays
+
+def loadTrajectory(file_name='results/trajectory_state_history.npz'):
+    "This function loads a store written by writeTrajectory. The columns of an uncompressed file are memory mapped"
+
+    arrays = _mapNpz(file_name)
+
+    store = {'phases': {}, 'phase_index': {}}
+
+    for table in tables:
+        store[table] = {key.split(':', 1)[1]: value for key, value in arrays.items()
+                        if key.startswith(table + ':')}
+
+        store['phases'][table]      = [str(phase) for phase in arrays['phases:' + table]]
+        store['phase_index'][table] = np.asarray(arrays['phase_index:' + table])
+
+    store['events'] = {str(name): {'time': float(time), 'index': int(index)} for name, time, index in
+                       zip(arrays['event_names'], arrays['event_time'], arrays['event_index'])}
+
+    return store
@@ -8,26 +8,36 @@ Created on Fri Oct  2 19:35:17 2020
 import time
 
 def writeBatchReport(Id, p,  start_time):
-    
+
     if Id ==1:
-        file1 = open("results/BatchOptReport.txt","w") 
-        file1.write('Id, cost, opt_time, njev, nfev, status \n')
-    
-    file1 = open("results/BatchOptReport.txt","a") 
-    
+        writeBatchReportHeader()
+
     cost     = round( p.get_val('traj.lift_off.timeseries.states:m')[0][0] / 1e3 , 2)
     opt_time = round(time.time() - start_time,2)
     njev     = p.driver.result.njev
     nfev     = p.driver.result.nfev
-        
-    my_str = str ([Id, cost, opt_time, njev, nfev ]) +  ',' + str(p.driver.result.status)
-    
+
+    writeBatchReportLine(Id, cost, opt_time, njev, nfev, p.driver.result.status)
+
+def writeBatchReportHeader():
+    "This function creates a new BatchOptReport.txt file with the header of the columns"
+
+    file1 = open("results/BatchOptReport.txt","w")
+    file1.write('Id, cost, opt_time, njev, nfev, status \n')
+    file1.close()
+
+def writeBatchReportLine(Id, cost, opt_time, njev, nfev, status):
+    "This function appends one line to BatchOptReport.txt. The file is closed after every line so the results of a batch can be followed while it runs"
+
+    file1 = open("results/BatchOptReport.txt","a")
+
+    my_str = str ([Id, cost, opt_time, njev, nfev ]) +  ',' + str(status)
+
     my_str = my_str.replace('[','')
     my_str = my_str.replace(']','')
     my_str = my_str.replace(')','')
     my_str = my_str.replace('(','')
-    
+
     file1.write( my_str + '\n')
-    
+
     file1.close()
-    
\ No newline at end of file
@@ -179,7 +179,7 @@ def updateVehicle(p, vehicle):
     thrust_vac_stage_2   = p.get_val('external_params.thrust_vac_stage_2')[0]
     Isp_2 = p.get_val('propulsion.propulsion_stage_2.Isp')[0]
     Ae_t_2  = p.get_val('propulsion.propulsion_stage_2.Ae_t')[0]
-    mp_2  = p.get_val('traj.gravity_turn_c.timeseries.states:m')[0][0] - p.get_val('traj.exoatmos_b.timeseries.m_final')[-1][0] - vehicle.mplf
+    mp_2  = p.get_val('traj.gravity_turn_c.timeseries.states:m')[0][0] - p.get_val('orbitalParameters.m_final')[0] - vehicle.mplf
     ms_2  = p.get_val('massSizing.ms_2')[0]
     vehicle.write_stage_2_opt(thrust_vac_stage_2, Isp_2, Ae_t_2, mp_2, ms_2)
     